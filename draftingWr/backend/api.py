@@ -3,21 +3,164 @@ Wild Rift Draft Tool - FastAPI Backend
 Provides REST API endpoints for the draft recommendation system.
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
 import sys
+import time
+import traceback
 from pathlib import Path
 
 # Add parent directory to path to import draft_engine
 sys.path.append(str(Path(__file__).parent))
-from draft_engine import DraftEngine
+from draft_engine import COMPOSITION_PROFILES, DraftEngine
+from data_store import SQLiteDataStore
+from dataset_versions import DatasetVersions
+from data_pipeline import BOOK_FILE, BUILD_DIR
+from opening_book import OpeningBook
+from coalescing import SingleFlight, canonical_draft_key
+from scheduler import PriorityScheduler, SchedulerRejected
+from capture import CAPTURE_CAPACITY, SLOW_REQUEST_MS, CaptureBuffer, canonical_request
+from shadow import SHADOW_SAMPLE_RATE, SHADOW_TOLERANCE, ShadowStats
+
+# Log through uvicorn's logger so the startup report shows with the server logs
+logger = logging.getLogger("uvicorn.error")
+
+# Data directory (DRAFT_DATA_DIR, defaults to the repo's data/ wherever the
+# server is started from). Set DRAFT_SQLITE_DB to load from a SQLite store
+# built with `python backend/data_store.py` instead of the JSON files.
+DATA_DIR = os.environ.get("DRAFT_DATA_DIR", str(Path(__file__).parent.parent / "data"))
+SQLITE_DB = os.environ.get("DRAFT_SQLITE_DB")
+# Each subdirectory is a dataset version (e.g. the upcoming patch) holding only
+# the data files that differ; requests select one with `version`
+VERSIONS_DIR = os.environ.get("DRAFT_VERSIONS_DIR", str(Path(DATA_DIR) / "versions"))
+
+# Shadow execution: DRAFT_SHADOW names a dataset version or an entry of
+# SHADOW_IMPLEMENTATIONS; a DRAFT_SHADOW_RATE fraction of live /recommend calls
+# is re-run through it in the background and compared (see /shadow)
+SHADOW_TARGET = os.environ.get("DRAFT_SHADOW")
+
+# Endpoints served before the engine is ready (probes, docs, metrics)
+NOT_READY_PATHS = {"/healthz", "/readyz", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+# The engine is built after the server starts listening, see lifespan()
+engine: Optional[DraftEngine] = None
+datasets: Optional[DatasetVersions] = None
+# Precomputed early draft states, built by the data pipeline (see opening_book.py)
+opening_book: Optional[OpeningBook] = None
+# Slow (DRAFT_SLOW_MS) or failed /recommend calls are kept with their draft
+# state and timings in a ring buffer of DRAFT_CAPTURE_SIZE files, replayable
+# with `python backend/capture.py replay`
+capture_buffer: Optional[CaptureBuffer] = None
+startup = {"ready": False, "error": None, "phases_ms": {}, "warmed_states": 0}
+
+
+def start_engine():
+    """Load, index and warm up the engine, timing each phase."""
+    global engine, datasets, opening_book, capture_buffer
+    began = time.perf_counter()
+    
+    new_engine = DraftEngine(
+        data_dir=DATA_DIR,
+        store=SQLiteDataStore(SQLITE_DB) if SQLITE_DB else None
+    )
+    startup["phases_ms"].update(new_engine.startup_timings)
+    
+    warmup_start = time.perf_counter()
+    startup["warmed_states"] = new_engine.warm_up()
+    startup["phases_ms"]["warmup"] = (time.perf_counter() - warmup_start) * 1000
+    
+    versions_start = time.perf_counter()
+    new_datasets = DatasetVersions(new_engine)
+    for name in new_datasets.load_directory(VERSIONS_DIR):
+        startup["warmed_states"] += new_datasets.get(name).warm_up()
+    startup["phases_ms"]["versions"] = (time.perf_counter() - versions_start) * 1000
+    startup["phases_ms"]["total"] = (time.perf_counter() - began) * 1000
+    
+    # A book built from other data or by other scoring code is not served
+    book = OpeningBook.load(DATA_DIR)
+    if book is None and (Path(DATA_DIR) / BUILD_DIR / BOOK_FILE).exists():
+        logger.warning("Opening book was built by other engine code and is ignored: "
+                       "run `python backend/data_pipeline.py` to rebuild it")
+    elif book and book.data_version != new_engine.data_version:
+        logger.warning(f"Opening book is for data {book.data_version}, not {new_engine.data_version}, "
+                       f"and is ignored: run `python backend/data_pipeline.py` to rebuild it")
+        book = None
+    
+    engine = new_engine
+    datasets = new_datasets
+    opening_book = book
+    capture_buffer = CaptureBuffer(
+        os.environ.get("DRAFT_CAPTURE_DIR", str(Path(DATA_DIR) / "captures")),
+        capacity=int(os.environ.get("DRAFT_CAPTURE_SIZE", CAPTURE_CAPACITY)),
+        threshold_ms=float(os.environ.get("DRAFT_SLOW_MS", SLOW_REQUEST_MS))
+    )
+    if SHADOW_TARGET:
+        start_shadow()
+    startup["ready"] = True
+    phases = ", ".join(f"{name} {ms:.1f} ms" for name, ms in startup["phases_ms"].items())
+    logger.info(f"Draft engine ready (data {engine.data_version} from {DATA_DIR}): {phases}, "
+                f"{startup['warmed_states']} states warmed, versions: {', '.join(datasets.engines)}")
+
+
+async def load_engine():
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, start_engine)
+    except Exception as e:
+        startup["error"] = str(e)
+        logger.exception("Draft engine failed to start")
+
+
+# Alternate recommend_champions implementations that can be shadowed against
+# the serving engine, built on startup when selected
+SHADOW_IMPLEMENTATIONS = {
+    # Matchup tables recomputed from the rules instead of data/build
+    "uncompiled": lambda: DraftEngine(data_dir=DATA_DIR, use_compiled=False).recommend_champions
+}
+shadow_call = None
+shadow_stats: Optional[ShadowStats] = None
+# Shadow runs in flight (the event loop only keeps weak references to tasks)
+shadow_tasks = set()
+
+
+def start_shadow():
+    """Resolve the DRAFT_SHADOW target once the dataset versions are loaded."""
+    global shadow_call, shadow_stats
+    if SHADOW_TARGET in datasets.engines:
+        shadow_call = datasets.get(SHADOW_TARGET).recommend_champions
+    elif SHADOW_TARGET in SHADOW_IMPLEMENTATIONS:
+        shadow_call = SHADOW_IMPLEMENTATIONS[SHADOW_TARGET]()
+    else:
+        logger.warning(f"Unknown shadow target {SHADOW_TARGET}: shadow execution is off")
+        return
+    shadow_stats = ShadowStats(
+        SHADOW_TARGET,
+        sample_rate=float(os.environ.get("DRAFT_SHADOW_RATE", SHADOW_SAMPLE_RATE)),
+        tolerance=float(os.environ.get("DRAFT_SHADOW_TOLERANCE", SHADOW_TOLERANCE))
+    )
+    logger.info(f"Shadowing {shadow_stats.sample_rate:.0%} of /recommend calls with {SHADOW_TARGET}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start in the background so /healthz answers while the engine loads
+    task = asyncio.ensure_future(load_engine())
+    yield
+    await task
+
 
 app = FastAPI(
     title="Wild Rift Draft Tool API",
     description="AI-Based draft recommendation system for Wild Rift",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for frontend
@@ -29,8 +172,151 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize draft engine
-engine = DraftEngine(data_dir="../data")
+
+@app.middleware("http")
+async def require_ready(request: Request, call_next):
+    """Answer 503 until the engine has loaded and warmed up."""
+    if not startup["ready"] and request.url.path not in NOT_READY_PATHS:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Draft engine is starting"},
+            headers={"Retry-After": "1"}
+        )
+    return await call_next(request)
+
+# Engine work is queued by cost class: interactive recommendations run before
+# composition analysis, which runs before bulk jobs. Each queue is bounded and
+# rejects work it cannot finish within its budget (seconds). Cheap metadata
+# endpoints are served directly on the event loop.
+SCHEDULER_QUEUES = {
+    "interactive": {"priority": 0, "max_depth": 64, "budget": 1.0},
+    "analysis": {"priority": 1, "max_depth": 32, "budget": 5.0},
+    "bulk": {"priority": 2, "max_depth": 8, "budget": 60.0},
+    # Shadow runs only use otherwise idle workers and are dropped when busy
+    "shadow": {"priority": 3, "max_depth": 4, "budget": 5.0}
+}
+# Drafts scored per bulk scheduler job when streaming /evaluate results
+EVALUATE_BATCH_SIZE = 250
+
+workers = os.environ.get("DRAFT_WORKERS")
+scheduler = PriorityScheduler(SCHEDULER_QUEUES, workers=int(workers) if workers else None)
+
+
+async def run_interactive(func, *args, **kwargs):
+    return await scheduler.submit("interactive", func, *args, **kwargs)
+
+
+# Identical concurrent /recommend calls share one computation
+recommend_flight = SingleFlight(runner=run_interactive)
+
+
+def engine_for(version: Optional[str]) -> DraftEngine:
+    """The engine serving a dataset version (the base dataset when None)."""
+    try:
+        return datasets.get(version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset version: {version}")
+
+
+def recommend_timed(target: DraftEngine, **params):
+    """recommend_champions with its start time and phase timings."""
+    timings = {"started": time.perf_counter()}
+    recommendations = target.recommend_champions(**params, timings=timings)
+    timings["engine"] = (time.perf_counter() - timings["started"]) * 1000
+    return recommendations, timings
+
+
+def capture_request(endpoint: str, target: DraftEngine, params: Dict, received: float,
+                    timings: Dict = None, error: Exception = None) -> Optional[int]:
+    """Record a request in the capture buffer if it was slow or failed."""
+    elapsed = (time.perf_counter() - received) * 1000
+    if capture_buffer is None or not capture_buffer.should_capture(elapsed, failed=error is not None):
+        return None
+    
+    timings = dict(timings or {})
+    started = timings.pop("started", None)
+    counts = {key: timings.pop(key) for key in ("candidates", "fully_scored") if key in timings}
+    timings_ms = {"total": elapsed, **timings}
+    if started is not None:
+        timings_ms["queue_wait"] = max(0.0, (started - received) * 1000)
+    
+    entry = {
+        "endpoint": endpoint,
+        "request": canonical_request(params),
+        "data_version": target.data_version,
+        "timings_ms": timings_ms,
+        **counts
+    }
+    if error is not None:
+        entry["error"] = f"{type(error).__name__}: {error}"
+        entry["traceback"] = traceback.format_exception(type(error), error, error.__traceback__)
+    return capture_buffer.capture(entry)
+
+
+def shadow_timed(**params):
+    """The shadow target's recommendations and engine time (ms)."""
+    started = time.perf_counter()
+    recommendations = shadow_call(**params)
+    return recommendations, (time.perf_counter() - started) * 1000
+
+
+async def run_shadow(params: Dict, primary: List[Dict], primary_ms: float):
+    """Re-run a served request through the shadow target and record the differences."""
+    request = canonical_request(params)
+    try:
+        shadowed, shadow_ms = await scheduler.submit("shadow", shadow_timed, **params)
+    except SchedulerRejected:
+        shadow_stats.record_skipped()
+        return
+    except Exception as e:
+        shadow_stats.record_error(request, e)
+        return
+    shadow_stats.record(request, primary, primary_ms, shadowed, shadow_ms)
+
+
+def maybe_shadow(target: DraftEngine, params: Dict, primary: List[Dict], primary_ms: float):
+    """Shadow a sample of the live data's requests in the background."""
+    if not (shadow_stats and target is engine and shadow_stats.should_sample()):
+        return
+    task = asyncio.ensure_future(run_shadow(params, primary, primary_ms))
+    shadow_tasks.add(task)
+    task.add_done_callback(shadow_tasks.discard)
+
+
+def overloaded(error: SchedulerRejected) -> HTTPException:
+    """503 telling the client to retry shortly."""
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "1"})
+
+
+async def serve_recommendations(endpoint: str, target: DraftEngine, params: Dict, received: float) -> List[Dict]:
+    """
+    recommend_champions for a request: from the opening book when it holds
+    the state, else through the coalesced interactive queue, capturing slow
+    or failed runs and shadowing a sample.
+    """
+    # Early draft states are answered from the opening book. Book hits are not
+    # shadowed: a table lookup would skew the shadow / primary latency ratios
+    recommendations = opening_book.lookup(target, **params) if opening_book else None
+    if recommendations is not None:
+        return recommendations
+    
+    try:
+        recommendations, timings = await recommend_flight.run(
+            (target.data_version, canonical_draft_key(**params)), recommend_timed, target, **params
+        )
+    except SchedulerRejected as e:
+        raise overloaded(e)
+    except Exception as e:
+        seq = capture_request(endpoint, target, params, received, error=e)
+        reference = f" (capture #{seq})" if seq is not None else ""
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generating recommendations: {str(e)}{reference}"
+        )
+    
+    capture_request(endpoint, target, params, received, timings=timings)
+    maybe_shadow(target, params, recommendations, timings["engine"])
+    return recommendations
 
 
 # Request/Response models
@@ -40,6 +326,46 @@ class RecommendationRequest(BaseModel):
     enemy_team: Optional[List[str]] = []
     banned_champions: Optional[List[str]] = []
     top_n: Optional[int] = 5
+    lookahead: Optional[bool] = False
+    enemy_roles: Optional[Dict[str, str]] = None
+    composition_profile: Optional[str] = None
+    version: Optional[str] = None
+
+
+class BothSidesRequest(BaseModel):
+    role: str
+    enemy_role: Optional[str] = None
+    team: Optional[List[str]] = []
+    enemy_team: Optional[List[str]] = []
+    banned_champions: Optional[List[str]] = []
+    top_n: Optional[int] = 5
+    lookahead: Optional[bool] = False
+    team_roles: Optional[Dict[str, str]] = None
+    enemy_roles: Optional[Dict[str, str]] = None
+    version: Optional[str] = None
+
+
+class BanRecommendationRequest(BaseModel):
+    team: Optional[List[str]] = []
+    enemy_team: Optional[List[str]] = []
+    banned_champions: Optional[List[str]] = []
+    top_n: Optional[int] = 5
+    version: Optional[str] = None
+
+
+class OpenRolesRequest(BaseModel):
+    team: Optional[List[str]] = []
+    enemy_team: Optional[List[str]] = []
+    banned_champions: Optional[List[str]] = []
+    top_n: Optional[int] = 1
+    lookahead: Optional[bool] = False
+    version: Optional[str] = None
+
+
+class AnalyzeRequest(BaseModel):
+    team: Optional[List[str]] = []
+    enemy_team: Optional[List[str]] = []
+    version: Optional[str] = None
 
 
 class ChampionInfo(BaseModel):
@@ -54,28 +380,101 @@ async def root():
     return {
         "message": "Wild Rift Draft Tool API",
         "version": "1.0.0",
+        "data_version": engine.data_version,
+        "versions": list(datasets.engines),
         "endpoints": {
             "/champions": "Get all champions",
+            "/champions/query": "Query champions by tag expression and filters",
+            "/champions/search": "Search champions by name or alias (typo tolerant)",
             "/champions/{role}": "Get champions for a specific role",
             "/recommend": "Get champion recommendations (POST)",
-            "/champion/{champion_id}": "Get detailed champion info"
+            "/recommend/both": "Get champion recommendations for both sides at once (POST)",
+            "/recommend/bans": "Get ban recommendations (POST)",
+            "/recommend/roles": "Solve pick roles and recommend for every open role (POST)",
+            "/analyze": "Get composition profiles for both teams (POST)",
+            "/evaluate": "Score complete drafts in bulk (POST NDJSON, streamed NDJSON)",
+            "/versions": "Get the dataset versions served side by side",
+            "/metrics": "Get API runtime metrics (coalescing, scheduler queues)",
+            "/shadow": "Get the shadow execution comparison summary",
+            "/healthz": "Liveness probe",
+            "/readyz": "Readiness probe (ready once the engine is warmed up)",
+            "/champion/{champion_id}": "Get detailed champion info",
+            "/champion/{champion_id}/similar": "Get available champions with the most similar kit"
         }
     }
 
 
 @app.get("/champions")
-async def get_all_champions():
+async def get_all_champions(version: Optional[str] = None):
     """Get all available champions."""
+    target = engine_for(version)
+    return {
+        "champions": target.champions,
+        "count": len(target.champions)
+    }
+
+
+@app.get("/champions/query")
+async def query_champions(
+    expr: Optional[str] = None,
+    role: Optional[str] = None,
+    min_viability: float = 0.5,
+    damage_type: Optional[List[str]] = Query(None),
+    scaling: Optional[List[str]] = Query(None),
+    sort: str = "viability",
+    limit: Optional[int] = None,
+    version: Optional[str] = None
+):
+    """
+    Query champions with a boolean tag expression and filters.
+    
+    Example: /champions/query?expr=engage AND aoe AND NOT melee&role=support
+    """
+    target = engine_for(version)
+    try:
+        champions = target.query_champions(
+            expression=expr,
+            role=role,
+            min_viability=min_viability,
+            damage_types=damage_type,
+            scalings=scaling,
+            sort_by=sort,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     return {
-        "champions": engine.champions,
-        "count": len(engine.champions)
+        "champions": champions,
+        "count": len(champions)
+    }
+
+
+@app.get("/champions/search")
+async def search_champions(
+    q: str,
+    limit: int = 10,
+    exclude: Optional[List[str]] = Query(None),
+    version: Optional[str] = None
+):
+    """
+    Search champions by name, ID or alias prefix, tolerating typos.
+    
+    Pass the picked and banned champions as `exclude` to only get available ones.
+    """
+    champions = engine_for(version).search_champions(q, limit=limit, banned_champions=exclude)
+    
+    return {
+        "query": q,
+        "champions": champions,
+        "count": len(champions)
     }
 
 
 @app.get("/champions/{role}")
-async def get_champions_by_role(role: str):
+async def get_champions_by_role(role: str, version: Optional[str] = None):
     """Get all viable champions for a specific role."""
-    viable = engine.get_viable_champions(role)
+    viable = engine_for(version).get_viable_champions(role)
     
     if not viable:
         raise HTTPException(
@@ -91,15 +490,47 @@ async def get_champions_by_role(role: str):
 
 
 @app.get("/champion/{champion_id}")
-async def get_champion_details(champion_id: str):
+async def get_champion_details(champion_id: str, version: Optional[str] = None):
     """Get detailed information about a specific champion."""
-    if champion_id not in engine.champion_map:
+    target = engine_for(version)
+    if champion_id not in target.champion_map:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Champion not found: {champion_id}"
+        )
+    
+    return target.champion_map[champion_id]
+
+
+@app.get("/champion/{champion_id}/similar")
+async def get_similar_champions(
+    champion_id: str,
+    role: Optional[str] = None,
+    k: int = 5,
+    exclude: Optional[List[str]] = Query(None),
+    version: Optional[str] = None
+):
+    """
+    Get the k champions whose kit is closest to a champion's (substitutes
+    when it is banned or taken), with the kit tags they share.
+    
+    Pass the picked and banned champions as `exclude` to only get available ones.
+    """
+    target = engine_for(version)
+    if champion_id not in target.champion_map:
         raise HTTPException(
             status_code=404,
             detail=f"Champion not found: {champion_id}"
         )
     
-    return engine.champion_map[champion_id]
+    similar = target.find_similar_champions(champion_id, role=role, k=k, banned_champions=exclude)
+    
+    return {
+        "champion_id": champion_id,
+        "role": role,
+        "similar": similar,
+        "count": len(similar)
+    }
 
 
 @app.post("/recommend")
@@ -113,9 +544,79 @@ async def get_recommendations(request: RecommendationRequest):
     Returns:
         List of recommended champions with scores and explanations
     """
+    received = time.perf_counter()
+    target = engine_for(request.version)
+    params = dict(
+        role=request.role,
+        team=request.team,
+        enemy_team=request.enemy_team,
+        banned_champions=request.banned_champions,
+        top_n=request.top_n,
+        lookahead=request.lookahead,
+        enemy_roles=request.enemy_roles,
+        composition_profile=request.composition_profile
+    )
+    if request.composition_profile and request.composition_profile not in COMPOSITION_PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown composition profile: {request.composition_profile}")
+    
+    recommendations = await serve_recommendations("/recommend", target, params, received)
+    return {
+        "role": request.role,
+        "recommendations": recommendations,
+        "count": len(recommendations)
+    }
+
+
+@app.post("/recommend/both")
+async def get_both_sides_recommendations(request: BothSidesRequest):
+    """
+    Get champion recommendations for our side and the enemy side in one call
+    (the enemy side is scored with the teams swapped).
+    
+    Args:
+        request: BothSidesRequest with roles, teams, and bans
+        
+    Returns:
+        Recommendations for each side with scores and explanations
+    """
+    received = time.perf_counter()
+    target = engine_for(request.version)
+    shared = dict(banned_champions=request.banned_champions, top_n=request.top_n,
+                  lookahead=request.lookahead, composition_profile=None)
+    team_params = dict(role=request.role, team=request.team, enemy_team=request.enemy_team,
+                       enemy_roles=request.enemy_roles, **shared)
+    enemy_params = dict(role=request.enemy_role or request.role, team=request.enemy_team,
+                        enemy_team=request.team, enemy_roles=request.team_roles, **shared)
+    
+    # Each side is a /recommend request of its own (book, coalescing, capture, shadow)
+    team, enemy = await asyncio.gather(
+        serve_recommendations("/recommend/both", target, team_params, received),
+        serve_recommendations("/recommend/both", target, enemy_params, received)
+    )
+    return {
+        "role": request.role,
+        "enemy_role": request.enemy_role or request.role,
+        "team": team,
+        "enemy": enemy
+    }
+
+
+@app.post("/recommend/bans")
+async def get_ban_recommendations(request: BanRecommendationRequest):
+    """
+    Get ban recommendations based on draft state.
+    
+    Args:
+        request: BanRecommendationRequest with teams and current bans
+        
+    Returns:
+        List of champions ranked by threat to your team
+    """
+    target = engine_for(request.version)
     try:
-        recommendations = engine.recommend_champions(
-            role=request.role,
+        bans = await scheduler.submit(
+            "interactive",
+            target.recommend_bans,
             team=request.team,
             enemy_team=request.enemy_team,
             banned_champions=request.banned_champions,
@@ -123,17 +624,166 @@ async def get_recommendations(request: RecommendationRequest):
         )
         
         return {
-            "role": request.role,
-            "recommendations": recommendations,
-            "count": len(recommendations)
+            "bans": bans,
+            "count": len(bans)
         }
+    except SchedulerRejected as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Error generating recommendations: {str(e)}"
+            detail=f"Error generating ban recommendations: {str(e)}"
         )
 
 
+@app.post("/recommend/roles")
+async def get_open_role_recommendations(request: OpenRolesRequest):
+    """
+    Assign current picks to roles and recommend the best picks for each open role.
+    
+    Args:
+        request: OpenRolesRequest with teams and bans
+        
+    Returns:
+        Role assignments, open roles and recommendations per open role
+    """
+    target = engine_for(request.version)
+    try:
+        return await scheduler.submit(
+            "interactive",
+            target.recommend_open_roles,
+            team=request.team,
+            enemy_team=request.enemy_team,
+            banned_champions=request.banned_champions,
+            top_n=request.top_n,
+            lookahead=request.lookahead
+        )
+    except SchedulerRejected as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generating role recommendations: {str(e)}"
+        )
+
+
+@app.post("/analyze")
+async def analyze_draft(request: AnalyzeRequest):
+    """
+    Get composition profiles (tag coverage, damage split, power curve, roles)
+    for both teams in one call.
+    """
+    target = engine_for(request.version)
+    try:
+        return await scheduler.submit(
+            "analysis", target.analyze_draft, team=request.team, enemy_team=request.enemy_team
+        )
+    except SchedulerRejected as e:
+        raise overloaded(e)
+
+
+def evaluate_batch(target: DraftEngine, lines: List[tuple], explain: bool) -> str:
+    """Parse and score a batch of NDJSON draft lines, returning NDJSON results."""
+    output = []
+    for line_number, line in lines:
+        try:
+            draft = json.loads(line)
+            if not isinstance(draft, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            result = {"line": line_number, "error": f"Invalid draft: {str(e)}"}
+        else:
+            result = next(target.evaluate_drafts([draft], explain=explain))
+        output.append(json.dumps(result, ensure_ascii=False) + "\n")
+    return "".join(output)
+
+
+@app.post("/evaluate")
+async def evaluate_drafts(request: Request, explain: bool = False, version: Optional[str] = None):
+    """
+    Score complete drafts in bulk.
+    
+    The body is NDJSON, one draft per line:
+    {"id": ..., "team": [...], "enemy_team": [...], "team_roles": {...},
+    "enemy_roles": {...}, "banned_champions": [...]}
+    
+    Results are streamed back as NDJSON in input order, one line per draft,
+    with each side's composite score and component breakdown. Scoring runs
+    in batches on the bulk queue, behind interactive requests.
+    """
+    target = engine_for(version)
+    body = await request.body()
+    lines = [
+        (number, line)
+        for number, line in enumerate(body.decode("utf-8").splitlines(), 1)
+        if line.strip()
+    ]
+    
+    async def results():
+        for start in range(0, len(lines), EVALUATE_BATCH_SIZE):
+            try:
+                yield await scheduler.submit(
+                    "bulk", evaluate_batch, target, lines[start:start + EVALUATE_BATCH_SIZE], explain
+                )
+            except SchedulerRejected as e:
+                yield json.dumps({"error": str(e), "remaining_from_line": lines[start][0]}) + "\n"
+                return
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@app.get("/versions")
+async def get_versions():
+    """
+    Get the dataset versions served side by side, with the indexes each
+    derived version rebuilt and how much it shares with the base dataset.
+    """
+    return {
+        "default": datasets.default,
+        "versions": datasets.describe()
+    }
+
+
+@app.get("/shadow")
+async def get_shadow_summary(recent: int = 10):
+    """
+    Get how the shadow target (DRAFT_SHADOW) compares with the served
+    recommendations: ranking and top-1 differences, score deltas beyond the
+    tolerance, latency ratio percentiles and the most recent differences.
+    """
+    if not shadow_stats:
+        return {"enabled": False, "target": SHADOW_TARGET}
+    return {"enabled": True, **shadow_stats.summary(recent=recent)}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Get API runtime metrics (request coalescing, queue depths and wait times, candidate pruning, opening book hits)."""
+    return {
+        "coalescing": recommend_flight.stats(),
+        "scheduler": scheduler.stats(),
+        "pruning": dict(engine.pruning_stats) if engine else None,
+        "captures": capture_buffer.stats() if capture_buffer else None,
+        "opening_book": opening_book.stats() if opening_book else None
+    }
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness probe: 200 once the engine is loaded and warmed up, 503 before."""
+    status = "ready" if startup["ready"] else ("failed" if startup["error"] else "starting")
+    return JSONResponse(
+        status_code=200 if startup["ready"] else 503,
+        content={"status": status, **startup}
+    )
+
+
 @app.get("/roles")
 async def get_available_roles():
     """Get all available roles in the game."""
@@ -148,20 +798,22 @@ async def get_available_roles():
 
 
 @app.get("/synergies")
-async def get_synergies():
+async def get_synergies(version: Optional[str] = None):
     """Get all synergy rules."""
+    target = engine_for(version)
     return {
-        "synergies": engine.synergies,
-        "count": len(engine.synergies)
+        "synergies": target.synergies,
+        "count": len(target.synergies)
     }
 
 
 @app.get("/counters")
-async def get_counters():
+async def get_counters(version: Optional[str] = None):
     """Get all counter rules."""
+    target = engine_for(version)
     return {
-        "counters": engine.counters,
-        "count": len(engine.counters)
+        "counters": target.counters,
+        "count": len(target.counters)
     }
 
 
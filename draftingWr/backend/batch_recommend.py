@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Wild Rift Draft Tool - Batch Recommender
+Runs recommend_champions over NDJSON draft states without going through HTTP.
+
+Reads one draft state per line from a file or stdin:
+    {"id": "s1", "role": "mid", "team": [...], "enemy_team": [...],
+     "banned_champions": [...], "top_n": 5, "lookahead": false, "enemy_roles": {...},
+     "composition_profile": "engage"}
+and writes one result per line to stdout, in input order:
+    {"line": 1, "id": "s1", "role": "mid", "recommendations": [...]}
+or {"line": 1, "id": "s1", "error": "..."} for a state that cannot be scored.
+Only "team"/"enemy_team" are needed per line; role and top_n default to the
+command-line options.
+
+States are scored in chunks on a process pool, each worker loading the engine
+once; at most two chunks per worker are in flight, so the input is streamed.
+
+Explanation levels:
+    scores   champion ID, name and the score components
+    reasons  scores plus the synergy/counter/vulnerability explanations
+    full     the complete recommendation (champion data included) and the
+             formatted explanation text
+
+Usage:
+    python backend/batch_recommend.py states.ndjson [--role mid] [--top-n 5] [--explain reasons]
+    cat states.ndjson | python backend/batch_recommend.py --workers 8 > results.ndjson
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from draft_engine import DraftEngine
+from replay import chunked
+
+
+# States per unit of work sent to a worker process
+CHUNK_SIZE = 200
+
+EXPLAIN_LEVELS = ["scores", "reasons", "full"]
+
+# Draft state fields passed through to recommend_champions
+STATE_FIELDS = ["team", "enemy_team", "banned_champions", "lookahead", "enemy_roles", "composition_profile"]
+
+
+def format_recommendation(engine: DraftEngine, recommendation: Dict, explain: str) -> Dict:
+    """Shape a recommendation for the requested explanation level."""
+    if explain == "full":
+        return {**recommendation, "explanation": engine.explain_recommendation(recommendation)}
+
+    champ = recommendation["champion"]
+    result = {"champion": champ["id"], "name": champ["name"]}
+    for name, value in recommendation.items():
+        if name == "champion" or (name.endswith("_explanations") and explain == "scores"):
+            continue
+        result[name] = value
+    return result
+
+
+def recommend_line(engine: DraftEngine, line_number: int, line: str, options: Dict) -> Dict:
+    """
+    Score one NDJSON draft state.
+
+    Args:
+        engine: Draft engine to score with
+        line_number: 1-based input line, echoed in the result
+        line: The JSON draft state
+        options: role, top_n and explain defaults from the command line
+
+    Returns:
+        The result record (recommendations or an error)
+    """
+    try:
+        state = json.loads(line)
+        if not isinstance(state, dict):
+            raise ValueError("expected a JSON object")
+    except ValueError as e:
+        return {"line": line_number, "error": f"Invalid draft state: {str(e)}"}
+
+    result = {"line": line_number}
+    if "id" in state:
+        result["id"] = state["id"]
+
+    role = state.get("role") or options["role"]
+    if not role:
+        return {**result, "error": "No role given (set \"role\" or --role)"}
+
+    try:
+        recommendations = engine.recommend_champions(
+            role=role,
+            top_n=state.get("top_n", options["top_n"]),
+            **{field: state[field] for field in STATE_FIELDS if field in state}
+        )
+    except Exception as e:
+        return {**result, "error": f"{type(e).__name__}: {e}"}
+
+    return {
+        **result,
+        "role": role,
+        "recommendations": [format_recommendation(engine, rec, options["explain"]) for rec in recommendations]
+    }
+
+
+def recommend_chunk(engine: DraftEngine, lines: List[Tuple[int, str]], options: Dict) -> str:
+    """Score a chunk of NDJSON lines, returning the NDJSON results."""
+    return "".join(
+        json.dumps(recommend_line(engine, number, line, options), ensure_ascii=False) + "\n"
+        for number, line in lines
+    )
+
+
+# Engine loaded once per worker process by _init_worker
+_worker_engine: Optional[DraftEngine] = None
+
+
+def _init_worker(data_dir: str):
+    global _worker_engine
+    _worker_engine = DraftEngine(data_dir=data_dir)
+
+
+def _recommend_chunk_in_worker(lines: List[Tuple[int, str]], options: Dict) -> str:
+    return recommend_chunk(_worker_engine, lines, options)
+
+
+def numbered_lines(stream: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Non-blank input lines with their 1-based line numbers."""
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            yield number, line
+
+
+def run_batch(stream: Iterable[str], output, data_dir: str, role: str = None, top_n: int = 5,
+              explain: str = "reasons", workers: int = None, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Score every draft state of an NDJSON stream and write the results in order.
+
+    Args:
+        stream: Input lines (consumed lazily)
+        output: Writable text stream for the NDJSON results
+        data_dir: Data directory the engine loads
+        role, top_n: Defaults for states that do not set them
+        explain: Explanation level (see EXPLAIN_LEVELS)
+        workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+        chunk_size: States per unit of work
+
+    Returns:
+        Number of states processed
+    """
+    options = {"role": role, "top_n": top_n, "explain": explain}
+    workers = workers or cpu_count()
+    processed = 0
+
+    if workers == 1:
+        engine = DraftEngine(data_dir=data_dir)
+        for chunk in chunked(numbered_lines(stream), chunk_size):
+            output.write(recommend_chunk(engine, chunk, options))
+            processed += len(chunk)
+        return processed
+
+    with Pool(workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+        pending = deque()
+        for chunk in chunked(numbered_lines(stream), chunk_size):
+            pending.append(pool.apply_async(_recommend_chunk_in_worker, (chunk, options)))
+            processed += len(chunk)
+            # Bound the chunks in flight; results are written in submission order
+            if len(pending) >= workers * 2:
+                output.write(pending.popleft().get())
+        while pending:
+            output.write(pending.popleft().get())
+
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend champions for NDJSON draft states")
+    parser.add_argument("input", nargs="?", default="-", help="NDJSON file of draft states (default: stdin)")
+    parser.add_argument("--role", help="Role for states that do not set one")
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--explain", choices=EXPLAIN_LEVELS, default="reasons")
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent.parent / "data"))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    stream = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        processed = run_batch(stream, sys.stdout, args.data_dir, role=args.role, top_n=args.top_n,
+                              explain=args.explain, workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    elapsed = time.perf_counter() - start
+
+    # Progress goes to stderr, stdout carries the NDJSON results only
+    print(f"✅ {processed} draft states in {elapsed:.1f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
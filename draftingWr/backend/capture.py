@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Wild Rift Draft Tool - Slow Request Capture
+Keeps slow and failed requests as reproducible benchmark cases.
+
+The API records the canonical request, data version, outcome and phase
+timings of every request slower than a threshold (or that fails) into a
+bounded on-disk ring buffer: a directory of numbered slot files, the oldest
+slot being overwritten once the buffer is full.
+
+The replay command re-runs a capture directory against the engine and
+compares the recorded engine time with the replayed one.
+
+Usage:
+    python backend/capture.py replay [--dir data/captures] [--repeat 5] [--out replay.json]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent))
+
+
+# Default latency (ms) above which a request is captured
+SLOW_REQUEST_MS = 250
+
+# Default number of slots in the ring buffer
+CAPTURE_CAPACITY = 500
+
+# Endpoints whose captures hold recommend_champions arguments (one side per capture for /recommend/both)
+REPLAYABLE_ENDPOINTS = ("/recommend", "/recommend/both")
+
+
+def canonical_request(params: Dict) -> Dict:
+    """Request parameters with the bans sorted (picks keep their order, see canonical_draft_key)."""
+    request = dict(params)
+    if request.get("banned_champions") is not None:
+        request["banned_champions"] = sorted(request["banned_champions"])
+    return request
+
+
+class CaptureBuffer:
+    """
+    Bounded ring buffer of captured requests, one JSON file per slot.
+
+    Args:
+        directory: Where the slot files live (created if missing)
+        capacity: Number of slots; the oldest capture is overwritten when full
+        threshold_ms: Latency above which should_capture() is true
+    """
+
+    def __init__(self, directory: str, capacity: int = CAPTURE_CAPACITY,
+                 threshold_ms: float = SLOW_REQUEST_MS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        # A single writer thread keeps disk I/O off the request path, in order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self.captured = 0
+
+        # Resume after the most recently written capture
+        self._next_seq = 0
+        slots = list(self.directory.glob("*.json"))
+        if slots:
+            newest = max(slots, key=lambda path: path.stat().st_mtime)
+            with open(newest, 'r', encoding='utf-8') as f:
+                self._next_seq = json.load(f)["seq"] + 1
+
+    def should_capture(self, elapsed_ms: float, failed: bool = False) -> bool:
+        return failed or elapsed_ms >= self.threshold_ms
+
+    def _slot_path(self, seq: int) -> Path:
+        return self.directory / f"{seq % self.capacity:05d}.json"
+
+    def capture(self, entry: Dict) -> int:
+        """
+        Queue an entry for writing and return its sequence number.
+
+        Args:
+            entry: JSON-serializable capture (endpoint, request, timings, ...)
+        """
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self.captured += 1
+        entry = {"seq": seq, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **entry}
+        self._writer.submit(self._write, seq, entry)
+        return seq
+
+    def _write(self, seq: int, entry: Dict):
+        path = self._slot_path(seq)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(path)
+
+    def flush(self):
+        """Wait for queued writes to reach the disk."""
+        self._writer.submit(lambda: None).result()
+
+    def entries(self) -> List[Dict]:
+        """All captures in the buffer, oldest first."""
+        self.flush()
+        loaded = []
+        for path in self.directory.glob("*.json"):
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded.append(json.load(f))
+        return sorted(loaded, key=lambda entry: entry["seq"])
+
+    def stats(self) -> Dict:
+        return {
+            "directory": str(self.directory),
+            "threshold_ms": self.threshold_ms,
+            "capacity": self.capacity,
+            "captured": self.captured
+        }
+
+
+def replay_captures(engine, entries: List[Dict], repeat: int = 5) -> List[Dict]:
+    """
+    Re-run captured recommendation requests and compare engine timings.
+
+    Args:
+        engine: DraftEngine to replay against
+        entries: Captures from CaptureBuffer.entries()
+        repeat: Runs per capture (the median is reported)
+
+    Returns:
+        One comparison per capture: recorded vs replayed engine time (ms),
+        their ratio, and whether a recorded error still reproduces
+    """
+    results = []
+    for entry in entries:
+        if entry.get("endpoint") not in REPLAYABLE_ENDPOINTS:
+            continue
+
+        durations = []
+        error = None
+        timings = {}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                engine.recommend_champions(**entry["request"], timings=timings)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            durations.append((time.perf_counter() - start) * 1000)
+
+        durations.sort()
+        replayed = durations[len(durations) // 2]
+        recorded = entry.get("timings_ms", {}).get("engine")
+        results.append({
+            "seq": entry["seq"],
+            "recorded_data_version": entry.get("data_version"),
+            "same_data_version": entry.get("data_version") == engine.data_version,
+            "recorded_ms": recorded,
+            "replayed_ms": replayed,
+            "ratio": replayed / recorded if recorded else None,
+            "recorded_error": entry.get("error"),
+            "replayed_error": error,
+            "replayed_phases_ms": timings
+        })
+    return results
+
+
+def main():
+    from draft_engine import DraftEngine
+
+    parser = argparse.ArgumentParser(description="Replay captured slow or failed requests")
+    parser.add_argument("command", choices=["replay"])
+    parser.add_argument("--dir", default=str(Path(__file__).parent.parent / "data" / "captures"))
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent.parent / "data"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="Write the comparison as JSON to this file")
+    args = parser.parse_args()
+
+    entries = CaptureBuffer(args.dir).entries()
+    engine = DraftEngine(data_dir=args.data_dir)
+    results = replay_captures(engine, entries, repeat=args.repeat)
+
+    print(f"🔁 Replayed {len(results)} captures (data version {engine.data_version})")
+    for result in results:
+        recorded = f"{result['recorded_ms']:.1f}" if result["recorded_ms"] is not None else "-"
+        ratio = f"x{result['ratio']:.2f}" if result["ratio"] is not None else ""
+        line = f"  #{result['seq']:<6} recorded {recorded:>8} ms  replayed {result['replayed_ms']:8.1f} ms {ratio}"
+        if result["recorded_error"]:
+            line += "  ❌ reproduced" if result["replayed_error"] else "  ✅ fixed"
+        if not result["same_data_version"]:
+            line += "  ⚠ data changed"
+        print(line)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Wild Rift Draft Tool - Request Coalescing
+Single-flight execution for identical concurrent requests.
+
+In a shared draft room many clients send the same draft state at the same
+moment. The first request runs the computation in a worker thread; identical
+requests arriving while it is in flight await the same result instead of
+starting their own. Nothing is kept once the computation finishes.
+"""
+
+import asyncio
+from typing import Callable, Dict, Hashable, List
+
+
+def canonical_draft_key(role: str = None, team: List[str] = None, enemy_team: List[str] = None,
+                        banned_champions: List[str] = None, **options) -> tuple:
+    """
+    Canonical, hashable key for a draft state.
+
+    Picks keep their order: it decides which teammate gets a repeated
+    synergy's diminished explanation, so differently ordered teams are
+    scored as different states. Bans only remove candidates and are sorted.
+
+    Args:
+        role, team, enemy_team, banned_champions: The draft state
+        options: Any other request parameter (top_n, lookahead, ...)
+    """
+    return (
+        role,
+        tuple(team or []),
+        tuple(enemy_team or []),
+        tuple(sorted(banned_champions or [])),
+        tuple(sorted(
+            (name, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+            for name, value in options.items()
+        ))
+    )
+
+
+async def run_in_default_executor(func: Callable, *args, **kwargs):
+    """Run a blocking call in the event loop's default executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one computation.
+
+    Args:
+        runner: Coroutine function running func(*args, **kwargs) off the event
+            loop (defaults to the loop's executor; the API passes its scheduler)
+    """
+
+    def __init__(self, runner: Callable = run_in_default_executor):
+        self._runner = runner
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) through the runner, or join the identical
+        call already in flight.
+
+        Returns:
+            The (shared) result of the computation
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shield so a disconnecting client does not cancel the others' result
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self._runner(func, *args, **kwargs))
+        self._inflight[key] = future
+        self.executed += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self) -> Dict:
+        """Counters for the metrics endpoint."""
+        total = self.executed + self.coalesced
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "coalesced_ratio": self.coalesced / total if total else 0.0
+        }
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Wild Rift Draft Tool - Dataset Build Pipeline
+Rebuilds data/*.json, the compiled engine artifacts and the opening book
+incrementally.
+
+Every stage declares its input and output files. A manifest of content
+hashes (data/build/manifest.json) records what each stage last saw, so a
+run only reprocesses the stages whose inputs changed. The opening book
+depends on every data file and takes seconds to score, so it is only built
+on request (--book).
+
+Usage:
+    python backend/data_pipeline.py [--force] [--book] [--root PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# Data files loaded by the engine; their hashes make up the data version
+DATA_FILES = [
+    "champions.json",
+    "synergies.json",
+    "counters.json",
+    "champion_counters.json",
+    "tier_list.json",
+    "champion_meta.json",
+]
+
+# Data files the compiled artifacts depend on (tier and meta edits skip recompiling)
+COMPILED_INPUTS = [
+    "champions.json",
+    "counters.json",
+    "champion_counters.json",
+]
+
+# Engine sources (in backend/) that build outputs depend on besides the data:
+# their hashes make up the code version stamped on the compiled artifacts
+ENGINE_SOURCES = [
+    "draft_engine.py",
+    "search_index.py",
+]
+
+BUILD_DIR = "build"
+MANIFEST_FILE = "manifest.json"
+COMPILED_FILE = "compiled.json"
+BOOK_FILE = "opening_book.json.gz"
+
+# Mapping for special DDragon names
+DDRAGON_NAME_MAP = {
+    "Dr. Mundo": "DrMundo",
+    "Jarvan IV": "JarvanIV",
+    "Kai'Sa": "Kaisa",
+    "Kha'Zix": "Khazix",
+    "Kog'Maw": "KogMaw",
+    "Lee Sin": "LeeSin",
+    "Master Yi": "MasterYi",
+    "Miss Fortune": "MissFortune",
+    "Nunu & Willump": "Nunu",
+    "Twisted Fate": "TwistedFate",
+    "Vel'Koz": "Velkoz",
+    "Xin Zhao": "XinZhao",
+    "Wukong": "MonkeyKing",
+    "Aurelion Sol": "AurelionSol",
+    "Renata Glasc": "Renata",
+    "Bel'Veth": "Belveth",
+    "Cho'Gath": "Chogath",
+    "Rek'Sai": "Reksai",
+    "Tahm Kench": "TahmKench"
+}
+
+# Role mapping (Wild Rift terms -> Internal IDs)
+ROLE_MAP = {
+    "Baron": "top",
+    "Mid": "mid",
+    "Jungle": "jungle",
+    "ADC": "adc",
+    "Support": "support"
+}
+
+# Default tags by role
+DEFAULT_TAGS = {
+    "top": ["melee", "bruiser", "solo"],
+    "jungle": ["jungle", "gank", "farm"],
+    "mid": ["burst", "mage", "roam"],
+    "adc": ["ranged", "physical", "dps", "carry"],
+    "support": ["utility", "protect", "cc"]
+}
+
+# Default meta values for champions missing from champion_meta.json, by primary role
+DEFAULT_META = {
+    "support": {"power_spike": "mid", "early_impact": 0.7, "late_scaling": 0.6},
+    "adc": {"power_spike": "late", "early_impact": 0.4, "late_scaling": 0.85},
+    "jungle": {"power_spike": "mid", "early_impact": 0.6, "late_scaling": 0.6},
+    "mid": {"power_spike": "mid", "early_impact": 0.6, "late_scaling": 0.7},
+    "top": {"power_spike": "mid", "early_impact": 0.6, "late_scaling": 0.7},
+}
+
+
+# =========================================================================
+# Hashing and manifest
+# =========================================================================
+
+def file_hash(path: Path) -> Optional[str]:
+    """SHA-256 of a file's content, None if it does not exist."""
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def compute_data_version(data_dir, files: List[str] = None) -> str:
+    """
+    Compute the data version id from the content hashes of the data files.
+
+    Args:
+        data_dir: Directory holding the data JSON files
+        files: Files to include (defaults to every data file)
+
+    Returns:
+        Short hex id that changes whenever any of the files changes
+    """
+    data_dir = Path(data_dir)
+    digest = hashlib.sha256()
+    for filename in files or DATA_FILES:
+        digest.update(f"{filename}:{file_hash(data_dir / filename)}\n".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def compute_code_version() -> str:
+    """
+    Compute the code version id from the engine sources that are running.
+
+    Returns:
+        Short hex id that changes whenever any of ENGINE_SOURCES changes
+    """
+    backend_dir = Path(__file__).parent
+    digest = hashlib.sha256()
+    for filename in ENGINE_SOURCES:
+        digest.update(f"{filename}:{file_hash(backend_dir / filename)}\n".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def load_compiled(data_dir) -> Optional[Dict]:
+    """
+    Load the compiled engine artifacts if they were built from the current
+    inputs by the current engine code.
+
+    Returns:
+        The compiled artifact dict, or None if missing or stale
+    """
+    path = Path(data_dir) / BUILD_DIR / COMPILED_FILE
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        compiled = json.load(f)
+    if compiled.get("inputs_version") != compute_data_version(data_dir, COMPILED_INPUTS):
+        return None
+    if compiled.get("code_version") != compute_code_version():
+        return None
+    return compiled
+
+
+def _read_json(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json_if_changed(path: Path, data) -> bool:
+    """Write JSON only when the content differs, so unchanged files keep their hash."""
+    if path.exists() and _read_json(path) == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return True
+
+
+# =========================================================================
+# Stages
+# =========================================================================
+
+def get_ddragon_name(name: str) -> str:
+    if name in DDRAGON_NAME_MAP:
+        return DDRAGON_NAME_MAP[name]
+    # Remove spaces and apostrophes for standard cases
+    return name.replace(" ", "").replace("'", "").replace(".", "")
+
+
+def parse_roles(role_str: str) -> Dict[str, float]:
+    parts = role_str.split(" / ")
+    roles = {}
+
+    primary_role = ROLE_MAP.get(parts[0], "mid")
+    roles[primary_role] = 1.0
+
+    if len(parts) > 1:
+        secondary_role = ROLE_MAP.get(parts[1], "mid")
+        roles[secondary_role] = 0.6
+
+    return roles
+
+
+def infer_tags(roles: Dict[str, float], name: str) -> List[str]:
+    primary_role = list(roles.keys())[0]  # The 1.0 one
+    tags = DEFAULT_TAGS.get(primary_role, []).copy()
+
+    # Simple heuristics
+    if "Assass" in name or primary_role == "jungle":
+        tags.append("mobility")
+    if primary_role == "support" or "Tank" in name:
+        tags.append("cc")
+
+    return list(set(tags))  # unique
+
+
+def build_champions(root: Path, data_dir: Path) -> bool:
+    """
+    Regenerate champions.json from champions_list.txt.
+    Existing entries are preserved (image URL refreshed), new ones get inferred
+    roles and tags, and every champion gets its own ID as a kit tag.
+    """
+    path = data_dir / "champions.json"
+    existing = {c["name"]: c for c in _read_json(path)["champions"]} if path.exists() else {}
+
+    champions = []
+    with open(root / "champions_list.txt", 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            name, role_str = line.strip().split('|')
+
+            ddragon_name = get_ddragon_name(name)
+            image_url = f"https://ddragon.leagueoflegends.com/cdn/15.2.1/img/champion/{ddragon_name}.png"
+
+            if name in existing:
+                champ = existing[name]
+                champ["image_url"] = image_url
+            else:
+                roles = parse_roles(role_str)
+                champ = {
+                    "id": ddragon_name[0].lower() + ddragon_name[1:],  # camelCase ish
+                    "name": name,
+                    "roles": roles,
+                    "kit_tags": infer_tags(roles, name),
+                    "damage_type": "Adaptive",  # Default
+                    "scaling": "mid",
+                    "description": f"{role_str} champion",
+                    "image_url": image_url
+                }
+
+            # Add champion ID as a tag to its own kit_tags (e.g. "xayah" for Xayah)
+            if champ["id"] not in champ.get("kit_tags", []):
+                champ.setdefault("kit_tags", []).append(champ["id"])
+
+            champions.append(champ)
+
+    champions.sort(key=lambda x: x["name"])
+    return _write_json_if_changed(path, {"champions": champions})
+
+
+def _champion_map(data_dir: Path) -> Dict[str, Dict]:
+    return {c["id"]: c for c in _read_json(data_dir / "champions.json")["champions"]}
+
+
+def build_tier_list(root: Path, data_dir: Path) -> bool:
+    """Keep only known champions in tier_list.json and add missing ones as tier B."""
+    champions = _champion_map(data_dir)
+    path = data_dir / "tier_list.json"
+    tier_data = _read_json(path)
+
+    tiers = {k: v for k, v in tier_data["champion_tiers"].items() if k in champions}
+    for champ_id in champions:
+        tiers.setdefault(champ_id, {
+            "tier": "B",
+            "notes": "Auto-generated - needs manual tier assignment"
+        })
+
+    tier_data["champion_tiers"] = dict(sorted(tiers.items()))
+    return _write_json_if_changed(path, tier_data)
+
+
+def build_champion_meta(root: Path, data_dir: Path) -> bool:
+    """Keep only known champions in champion_meta.json and add role-based defaults."""
+    champions = _champion_map(data_dir)
+    path = data_dir / "champion_meta.json"
+    meta_data = _read_json(path)
+
+    meta = {k: v for k, v in meta_data["champion_meta"].items() if k in champions}
+    for champ_id, champ in champions.items():
+        if champ_id in meta:
+            continue
+        roles = list(champ.get("roles", {}).keys())
+        primary = next((r for r in ["support", "adc", "jungle", "mid"] if r in roles), "top")
+        meta[champ_id] = {
+            "power_spike": DEFAULT_META[primary]["power_spike"],
+            "flex_roles": roles[:2] if len(roles) > 1 else roles,
+            "early_impact": DEFAULT_META[primary]["early_impact"],
+            "late_scaling": DEFAULT_META[primary]["late_scaling"]
+        }
+
+    meta_data["champion_meta"] = dict(sorted(meta.items()))
+    return _write_json_if_changed(path, meta_data)
+
+
+def build_champion_counters(root: Path, data_dir: Path) -> bool:
+    """Drop champion matchups whose champion or targets are unknown."""
+    champions = _champion_map(data_dir)
+    path = data_dir / "champion_counters.json"
+
+    entries = []
+    for entry in _read_json(path):
+        if entry.get("champion") not in champions:
+            continue
+        entry["counters"] = [c for c in entry.get("counters", []) if c["target"] in champions]
+        entry["strong_against"] = [s for s in entry.get("strong_against", []) if s["target"] in champions]
+        if entry["counters"] or entry["strong_against"]:
+            entries.append(entry)
+
+    return _write_json_if_changed(path, entries)
+
+
+def validate(data_dir: Path) -> Dict[str, List[str]]:
+    """
+    Check referential integrity of the dataset in a single pass over each file.
+
+    Errors: matchup champions/targets that do not exist, champions missing
+    from the tier list or meta. Warnings: rule tags no champion has.
+    """
+    errors = []
+    warnings = []
+    champion_ids = set()
+    known_tags = set()
+
+    for champ in _read_json(data_dir / "champions.json")["champions"]:
+        champion_ids.add(champ["id"])
+        known_tags.add(champ["id"])
+        known_tags.update(champ.get("kit_tags", []))
+
+    for entry in _read_json(data_dir / "champion_counters.json"):
+        if entry.get("champion") not in champion_ids:
+            errors.append(f"champion_counters: unknown champion '{entry.get('champion')}'")
+        for matchup in entry.get("counters", []) + entry.get("strong_against", []):
+            if matchup["target"] not in champion_ids:
+                errors.append(f"champion_counters: {entry.get('champion')} targets unknown '{matchup['target']}'")
+
+    for synergy in _read_json(data_dir / "synergies.json")["synergies"]:
+        for tag in synergy["tags"]:
+            if tag not in known_tags:
+                warnings.append(f"synergies: '{synergy['name']}' uses unknown tag '{tag}'")
+
+    for counter in _read_json(data_dir / "counters.json")["counters"]:
+        for tag in counter["attacker_tags"] + counter["defender_tags"]:
+            if tag not in known_tags:
+                warnings.append(f"counters: '{counter['name']}' uses unknown tag '{tag}'")
+
+    tiers = _read_json(data_dir / "tier_list.json")["champion_tiers"]
+    for champ_id in champion_ids - set(tiers):
+        errors.append(f"tier_list: missing champion '{champ_id}'")
+
+    meta = _read_json(data_dir / "champion_meta.json")["champion_meta"]
+    for champ_id in champion_ids - set(meta):
+        errors.append(f"champion_meta: missing champion '{champ_id}'")
+
+    return {"errors": sorted(errors), "warnings": sorted(warnings)}
+
+
+def build_compiled(root: Path, data_dir: Path) -> bool:
+    """Compile the engine's precomputed matchup vectors for fast startup."""
+    from draft_engine import DraftEngine
+
+    engine = DraftEngine(data_dir=str(data_dir), use_compiled=False)
+    compiled = {
+        "inputs_version": compute_data_version(data_dir, COMPILED_INPUTS),
+        "code_version": compute_code_version(),
+        "champions": [c["id"] for c in engine.champions],
+        "threat_vectors": engine.threat_vectors,
+        "counter_vectors": engine.counter_vectors,
+    }
+    return _write_json_if_changed(data_dir / BUILD_DIR / COMPILED_FILE, compiled)
+
+
+def build_opening_book(root: Path, data_dir: Path) -> bool:
+    """Precompute recommendations for early draft states (see opening_book.py)."""
+    from opening_book import build_book
+
+    return build_book(str(data_dir)).save(str(data_dir))
+
+
+# Stages in dependency order. Paths are relative to the project root.
+# Optional stages only run when requested by name (see build()).
+STAGES = [
+    {
+        "name": "champions",
+        "inputs": ["champions_list.txt", "data/champions.json"],
+        "outputs": ["data/champions.json"],
+        "run": build_champions,
+    },
+    {
+        "name": "tier_list",
+        "inputs": ["data/champions.json", "data/tier_list.json"],
+        "outputs": ["data/tier_list.json"],
+        "run": build_tier_list,
+    },
+    {
+        "name": "champion_meta",
+        "inputs": ["data/champions.json", "data/champion_meta.json"],
+        "outputs": ["data/champion_meta.json"],
+        "run": build_champion_meta,
+    },
+    {
+        "name": "champion_counters",
+        "inputs": ["data/champions.json", "data/champion_counters.json"],
+        "outputs": ["data/champion_counters.json"],
+        "run": build_champion_counters,
+    },
+    {
+        "name": "compiled",
+        "inputs": [f"data/{f}" for f in COMPILED_INPUTS] + [f"backend/{f}" for f in ENGINE_SOURCES],
+        "outputs": [f"data/{BUILD_DIR}/{COMPILED_FILE}"],
+        "run": build_compiled,
+    },
+    {
+        "name": "opening_book",
+        "optional": True,
+        # Rankings also depend on the scoring code
+        "inputs": [f"data/{f}" for f in DATA_FILES] + [f"backend/{f}" for f in ENGINE_SOURCES],
+        "outputs": [f"data/{BUILD_DIR}/{BOOK_FILE}"],
+        "run": build_opening_book,
+    },
+]
+
+
+# =========================================================================
+# Pipeline
+# =========================================================================
+
+def _hashes(root: Path, paths: List[str]) -> Dict[str, Optional[str]]:
+    return {p: file_hash(root / p) for p in paths}
+
+
+def build(root, force: bool = False, verbose: bool = True, include: Iterable[str] = ()) -> Dict:
+    """
+    Run the pipeline, skipping stages whose inputs and outputs are unchanged.
+
+    Args:
+        root: Project root (holds champions_list.txt and data/)
+        force: Rebuild every stage
+        verbose: Print a line per stage
+        include: Optional stages to run as well (e.g. "opening_book")
+
+    Returns:
+        The new manifest (data version, file hashes, stage results, validation)
+    """
+    root = Path(root)
+    data_dir = root / "data"
+    manifest_path = data_dir / BUILD_DIR / MANIFEST_FILE
+    previous = _read_json(manifest_path) if manifest_path.exists() else {}
+    previous_stages = previous.get("stages", {})
+
+    stages = {}
+    ran = []
+    for stage in STAGES:
+        start = time.perf_counter()
+
+        # Optional stages keep their last record until they are requested
+        if stage.get("optional") and stage["name"] not in include:
+            if stage["name"] in previous_stages:
+                stages[stage["name"]] = previous_stages[stage["name"]]
+            if verbose:
+                print(f"  - {stage['name']}: skipped (not requested)")
+            continue
+
+        # Optional inputs outside data/ (e.g. champions_list.txt in slim images)
+        if any(not (root / p).exists() for p in stage["inputs"]):
+            if verbose:
+                print(f"  - {stage['name']}: skipped (missing inputs)")
+            continue
+
+        inputs = _hashes(root, stage["inputs"])
+        record = previous_stages.get(stage["name"], {})
+        up_to_date = (
+            not force and
+            record.get("inputs") == inputs and
+            record.get("outputs") == _hashes(root, stage["outputs"])
+        )
+
+        if up_to_date:
+            stages[stage["name"]] = record
+            if verbose:
+                print(f"  - {stage['name']}: up to date")
+            continue
+
+        changed = stage["run"](root, data_dir)
+        ran.append(stage["name"])
+
+        # Record the hashes after the run: a stage that rewrites its own input
+        # is then up to date on the next run
+        stages[stage["name"]] = {
+            "inputs": _hashes(root, stage["inputs"]),
+            "outputs": _hashes(root, stage["outputs"]),
+        }
+        if verbose:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"  ✓ {stage['name']}: {'rewritten' if changed else 'unchanged'} ({elapsed_ms:.1f} ms)")
+
+    files = _hashes(data_dir, DATA_FILES)
+    if ran or files != previous.get("files") or "validation" not in previous:
+        validation = validate(data_dir)
+    else:
+        validation = previous["validation"]
+
+    manifest = {
+        "data_version": compute_data_version(data_dir),
+        "files": files,
+        "stages": stages,
+        "validation": validation,
+    }
+    _write_json_if_changed(manifest_path, manifest)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the draft tool dataset incrementally")
+    parser.add_argument("--root", default=str(Path(__file__).parent.parent),
+                        help="Project root holding champions_list.txt and data/")
+    parser.add_argument("--force", action="store_true", help="Rebuild every stage")
+    parser.add_argument("--book", action="store_true", help="Also rebuild the opening book if stale")
+    args = parser.parse_args()
+
+    print("🔧 Building dataset...")
+    start = time.perf_counter()
+    manifest = build(args.root, force=args.force, include=["opening_book"] if args.book else [])
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for warning in manifest["validation"]["warnings"]:
+        print(f"  ⚠ {warning}")
+    for error in manifest["validation"]["errors"]:
+        print(f"  ❌ {error}")
+
+    print(f"✅ Data version {manifest['data_version']} ({elapsed_ms:.1f} ms)")
+    return 1 if manifest["validation"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).parent))
+    sys.exit(main())
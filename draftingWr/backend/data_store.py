@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Wild Rift Draft Tool - Data Stores
+Storage backends the draft engine loads its tables from.
+
+JSONDataStore reads data/*.json directly (default, fine for small deployments).
+OverlayDataStore layers a patch directory holding only the changed files over
+another store (see dataset_versions.py).
+SQLiteDataStore reads a database built from those files, with indexes on role
+viability, kit tags, matchup source/target and rule tags. The engine still
+builds its precomputed tables (matchup vectors, synergy bounds) from the full
+tables at startup, but its per-request lookups (viable champions, the
+matchups and counter rules between two champions, the synergy rules a
+candidate touches) go through the indexed queries, so large custom rule sets
+are read per lookup instead of scanned.
+
+Usage:
+    python backend/data_store.py [--data-dir data] [--db data/draft.db]
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from data_pipeline import DATA_FILES, compute_data_version, file_hash
+
+
+SCHEMA = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT);
+
+CREATE TABLE champions (id TEXT PRIMARY KEY, position INTEGER, name TEXT,
+                        damage_type TEXT, scaling TEXT, data TEXT);
+CREATE TABLE champion_roles (champion_id TEXT, role TEXT, viability REAL);
+CREATE INDEX idx_champion_roles ON champion_roles (role, viability);
+CREATE TABLE champion_tags (champion_id TEXT, tag TEXT);
+CREATE INDEX idx_champion_tags ON champion_tags (tag);
+
+CREATE TABLE matchups (position INTEGER, source TEXT, target TEXT, kind TEXT,
+                       strength REAL, reason TEXT);
+CREATE INDEX idx_matchups_source ON matchups (source);
+CREATE INDEX idx_matchups_target ON matchups (target);
+
+CREATE TABLE synergy_rules (id INTEGER PRIMARY KEY, data TEXT);
+CREATE TABLE synergy_tags (rule_id INTEGER, tag TEXT);
+CREATE INDEX idx_synergy_tags ON synergy_tags (tag);
+
+CREATE TABLE counter_rules (id INTEGER PRIMARY KEY, data TEXT);
+CREATE TABLE counter_tags (rule_id INTEGER, side TEXT, tag TEXT);
+CREATE INDEX idx_counter_tags ON counter_tags (tag, side);
+
+CREATE TABLE tier_list (data TEXT);
+CREATE TABLE champion_meta (champion_id TEXT PRIMARY KEY, data TEXT);
+"""
+
+
+class JSONDataStore:
+    """Loads engine tables straight from the JSON files in a data directory."""
+
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = Path(data_dir)
+
+    def load(self, filename: str):
+        """Load a JSON file from the data directory."""
+        with open(self.data_dir / filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def data_version(self) -> str:
+        return compute_data_version(self.data_dir)
+
+
+class OverlayDataStore:
+    """
+    A base store with some data files replaced by those in an overlay directory.
+
+    Args:
+        base: Store providing every file the overlay does not
+        overlay_dir: Directory holding the changed data files only
+    """
+
+    def __init__(self, base, overlay_dir: str):
+        self.base = base
+        self.overlay_dir = Path(overlay_dir)
+
+    def files(self) -> List[str]:
+        """Data files the overlay replaces."""
+        return [filename for filename in DATA_FILES if (self.overlay_dir / filename).exists()]
+
+    def load(self, filename: str):
+        if (self.overlay_dir / filename).exists():
+            with open(self.overlay_dir / filename, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return self.base.load(filename)
+
+    def data_version(self) -> str:
+        """Version id of the base combined with the overlay file hashes."""
+        digest = hashlib.sha256(f"base:{self.base.data_version()}\n".encode("utf-8"))
+        for filename in self.files():
+            digest.update(f"{filename}:{file_hash(self.overlay_dir / filename)}\n".encode("utf-8"))
+        return digest.hexdigest()[:12]
+
+
+class SQLiteDataStore:
+    """
+    Loads engine tables from a SQLite database built by build_sqlite.
+
+    The database is opened read-only, with one connection per thread, so every
+    API worker thread gets its own connection and none can write.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"SQLite database not found: {db_path}")
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Read-only connection owned by the current thread."""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._local.connection = conn
+        return conn
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return self.connection.execute(sql, params).fetchall()
+
+    def load(self, filename: str):
+        """Rebuild the content of a data JSON file from the database."""
+        if filename == "champions.json":
+            rows = self._query("SELECT data FROM champions ORDER BY position")
+            return {"champions": [json.loads(data) for (data,) in rows]}
+
+        if filename == "synergies.json":
+            rows = self._query("SELECT data FROM synergy_rules ORDER BY id")
+            return {"synergies": [json.loads(data) for (data,) in rows]}
+
+        if filename == "counters.json":
+            rows = self._query("SELECT data FROM counter_rules ORDER BY id")
+            return {"counters": [json.loads(data) for (data,) in rows]}
+
+        if filename == "champion_counters.json":
+            entries = {}
+            rows = self._query(
+                "SELECT source, target, kind, strength, reason FROM matchups ORDER BY position"
+            )
+            for source, target, kind, strength, reason in rows:
+                entry = entries.setdefault(source, {"champion": source, "counters": [], "strong_against": []})
+                entry[kind].append({"target": target, "strength": strength, "reason": reason})
+            return list(entries.values())
+
+        if filename == "tier_list.json":
+            (data,) = self._query("SELECT data FROM tier_list")[0]
+            return json.loads(data)
+
+        if filename == "champion_meta.json":
+            rows = self._query("SELECT champion_id, data FROM champion_meta ORDER BY champion_id")
+            return {"champion_meta": {champ_id: json.loads(data) for champ_id, data in rows}}
+
+        raise FileNotFoundError(f"Unknown data file: {filename}")
+
+    def data_version(self) -> str:
+        (value,) = self._query("SELECT value FROM metadata WHERE key = 'data_version'")[0]
+        return value
+
+    # ---------------------------------------------------------------------
+    # Indexed queries
+    # ---------------------------------------------------------------------
+
+    def viable_champions(self, role: str, min_viability: float = 0.5) -> List[Dict]:
+        """Champions viable for a role, best first (uses the role index)."""
+        rows = self._query(
+            "SELECT c.data, r.viability FROM champion_roles r "
+            "JOIN champions c ON c.id = r.champion_id "
+            "WHERE r.role = ? AND r.viability >= ? ORDER BY r.viability DESC, c.position",
+            (role, min_viability)
+        )
+        return [{**json.loads(data), "role_viability": viability} for data, viability in rows]
+
+    def champions_with_tag(self, tag: str) -> List[str]:
+        """IDs of champions having a kit tag."""
+        rows = self._query("SELECT champion_id FROM champion_tags WHERE tag = ?", (tag,))
+        return [champ_id for (champ_id,) in rows]
+
+    def matchups_from(self, source: str) -> List[Dict]:
+        """Matchups where a champion is the one countering."""
+        rows = self._query(
+            "SELECT target, kind, strength, reason FROM matchups WHERE source = ? ORDER BY position",
+            (source,)
+        )
+        return [{"target": t, "kind": k, "strength": s, "reason": r} for t, k, s, r in rows]
+
+    def matchups_against(self, target: str) -> List[Dict]:
+        """Matchups where a champion is the one being countered."""
+        rows = self._query(
+            "SELECT source, kind, strength, reason FROM matchups WHERE target = ? ORDER BY position",
+            (target,)
+        )
+        return [{"source": src, "kind": k, "strength": s, "reason": r} for src, k, s, r in rows]
+
+    def matchups_between(self, source: str, target: str) -> List[Tuple[int, str, Dict]]:
+        """
+        A champion's matchup entries against one target, as (position, kind,
+        entry) in list order (uses the source index).
+        """
+        rows = self._query(
+            "SELECT position, kind, strength, reason FROM matchups "
+            "WHERE source = ? AND target = ? ORDER BY position",
+            (source, target)
+        )
+        return [(position, kind, {"target": target, "strength": s, "reason": r})
+                for position, kind, s, r in rows]
+
+    def synergies_with_tag(self, tag: str) -> List[Dict]:
+        """Synergy rules that involve a tag."""
+        rows = self._query(
+            "SELECT DISTINCT r.id, r.data FROM synergy_tags t JOIN synergy_rules r ON r.id = t.rule_id "
+            "WHERE t.tag = ? ORDER BY r.id",
+            (tag,)
+        )
+        return [json.loads(data) for _, data in rows]
+
+    def synergies_touching(self, tags: Iterable[str]) -> List[Dict]:
+        """Synergy rules involving any of the tags, in rule order (one indexed query)."""
+        tags = list(tags)
+        if not tags:
+            return []
+        rows = self._query(
+            "SELECT DISTINCT r.id, r.data FROM synergy_tags t JOIN synergy_rules r ON r.id = t.rule_id "
+            f"WHERE t.tag IN ({', '.join('?' * len(tags))}) ORDER BY r.id",
+            tuple(tags)
+        )
+        return [json.loads(data) for _, data in rows]
+
+    def counters_touching(self, attacker_tags: Iterable[str], defender_tags: Iterable[str]) -> List[Dict]:
+        """
+        Counter rules that can apply between two tag sets, in rule order: an
+        attacker tag (or none at all) and a defender tag in common. The
+        caller still checks that every attacker tag is present.
+        """
+        attacker_tags, defender_tags = list(attacker_tags), list(defender_tags)
+        if not defender_tags:
+            return []
+        attacker_in = ", ".join("?" * len(attacker_tags)) or "NULL"
+        defender_in = ", ".join("?" * len(defender_tags))
+        rows = self._query(
+            "SELECT r.id, r.data FROM counter_rules r WHERE "
+            "(r.id IN (SELECT rule_id FROM counter_tags WHERE side = 'attacker' AND tag IN "
+            f"({attacker_in})) OR r.id NOT IN (SELECT rule_id FROM counter_tags WHERE side = 'attacker')) "
+            "AND r.id IN (SELECT rule_id FROM counter_tags WHERE side = 'defender' AND tag IN "
+            f"({defender_in})) ORDER BY r.id",
+            tuple(attacker_tags) + tuple(defender_tags)
+        )
+        return [json.loads(data) for _, data in rows]
+
+    def counters_with_tag(self, tag: str, side: str = "attacker") -> List[Dict]:
+        """Counter rules with a tag on the attacker or defender side."""
+        rows = self._query(
+            "SELECT DISTINCT r.id, r.data FROM counter_tags t JOIN counter_rules r ON r.id = t.rule_id "
+            "WHERE t.tag = ? AND t.side = ? ORDER BY r.id",
+            (tag, side)
+        )
+        return [json.loads(data) for _, data in rows]
+
+
+def build_sqlite(data_dir: str, db_path: str) -> str:
+    """
+    Build a SQLite database from the JSON files in a data directory.
+
+    Args:
+        data_dir: Directory holding the data JSON files
+        db_path: Database file to (re)create
+
+    Returns:
+        The data version stored in the database
+    """
+    source = JSONDataStore(data_dir)
+    db_path = Path(db_path)
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(str(tmp_path))
+    with conn:
+        conn.executescript(SCHEMA)
+        data_version = source.data_version()
+        conn.execute("INSERT INTO metadata VALUES ('data_version', ?)", (data_version,))
+
+        for position, champ in enumerate(source.load("champions.json")["champions"]):
+            conn.execute(
+                "INSERT INTO champions VALUES (?, ?, ?, ?, ?, ?)",
+                (champ["id"], position, champ["name"], champ.get("damage_type"),
+                 champ.get("scaling"), json.dumps(champ, ensure_ascii=False))
+            )
+            conn.executemany(
+                "INSERT INTO champion_roles VALUES (?, ?, ?)",
+                [(champ["id"], role, viability) for role, viability in champ.get("roles", {}).items()]
+            )
+            conn.executemany(
+                "INSERT INTO champion_tags VALUES (?, ?)",
+                [(champ["id"], tag) for tag in champ.get("kit_tags", [])]
+            )
+
+        position = 0
+        for entry in source.load("champion_counters.json"):
+            for kind in ("counters", "strong_against"):
+                for matchup in entry.get(kind, []):
+                    conn.execute(
+                        "INSERT INTO matchups VALUES (?, ?, ?, ?, ?, ?)",
+                        (position, entry["champion"], matchup["target"], kind,
+                         matchup["strength"], matchup.get("reason", ""))
+                    )
+                    position += 1
+
+        for rule_id, synergy in enumerate(source.load("synergies.json")["synergies"]):
+            conn.execute("INSERT INTO synergy_rules VALUES (?, ?)",
+                         (rule_id, json.dumps(synergy, ensure_ascii=False)))
+            conn.executemany("INSERT INTO synergy_tags VALUES (?, ?)",
+                             [(rule_id, tag) for tag in synergy["tags"]])
+
+        for rule_id, counter in enumerate(source.load("counters.json")["counters"]):
+            conn.execute("INSERT INTO counter_rules VALUES (?, ?)",
+                         (rule_id, json.dumps(counter, ensure_ascii=False)))
+            conn.executemany(
+                "INSERT INTO counter_tags VALUES (?, ?, ?)",
+                [(rule_id, "attacker", tag) for tag in counter["attacker_tags"]] +
+                [(rule_id, "defender", tag) for tag in counter["defender_tags"]]
+            )
+
+        conn.execute("INSERT INTO tier_list VALUES (?)",
+                     (json.dumps(source.load("tier_list.json"), ensure_ascii=False),))
+
+        for champ_id, meta in source.load("champion_meta.json")["champion_meta"].items():
+            conn.execute("INSERT INTO champion_meta VALUES (?, ?)",
+                         (champ_id, json.dumps(meta, ensure_ascii=False)))
+    conn.close()
+
+    # Swap in the new database atomically so running readers never see a partial build
+    tmp_path.replace(db_path)
+    return data_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite data store from the JSON files")
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent.parent / "data"))
+    parser.add_argument("--db", default=str(Path(__file__).parent.parent / "data" / "draft.db"))
+    args = parser.parse_args()
+
+    data_version = build_sqlite(args.data_dir, args.db)
+    print(f"✅ Built {args.db} (data version {data_version})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Wild Rift Draft Tool - Dataset Versions
+Serves several versions of the data side by side (e.g. the live patch and the
+upcoming one).
+
+A version is a directory holding only the data files that differ from the
+base dataset, e.g. data/versions/next/tier_list.json. Each version is derived
+from the base engine with DraftEngine.derive: unchanged tables and indexes are
+shared with the base, so a version costs memory in proportion to its diff and
+loading it only rebuilds the indexes its files feed.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from data_store import OverlayDataStore
+from draft_engine import DraftEngine
+
+
+# Name of the base dataset
+DEFAULT_VERSION = "live"
+
+
+class DatasetVersions:
+    """
+    Named engines: the base dataset plus versions derived from it.
+
+    Args:
+        base: Engine loaded from the full base dataset
+        name: Name the base dataset is served under
+    """
+
+    def __init__(self, base: DraftEngine, name: str = DEFAULT_VERSION):
+        self.default = name
+        self.base = base
+        self.engines: Dict[str, DraftEngine] = {name: base}
+
+    def add(self, name: str, changes: Dict[str, dict], data_version: str) -> DraftEngine:
+        """
+        Derive a version from the base dataset.
+
+        Args:
+            name: Version name requests select it by
+            changes: Data file name -> content, for the files that differ
+            data_version: Version id of the patched dataset
+        """
+        if name in self.engines:
+            raise ValueError(f"Dataset version already loaded: {name}")
+        engine = self.base.derive(changes, data_version)
+        self.engines[name] = engine
+        return engine
+
+    def load_directory(self, versions_dir: str) -> List[str]:
+        """
+        Add one version per subdirectory of versions_dir (named after it).
+
+        Returns:
+            Names of the versions added (none if the directory does not exist)
+        """
+        versions_dir = Path(versions_dir)
+        if not versions_dir.is_dir():
+            return []
+
+        added = []
+        for path in sorted(p for p in versions_dir.iterdir() if p.is_dir()):
+            store = OverlayDataStore(self.base.store, str(path))
+            changes = {filename: store.load(filename) for filename in store.files()}
+            self.add(path.name, changes, store.data_version())
+            added.append(path.name)
+        return added
+
+    def get(self, name: Optional[str] = None) -> DraftEngine:
+        """The engine for a version (the base dataset by default); KeyError if unknown."""
+        return self.engines[name or self.default]
+
+    def describe(self) -> Dict:
+        """
+        Every version with its data version and, for derived ones, the indexes
+        rebuilt and how many engine attributes are still shared with the base.
+        """
+        base_attributes = vars(self.base)
+        versions = {}
+        for name, engine in self.engines.items():
+            info = {"data_version": engine.data_version, "default": name == self.default}
+            if engine is not self.base:
+                attributes = vars(engine)
+                info["rebuilt_indexes"] = engine.rebuilt_indexes
+                info["shared_attributes"] = sum(
+                    1 for key, value in attributes.items() if base_attributes.get(key) is value
+                )
+                info["attributes"] = len(attributes)
+            versions[name] = info
+        return versions
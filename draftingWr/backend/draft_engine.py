@@ -3,10 +3,201 @@ Wild Rift Draft Engine - Kit-Based Recommendation System
 This module calculates champion recommendations based on kit synergies and counters.
 """
 
-import json
-from typing import List, Dict, Tuple
+import copy
+import heapq
+import math
+import re
+import time
+from bisect import bisect_left
+from fractions import Fraction
+from operator import mul
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from data_pipeline import DATA_FILES, load_compiled
+from data_store import JSONDataStore, SQLiteDataStore
+from search_index import ChampionSearchIndex
+
+
+# Weights for ban recommendations (tier, counter threat to our picks, flex value)
+BAN_WEIGHTS = {
+    "tier": 0.40,
+    "threat": 0.50,
+    "flex": 0.20
+}
+
+# Lanes in draft order used by the role assignment solver
+ROLES = ["top", "jungle", "mid", "adc", "support"]
+
+# Viability given to a champion's meta flex roles that are missing from its role list
+FLEX_ROLE_VIABILITY = 0.5
+
+# Tokens of tag query expressions: parentheses, operators and tag names
+TAG_QUERY_TOKEN = re.compile(r"\(|\)|&&?|\|\|?|!|[^\s()&|!]+")
+
+# Lane-aware matchups: weight of an enemy in a given role when recommending
+# for our role. Direct lane opponents count fully, the bot lane 2v2 nearly so.
+LANE_WEIGHTS = {
+    "top": {"top": 1.0, "jungle": 0.6, "mid": 0.4, "adc": 0.3, "support": 0.3},
+    "jungle": {"top": 0.5, "jungle": 1.0, "mid": 0.5, "adc": 0.4, "support": 0.5},
+    "mid": {"top": 0.4, "jungle": 0.6, "mid": 1.0, "adc": 0.4, "support": 0.5},
+    "adc": {"top": 0.3, "jungle": 0.5, "mid": 0.4, "adc": 1.0, "support": 0.9},
+    "support": {"top": 0.3, "jungle": 0.5, "mid": 0.5, "adc": 0.9, "support": 1.0}
+}
+
+# Weight of enemies whose role is unknown (or when recommending for an unknown role)
+DEFAULT_LANE_WEIGHT = 0.5
+
+# Kit tag groups tracked in composition profiles (a champion covers a group
+# when it has any of the group's tags)
+COMPOSITION_TAGS = {
+    "engage": ["engage", "hook", "knockup", "dive", "charm"],
+    "peel": ["peel", "protect", "shield", "disengage", "heal"],
+    "poke": ["poke"],
+    "cc": ["cc", "hook", "knockup", "charm", "displacement", "polymorph"],
+    "frontline": ["tank", "bruiser"],
+    "waveclear": ["AoE", "mage"],
+    "burst": ["burst", "assassin", "execute"],
+    "sustain": ["sustain", "heal"],
+    "mobility": ["mobility"],
+    "dps": ["dps", "carry", "hypercarry"]
+}
+
+# Target tag coverage of a full team per archetype: how many champions should
+# cover each COMPOSITION_TAGS group. Picks are rewarded for filling the groups
+# the team is still below target on (see composition_gap_scores)
+COMPOSITION_PROFILES = {
+    "standard": {"engage": 1, "peel": 1, "cc": 2, "frontline": 1, "waveclear": 1, "burst": 1, "dps": 1},
+    "engage": {"engage": 2, "cc": 2, "frontline": 2, "burst": 1, "dps": 1},
+    "poke": {"poke": 2, "waveclear": 2, "peel": 1, "cc": 1, "dps": 1},
+    "protect": {"peel": 2, "sustain": 1, "frontline": 1, "cc": 1, "dps": 2},
+    "pick": {"cc": 2, "burst": 2, "mobility": 2, "engage": 1}
+}
+
+DEFAULT_COMPOSITION_PROFILE = "standard"
+
+# Data files whose per-request lookups an indexed store can answer (see
+# DraftEngine.indexed_store)
+INDEXED_FILES = {"champion_counters.json", "counters.json", "synergies.json"}
+
+# Maximum number of memoized team compositions
+ANALYSIS_CACHE_SIZE = 4096
+
+# Lookahead: how many candidates (relative to top_n) get an enemy counter-response check
+LOOKAHEAD_POOL_FACTOR = 3
+
+# Maximum number of memoized enemy best responses kept between requests
+RESPONSE_CACHE_SIZE = 4096
+
+# Slack added to matchup bounds: they come from the precomputed tables, which
+# can differ from the rule scans by floating point rounding
+PRUNING_EPSILON = 1e-6
+
+# Weight of the damage split in complete-draft scores (the largest damage
+# balance bonus a single pick can get)
+DAMAGE_SPLIT_WEIGHT = 0.20
+
+# Weight of each feature group in the kit vectors used for substitute search
+SIMILARITY_WEIGHTS = {
+    "tags": 1.0,
+    "damage_type": 0.4,
+    "scaling": 0.4,
+    "roles": 0.6,
+    "meta": 0.4
+}
+
+# Scaling and power spike levels (one-hot encoded in kit vectors)
+POWER_LEVELS = ["early", "mid", "late"]
+
+
+def solve_assignment(cost: List[List[float]]) -> List[int]:
+    """
+    Solve a rectangular assignment problem with the Hungarian algorithm.
+    
+    Args:
+        cost: n x m cost matrix with n <= m
+        
+    Returns:
+        For each row, the index of the column it is assigned to (minimum total cost)
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    inf = float("inf")
+    
+    # Potentials and matching are 1-indexed; column 0 is a virtual start column
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)
+    way = [0] * (m + 1)
+    
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        min_reduced = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    reduced = cost[i0 - 1][j - 1] - u[i0] - v[j]
+                    if reduced < min_reduced[j]:
+                        min_reduced[j] = reduced
+                        way[j] = j0
+                    if min_reduced[j] < delta:
+                        delta = min_reduced[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_reduced[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        
+        # Augment along the alternating path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            assignment[match[j] - 1] = j - 1
+    return assignment
+
+
+def sum_bitsets(bitsets: Dict[str, int], keys: List[str]) -> int:
+    """Union of the bitsets for a list of (case-insensitive) keys."""
+    bits = 0
+    for key in keys:
+        bits |= bitsets.get(key.lower(), 0)
+    return bits
+
+
+def copy_analysis(analysis: Dict) -> Dict:
+    """A composition analysis the caller can modify without touching the memo."""
+    return {
+        **analysis,
+        "tag_coverage": dict(analysis["tag_coverage"]),
+        "role_assignments": dict(analysis["role_assignments"]),
+        "open_roles": list(analysis["open_roles"])
+    }
+
+
+def rule_tags(synergy: Dict) -> List[str]:
+    """
+    A synergy rule's distinct tags, in authored order (not set order, which
+    depends on the hash seed and would reorder explanations between processes).
+    """
+    return list(dict.fromkeys(synergy["tags"]))
+
 
 class DraftEngine:
     """
@@ -14,15 +205,39 @@ class DraftEngine:
     Uses kit-based analysis instead of meta/winrate data.
     """
     
-    def __init__(self, data_dir: str = "data"):
-        """Initialize the draft engine by loading all data files."""
+    def __init__(self, data_dir: str = "data", use_compiled: bool = True, store=None):
+        """
+        Initialize the draft engine by loading all data files.
+        
+        Args:
+            data_dir: Directory holding the data JSON files
+            use_compiled: Load precomputed artifacts from data/build when they
+                match the current data version (see data_pipeline.py)
+            store: Data store to load tables from (see data_store.py),
+                defaults to the JSON files in data_dir
+        """
+        start = time.perf_counter()
         self.data_dir = Path(data_dir)
+        self.store = store or JSONDataStore(data_dir)
+        self.data_version = self.store.data_version()
+        
+        # Per-request lookups (viable champions, pairwise matchups, rules a
+        # candidate touches) go through the store's indexes when it has them
+        self.indexed_store = self.store if isinstance(self.store, SQLiteDataStore) else None
+        self._touched_synergies_cache = {}
+        
+        # Compiled artifacts live next to the JSON files
+        compiled = None
+        if use_compiled and isinstance(self.store, JSONDataStore):
+            compiled = load_compiled(self.data_dir)
+        
         self.champions = self._load_json("champions.json")["champions"]
         self.synergies = self._load_json("synergies.json")["synergies"]
         self.counters = self._load_json("counters.json")["counters"]
         self.champion_counters = self._load_json("champion_counters.json")  # Specific champion matchups
         self.tier_list = self._load_json("tier_list.json")  # Meta tier ratings
         self.champion_meta = self._load_json("champion_meta.json").get("champion_meta", {})  # Early/late, flex roles
+        loaded = time.perf_counter()
         
         # Create lookup dictionaries for faster access
         self.champion_map = {c["id"]: c for c in self.champions}
@@ -40,11 +255,635 @@ class DraftEngine:
             tier_info = self.champion_tiers.get(champ_id, {})
             champ["tier"] = tier_info.get("tier", "B")
         
+        # Role viability per champion in ROLES order (flex roles fill the gaps)
+        self.role_viability_table = {
+            c["id"]: [self.get_role_viability(c["id"], role) for role in ROLES]
+            for c in self.champions
+        }
+        
+        # Tag indexes for pairwise and n-ary synergy rules
+        self._build_synergy_index()
+        
+        # Candidates seen, pruned per stage and fully scored by recommend_champions
+        self.pruning_stats = {
+            "candidates": 0,
+            "pruned_before_synergy": 0,
+            "pruned_before_matchups": 0,
+            "fully_scored": 0
+        }
+        
+        # Memoized composition totals, analyses and team synergy, keyed by team set
+        self._composition_cache = {}
+        self._analysis_cache = {}
+        self._team_synergy_cache = {}
+        
+        # Pairwise matchup facts, filled on first use (see _matchup_facts)
+        self._matchup_facts_cache = {}
+        
+        # Bitset inverted indexes for tag queries
+        self._build_tag_index()
+        
+        # Kit vectors for "play something similar" substitute search
+        self._build_similarity_index()
+        
+        # Prefix/fuzzy name search for the champion picker
+        self.search_index = ChampionSearchIndex(self.champions)
+        
+        # Precompute per-champion matchup vectors (bans, lookahead, lane-aware scoring)
+        self._build_threat_vectors(compiled)
+        
+        # Phase timings (ms) for the API startup report
+        self.startup_timings = {
+            "load": (loaded - start) * 1000,
+            "index": (time.perf_counter() - loaded) * 1000
+        }
+        
+    def cache_entries(self) -> int:
+        """Number of entries held by the engine's memo caches."""
+        caches = (
+            self._composition_cache, self._analysis_cache, self._team_synergy_cache,
+            self._matchup_facts_cache, self._response_cache, self._touched_synergies_cache,
+            self._similarity_rows, self.search_index._cache
+        )
+        return sum(len(cache) for cache in caches)
+    
+    def warm_up(self) -> int:
+        """
+        Prime the engine's caches with the most common draft states: the
+        empty draft and every first pick's composition analysis, the enemy
+        best responses looked up by opening recommendations with lookahead,
+        one-letter champion searches and substitute rows.
+        
+        Returns:
+            Number of cache entries added
+        """
+        before = self.cache_entries()
+        
+        self.analyze_draft(team=[], enemy_team=[])
+        for champ in self.champions:
+            self.analyze_team_composition([champ["id"]])
+        
+        for role in ROLES:
+            self.recommend_champions(role=role, team=[], enemy_team=[], banned_champions=[], lookahead=True)
+        
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            self.search_champions(letter)
+        
+        for champ_id in self.kit_vectors:
+            self._similarity_row(champ_id)
+        
+        return self.cache_entries() - before
+    
+    def derive(self, changes: Dict[str, dict], data_version: str) -> "DraftEngine":
+        """
+        Build an engine for a patched dataset that shares everything unchanged
+        with this one.
+        
+        Tables and indexes are never modified once built, so the derived engine
+        starts as a shallow copy and only the changed tables and the indexes
+        built from them are replaced. Matchup vectors are rebuilt per attacker:
+        a champion_counters.json patch only recomputes the rows of champions
+        whose entries changed. Caches are per engine.
+        
+        Args:
+            changes: Data file name -> new content, for the files that differ
+            data_version: Version id of the patched dataset
+        
+        Returns:
+            The derived engine; its rebuilt_indexes lists what was rebuilt
+        """
+        unknown = set(changes) - set(DATA_FILES)
+        if unknown:
+            raise ValueError(f"Unknown data files: {', '.join(sorted(unknown))}")
+        if "champions.json" in changes:
+            raise ValueError("champions.json cannot be patched, load a full dataset instead")
+        
+        start = time.perf_counter()
+        engine = copy.copy(self)
+        engine.data_version = data_version
+        engine.rebuilt_indexes = []
+        matchup_tables = False
+        
+        # The indexed store holds the base tables: patched ones are read in memory
+        if INDEXED_FILES.intersection(changes):
+            engine.indexed_store = None
+        
+        if "synergies.json" in changes:
+            engine.synergies = changes["synergies.json"]["synergies"]
+            engine._build_synergy_index()
+            engine.rebuilt_indexes.append("synergy")
+        
+        if "tier_list.json" in changes:
+            engine.tier_list = changes["tier_list.json"]
+            engine.tier_scoring = engine.tier_list.get("tier_scoring", {})
+            engine.champion_tiers = engine.tier_list.get("champion_tiers", {})
+            # Champions carry their tier for the frontend: copy only those that moved
+            champions = []
+            for champ in self.champions:
+                tier = engine.champion_tiers.get(champ["id"], {}).get("tier", "B")
+                champions.append(champ if champ["tier"] == tier else {**champ, "tier": tier})
+            if any(new is not old for new, old in zip(champions, self.champions)):
+                engine.champions = champions
+                engine.champion_map = {c["id"]: c for c in champions}
+                engine.search_index = ChampionSearchIndex(champions)
+                engine.rebuilt_indexes.append("search")
+            matchup_tables = True
+        
+        if "champion_meta.json" in changes:
+            engine.champion_meta = changes["champion_meta.json"].get("champion_meta", {})
+            engine.role_viability_table = {
+                c["id"]: [engine.get_role_viability(c["id"], role) for role in ROLES]
+                for c in engine.champions
+            }
+            engine._build_role_index()
+            engine._build_similarity_index()
+            engine.rebuilt_indexes += ["roles", "similarity"]
+            matchup_tables = True
+        
+        if "counters.json" in changes or "champion_counters.json" in changes:
+            if "counters.json" in changes:
+                engine.counters = changes["counters.json"]["counters"]
+            if "champion_counters.json" in changes:
+                engine.champion_counters = changes["champion_counters.json"]
+                engine.champion_counter_map = {cc["champion"]: cc for cc in engine.champion_counters}
+        
+            # Archetype rules can touch any pair; specific matchups only their attacker's row
+            if "counters.json" in changes:
+                attackers = list(engine.champion_index)
+            else:
+                attackers = [
+                    champ_id for champ_id in engine.champion_index
+                    if engine.champion_counter_map.get(champ_id) != self.champion_counter_map.get(champ_id)
+                ]
+            engine._rebuild_threat_rows(attackers)
+            engine._matchup_facts_cache = {}
+            engine.rebuilt_indexes.append(f"matchup_rows:{len(attackers)}")
+            matchup_tables = True
+        
+        if matchup_tables:
+            engine._build_matchup_tables()
+            engine.rebuilt_indexes.append("matchup_tables")
+        
+        engine.pruning_stats = dict.fromkeys(self.pruning_stats, 0)
+        engine._composition_cache = {}
+        engine._analysis_cache = {}
+        engine._team_synergy_cache = {}
+        engine.startup_timings = {"derive": (time.perf_counter() - start) * 1000}
+        return engine
+    
     def _load_json(self, filename: str) -> dict:
-        """Load a JSON file from the data directory."""
-        filepath = self.data_dir / filename
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load a data file's content from the data store."""
+        return self.store.load(filename)
+    
+    def _pair_matchup(self, attacker: Dict, defender: Dict) -> Tuple[float, float]:
+        """
+        Matchup scores of an attacker against a single defender.
+        
+        Returns:
+            Tuple of (threat, counter): threat mirrors calculate_being_countered_score
+            (absolute matchup strengths), counter mirrors calculate_counter_score
+            (signed strengths), both for a one-champion enemy team
+        """
+        threat = 0.0
+        counter_score = 0.0
+        defender_id = defender["id"]
+        defender_tags = set(defender.get("kit_tags", []))
+        
+        # Specific champion matchups
+        matchups = self.champion_counter_map.get(attacker["id"], {})
+        for counter in matchups.get("counters", []) + matchups.get("strong_against", []):
+            if counter["target"] == defender_id:
+                threat += abs(counter["strength"])
+                counter_score += counter["strength"]
+        
+        # Archetype-based counter rules
+        attacker_tags = set(attacker.get("kit_tags", []))
+        attacker_tags.add(attacker["id"])
+        for counter in self.counters:
+            if set(counter["attacker_tags"]).issubset(attacker_tags) and \
+               set(counter["defender_tags"]).intersection(defender_tags):
+                threat += counter["score"]
+                counter_score += counter["score"]
+        
+        return threat, counter_score
+    
+    def _build_threat_vectors(self, compiled: Dict = None):
+        """
+        Precompute, for every champion, its matchup against every other champion.
+        
+        threat_vectors[attacker_id][i] is the threat against the champion at
+        champion_index i (used for bans, lookahead and vulnerability), and
+        counter_vectors[attacker_id][i] the counter score against it, so
+        per-request scoring only needs list lookups. Compiled vectors are
+        reused when they were built for the same roster.
+        """
+        if compiled and compiled.get("champions") == [c["id"] for c in self.champions] \
+                and "counter_vectors" in compiled:
+            self.threat_vectors = compiled["threat_vectors"]
+            self.counter_vectors = compiled["counter_vectors"]
+        else:
+            self.threat_vectors = {}
+            self.counter_vectors = {}
+            for attacker in self.champions:
+                pairs = [self._pair_matchup(attacker, defender) for defender in self.champions]
+                self.threat_vectors[attacker["id"]] = [threat for threat, _ in pairs]
+                self.counter_vectors[attacker["id"]] = [counter for _, counter in pairs]
+        
+        self._build_matchup_tables()
+    
+    def _rebuild_threat_rows(self, attacker_ids: Iterable[str]):
+        """
+        Recompute the matchup vectors of some attackers only.
+        
+        The vector dicts are copied (not the vectors), so an engine derived
+        from another keeps sharing every row that did not change.
+        """
+        self.threat_vectors = dict(self.threat_vectors)
+        self.counter_vectors = dict(self.counter_vectors)
+        for attacker_id in attacker_ids:
+            attacker = self.champion_map[attacker_id]
+            pairs = [self._pair_matchup(attacker, defender) for defender in self.champions]
+            self.threat_vectors[attacker_id] = [threat for threat, _ in pairs]
+            self.counter_vectors[attacker_id] = [counter for _, counter in pairs]
+    
+    def _build_matchup_tables(self):
+        """Tables derived from the matchup vectors, tiers and flex roles."""
+        self.average_threat = {
+            champ_id: sum(vector) / len(vector) if vector else 0.0
+            for champ_id, vector in self.threat_vectors.items()
+        }
+        
+        # Pruned enemy response lists: for each defender, only the attackers that
+        # actually threaten it, strongest first (tier breaks ties)
+        self.counter_responses = {}
+        for defender_id, i in self.champion_index.items():
+            responses = [
+                (vector[i], self.get_tier_score(attacker_id), attacker_id)
+                for attacker_id, vector in self.threat_vectors.items()
+                if vector[i] > 0 and attacker_id != defender_id
+            ]
+            responses.sort(reverse=True)
+            self.counter_responses[defender_id] = responses
+        self._response_cache = {}
+        
+        # Static part of the ban score (tier + flex), independent of the draft
+        self.ban_base_scores = {
+            c["id"]: (
+                self.get_tier_score(c["id"]) * BAN_WEIGHTS["tier"] +
+                self.calculate_flex_score(c["id"], "") * BAN_WEIGHTS["flex"]
+            )
+            for c in self.champions
+        }
+    
+    def _build_tag_index(self):
+        """
+        Build bitset inverted indexes over the roster.
+        
+        Bit i stands for the champion at champion_index i. Tags, damage types
+        and scalings map to the bitset of champions having them; roles map to
+        cumulative bitsets per viability level, so a viability threshold is a
+        bisect plus one lookup.
+        """
+        self.champion_index = {c["id"]: i for i, c in enumerate(self.champions)}
+        self.all_champions_bits = (1 << len(self.champions)) - 1
+        self.tag_bitsets = {}
+        self.damage_type_bitsets = {}
+        self.scaling_bitsets = {}
+        
+        for i, champ in enumerate(self.champions):
+            bit = 1 << i
+            for tag in set(champ.get("kit_tags", [])) | {champ["id"]}:
+                self.tag_bitsets[tag.lower()] = self.tag_bitsets.get(tag.lower(), 0) | bit
+            damage_type = champ.get("damage_type", "Adaptive").lower()
+            self.damage_type_bitsets[damage_type] = self.damage_type_bitsets.get(damage_type, 0) | bit
+            scaling = champ.get("scaling", "mid").lower()
+            self.scaling_bitsets[scaling] = self.scaling_bitsets.get(scaling, 0) | bit
+        
+        # COMPOSITION_TAGS group -> champions covering it
+        self.composition_bitsets = {
+            group: sum_bitsets(self.tag_bitsets, tags) for group, tags in COMPOSITION_TAGS.items()
+        }
+        
+        self._build_role_index()
+    
+    def _build_role_index(self):
+        """Cumulative role bitsets (see _build_tag_index) from role_viability_table."""
+        # role -> (ascending viability levels, bitset of champions at or above each level)
+        self.role_bitsets = {}
+        for j, role in enumerate(ROLES):
+            levels = sorted({row[j] for row in self.role_viability_table.values() if row[j] > 0})
+            cumulative = [
+                sum(1 << self.champion_index[champ_id]
+                    for champ_id, row in self.role_viability_table.items() if row[j] >= level)
+                for level in levels
+            ]
+            self.role_bitsets[role] = (levels, cumulative)
+    
+    def _role_bits(self, role: str, min_viability: float) -> int:
+        """Bitset of champions at least min_viability viable in a role."""
+        levels, cumulative = self.role_bitsets.get(role, ([], []))
+        i = bisect_left(levels, min_viability)
+        return cumulative[i] if i < len(levels) else 0
+    
+    def _parse_tag_expression(self, expression: str) -> int:
+        """
+        Evaluate a boolean tag expression to a champion bitset.
+        
+        Grammar (case-insensitive): tags combined with AND/&, OR/|, NOT/!
+        and parentheses, e.g. "engage AND aoe AND NOT melee".
+        
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        tokens = TAG_QUERY_TOKEN.findall(expression.lower())
+        pos = 0
+        
+        def peek():
+            return tokens[pos] if pos < len(tokens) else None
+        
+        def parse_or():
+            nonlocal pos
+            bits = parse_and()
+            while peek() in ("or", "|", "||"):
+                pos += 1
+                bits |= parse_and()
+            return bits
+        
+        def parse_and():
+            nonlocal pos
+            bits = parse_not()
+            while peek() in ("and", "&", "&&"):
+                pos += 1
+                bits &= parse_not()
+            return bits
+        
+        def parse_not():
+            nonlocal pos
+            token = peek()
+            if token is None:
+                raise ValueError("Unexpected end of tag expression")
+            pos += 1
+            if token in ("not", "!"):
+                return self.all_champions_bits & ~parse_not()
+            if token == "(":
+                bits = parse_or()
+                if peek() != ")":
+                    raise ValueError("Missing closing parenthesis in tag expression")
+                pos += 1
+                return bits
+            if token in (")", "and", "&", "&&", "or", "|", "||"):
+                raise ValueError(f"Unexpected '{token}' in tag expression")
+            return self.tag_bitsets.get(token, 0)
+        
+        bits = parse_or()
+        if pos != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[pos]}' in tag expression")
+        return bits
+    
+    def query_champions(
+        self,
+        expression: str = None,
+        role: str = None,
+        min_viability: float = 0.5,
+        damage_types: List[str] = None,
+        scalings: List[str] = None,
+        sort_by: str = "viability",
+        limit: int = None
+    ) -> List[Dict]:
+        """
+        Find champions matching a tag expression and filters.
+        
+        Args:
+            expression: Boolean tag expression, e.g. "engage AND aoe AND NOT melee"
+            role: Only champions viable in this role
+            min_viability: Minimum role viability when role is given
+            damage_types: Allowed damage types (e.g. ['AP', 'Mixed'])
+            scalings: Allowed scalings ('early', 'mid', 'late')
+            sort_by: 'viability' (needs role, falls back to tier) or 'tier'
+            limit: Maximum number of results
+            
+        Returns:
+            Matching champions with role_viability (if role given) and tier_score
+        """
+        bits = self.all_champions_bits
+        if expression and expression.strip():
+            bits &= self._parse_tag_expression(expression)
+        if role:
+            bits &= self._role_bits(role, min_viability)
+        if damage_types:
+            bits &= sum_bitsets(self.damage_type_bitsets, damage_types)
+        if scalings:
+            bits &= sum_bitsets(self.scaling_bitsets, scalings)
+        
+        role_column = ROLES.index(role) if role in ROLES else None
+        
+        results = []
+        while bits:
+            low = bits & -bits
+            champ = self.champions[low.bit_length() - 1]
+            bits ^= low
+            
+            result = {**champ, "tier_score": self.get_tier_score(champ["id"])}
+            if role_column is not None:
+                result["role_viability"] = self.role_viability_table[champ["id"]][role_column]
+            results.append(result)
+        
+        if sort_by == "viability" and role_column is not None:
+            results.sort(key=lambda c: (c["role_viability"], c["tier_score"]), reverse=True)
+        else:
+            results.sort(key=lambda c: c["tier_score"], reverse=True)
+        
+        return results[:limit] if limit else results
+    
+    def search_champions(
+        self,
+        query: str,
+        limit: int = 10,
+        team: List[str] = None,
+        enemy_team: List[str] = None,
+        banned_champions: List[str] = None
+    ) -> List[Dict]:
+        """
+        Search champions by name, ID or DDragon alias, tolerating typos.
+        
+        Args:
+            query: Search text (prefix of a name, word or alias)
+            limit: Maximum number of results
+            team, enemy_team, banned_champions: Optional draft state; champions
+                in it are left out so only available picks are returned
+            
+        Returns:
+            Matching champions, best match first
+        """
+        unavailable = set(team or []) | set(enemy_team or []) | set(banned_champions or [])
+        return self.search_index.search(query, limit=limit, exclude=unavailable)
+    
+    def _build_similarity_index(self):
+        """
+        Build a unit-length kit vector per champion for substitute search.
+        
+        Features are the kit tags shared by at least two champions (weighted
+        by rarity, so "hook" counts more than "melee"), damage type, scaling,
+        role viability and meta values (early impact, late scaling, power
+        spike). With unit vectors a dot product is the cosine similarity.
+        """
+        n = len(self.champions)
+        tag_counts = {}
+        for champ in self.champions:
+            for tag in set(champ.get("kit_tags", [])) - {champ["id"]}:
+                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        
+        self.similarity_tags = sorted(tag for tag, count in tag_counts.items() if count >= 2)
+        tag_weights = [SIMILARITY_WEIGHTS["tags"] * math.log(1 + n / tag_counts[tag])
+                       for tag in self.similarity_tags]
+        damage_types = sorted({c.get("damage_type", "Adaptive") for c in self.champions})
+        
+        self.kit_vectors = {}
+        for champ in self.champions:
+            tags = set(champ.get("kit_tags", []))
+            meta = self.champion_meta.get(champ["id"], {})
+            vector = [weight if tag in tags else 0.0 for tag, weight in zip(self.similarity_tags, tag_weights)]
+            vector += [SIMILARITY_WEIGHTS["damage_type"] * (champ.get("damage_type", "Adaptive") == d)
+                       for d in damage_types]
+            vector += [SIMILARITY_WEIGHTS["scaling"] * (champ.get("scaling", "mid") == level)
+                       for level in POWER_LEVELS]
+            vector += [SIMILARITY_WEIGHTS["roles"] * v for v in self.role_viability_table[champ["id"]]]
+            vector += [SIMILARITY_WEIGHTS["meta"] * meta.get("early_impact", 0.5),
+                       SIMILARITY_WEIGHTS["meta"] * meta.get("late_scaling", 0.5)]
+            vector += [SIMILARITY_WEIGHTS["meta"] * (meta.get("power_spike", "mid") == level)
+                       for level in POWER_LEVELS]
+            
+            norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+            self.kit_vectors[champ["id"]] = [x / norm for x in vector]
+        
+        # Memoized neighbour lists, filled on first use (or by warm_up)
+        self._similarity_rows = {}
+    
+    def _similarity_row(self, champion_id: str) -> List[Tuple[float, str]]:
+        """Every other champion as (similarity, id), most similar first."""
+        row = self._similarity_rows.get(champion_id)
+        if row is None:
+            vector = self.kit_vectors[champion_id]
+            row = [
+                (sum(map(mul, vector, other)), other_id)
+                for other_id, other in self.kit_vectors.items()
+                if other_id != champion_id
+            ]
+            row.sort(key=lambda entry: (-entry[0], entry[1]))
+            self._similarity_rows[champion_id] = row
+        return row
+    
+    def find_similar_champions(
+        self,
+        champion_id: str,
+        role: str = None,
+        k: int = 5,
+        team: List[str] = None,
+        enemy_team: List[str] = None,
+        banned_champions: List[str] = None,
+        min_viability: float = 0.5
+    ) -> List[Dict]:
+        """
+        Find the k available champions whose kit is closest to a champion's,
+        e.g. a substitute when it is banned or taken.
+        
+        Args:
+            champion_id: Champion to find substitutes for
+            role: Only return champions viable in this role (optional)
+            k: Number of substitutes
+            team, enemy_team, banned_champions: Draft state; these are unavailable
+            min_viability: Minimum role viability when a role is given
+            
+        Returns:
+            Substitutes with their similarity (0-1), shared kit tags and explanations
+        """
+        if champion_id not in self.kit_vectors:
+            return []
+        
+        unavailable = set(team or []) | set(enemy_team or []) | set(banned_champions or [])
+        role_column = ROLES.index(role) if role in ROLES else None
+        source = self.champion_map[champion_id]
+        source_tags = set(source.get("kit_tags", [])) - {champion_id}
+        
+        results = []
+        for similarity, other_id in self._similarity_row(champion_id):
+            if other_id in unavailable:
+                continue
+            viability = None
+            if role_column is not None:
+                viability = self.role_viability_table[other_id][role_column]
+                if viability < min_viability:
+                    continue
+            
+            other = self.champion_map[other_id]
+            shared = sorted(source_tags & set(other.get("kit_tags", [])))
+            explanations = []
+            if shared:
+                explanations.append(f"≈ Shares {', '.join(shared)} with {source['name']}")
+            if other.get("damage_type") == source.get("damage_type"):
+                explanations.append(f"≈ Same damage type ({source.get('damage_type')})")
+            if other.get("scaling") == source.get("scaling"):
+                explanations.append(f"≈ Same power curve ({source.get('scaling')} game)")
+            
+            results.append({
+                "champion": other,
+                "similarity": similarity,
+                "role_viability": viability,
+                "shared_tags": shared,
+                "explanations": explanations
+            })
+            if len(results) == k:
+                break
+        
+        return results
+    
+    def get_role_viability(self, champion_id: str, role: str) -> float:
+        """
+        Get how viable a champion is in a role.
+        
+        Uses the champion's role list, falling back to its meta flex roles.
+        
+        Returns:
+            Viability (0.0 to 1.0), 0.0 if the champion cannot play the role
+        """
+        champ = self.champion_map.get(champion_id)
+        if not champ:
+            return 0.0
+        if role in champ.get("roles", {}):
+            return champ["roles"][role]
+        if role in self.champion_meta.get(champion_id, {}).get("flex_roles", []):
+            return FLEX_ROLE_VIABILITY
+        return 0.0
+    
+    def assign_roles(self, team: List[str]) -> Dict:
+        """
+        Assign picked champions to roles, maximizing total role viability.
+        
+        Args:
+            team: List of champion IDs already picked (at most one per role)
+            
+        Returns:
+            Dict with:
+            - assignments: champion ID -> role
+            - open_roles: roles not yet filled, in draft order
+            - total_viability: sum of viability over the assignment
+        """
+        team = list(dict.fromkeys(team))[:len(ROLES)]
+        if not team:
+            return {"assignments": {}, "open_roles": list(ROLES), "total_viability": 0.0}
+        
+        zero_row = [0.0] * len(ROLES)
+        rows = [self.role_viability_table.get(champ_id, zero_row) for champ_id in team]
+        columns = solve_assignment([[-viability for viability in row] for row in rows])
+        
+        assignments = {champ_id: ROLES[col] for champ_id, col in zip(team, columns)}
+        filled = set(columns)
+        
+        return {
+            "assignments": assignments,
+            "open_roles": [role for i, role in enumerate(ROLES) if i not in filled],
+            "total_viability": sum(row[col] for row, col in zip(rows, columns))
+        }
     
     def get_viable_champions(self, role: str) -> List[Dict]:
         """
@@ -56,6 +895,12 @@ class DraftEngine:
         Returns:
             List of champions with their viability score for the role
         """
+        if self.indexed_store:
+            return [
+                {**self.champion_map[champ["id"]], "role_viability": champ["role_viability"]}
+                for champ in self.indexed_store.viable_champions(role)
+            ]
+        
         viable = []
         for champ in self.champions:
             if role in champ.get("roles", {}):
@@ -85,69 +930,206 @@ class DraftEngine:
             return self.tier_scoring.get(tier, 0.5)
         return 0.5  # Default to middle tier if not found
     
+    def _composition_totals(self, team: List[str]) -> Dict:
+        """
+        Additive composition totals for a team, memoized per set of champions.
+        
+        A team's totals are those of the previous draft state (the team
+        without its last pick, usually memoized already) plus the last pick's
+        contribution, so adding a pick to an analyzed team costs one
+        champion's worth of work. Power sums are exact fractions, so a set
+        gets the same totals whatever order it was built in.
+        """
+        picks = list(dict.fromkeys(team))
+        team_key = frozenset(picks)
+        cached = self._composition_cache.get(team_key)
+        if cached is not None:
+            return cached
+        
+        if not picks:
+            totals = {
+                "size": 0,
+                "early_sum": Fraction(0),
+                "late_sum": Fraction(0),
+                "ad_count": 0,
+                "ap_count": 0,
+                "coverage": {group: 0 for group in COMPOSITION_TAGS}
+            }
+        else:
+            champ_id = picks[-1]
+            base = self._composition_totals(picks[:-1])
+            meta = self.champion_meta.get(champ_id, {})
+            totals = {
+                "size": base["size"] + 1,
+                "early_sum": base["early_sum"] + Fraction(meta.get("early_impact", 0.5)),
+                "late_sum": base["late_sum"] + Fraction(meta.get("late_scaling", 0.5)),
+                "ad_count": base["ad_count"],
+                "ap_count": base["ap_count"],
+                "coverage": dict(base["coverage"])
+            }
+            
+            if champ_id in self.champion_map:
+                champ = self.champion_map[champ_id]
+                dmg_type = champ.get("damage_type", "Adaptive")
+                if dmg_type == "AD":
+                    totals["ad_count"] += 1
+                elif dmg_type == "AP":
+                    totals["ap_count"] += 1
+                elif dmg_type in ["Mixed", "Adaptive"]:
+                    totals["ad_count"] += 0.5
+                    totals["ap_count"] += 0.5
+                
+                champ_tags = set(champ.get("kit_tags", []))
+                for group, group_tags in COMPOSITION_TAGS.items():
+                    if champ_tags.intersection(group_tags):
+                        totals["coverage"][group] += 1
+        
+        if len(self._composition_cache) >= ANALYSIS_CACHE_SIZE:
+            self._composition_cache.clear()
+            self._analysis_cache.clear()
+        self._composition_cache[team_key] = totals
+        return totals
+    
+    def composition_gaps(self, team: List[str], profile: str = None) -> Dict[str, int]:
+        """
+        Tag coverage a team is still missing for a target profile.
+        
+        Args:
+            team: List of champion IDs picked by the team
+            profile: COMPOSITION_PROFILES archetype (defaults to DEFAULT_COMPOSITION_PROFILE)
+            
+        Returns:
+            COMPOSITION_TAGS group -> champions still needed, for the groups below target
+        """
+        profile = profile or DEFAULT_COMPOSITION_PROFILE
+        if profile not in COMPOSITION_PROFILES:
+            raise ValueError(f"Unknown composition profile: {profile}")
+        coverage = self._composition_totals(team)["coverage"]
+        return {
+            group: target - coverage[group]
+            for group, target in COMPOSITION_PROFILES[profile].items()
+            if coverage[group] < target
+        }
+    
+    def composition_gap_scores(self, team: List[str], profile: str = None) -> Dict[str, Tuple[float, List[str]]]:
+        """
+        Score every champion by the composition gaps it would fill.
+        
+        The team's deficit vector (composition_gaps) is applied to the group
+        bitsets, one pass per missing group over all champions at once: each
+        group below target adds 1 / target, over the number of groups in the
+        profile, to every champion covering it. A score is thus the share of
+        the target profile a pick fills.
+        
+        Returns:
+            Champion ID -> (score, groups filled), for champions filling a gap
+        """
+        profile = profile or DEFAULT_COMPOSITION_PROFILE
+        gaps = self.composition_gaps(team, profile)
+        targets = COMPOSITION_PROFILES[profile]
+        
+        scores = {}
+        for group in COMPOSITION_TAGS:
+            if group not in gaps:
+                continue
+            share = 1.0 / (targets[group] * len(targets))
+            bits = self.composition_bitsets[group]
+            while bits:
+                low = bits & -bits
+                champ_id = self.champions[low.bit_length() - 1]["id"]
+                bits ^= low
+                score, groups = scores.get(champ_id, (0.0, []))
+                scores[champ_id] = (score + share, groups + [group])
+        return scores
+    
     def analyze_team_composition(self, team: List[str]) -> Dict:
         """
         Analyze team composition for balance metrics.
+        Results are memoized on the set of champions.
         
         Returns dict with:
         - early_power: Average early game strength
         - late_power: Average late game strength
         - balance_score: How balanced the comp is
         - power_curve: 'early', 'mid', or 'late' focused
+        - ad_count / ap_count: Damage type distribution (Mixed/Adaptive count half)
+        - tag_coverage: Number of champions covering each COMPOSITION_TAGS group
+        - role_assignments: champion ID -> most likely role
+        - open_roles: roles not yet filled
         """
-        if not team:
-            return {
+        team_key = frozenset(team)
+        cached = self._analysis_cache.get(team_key)
+        if cached is not None:
+            return copy_analysis(cached)
+        
+        totals = self._composition_totals(team)
+        roles = self.assign_roles(sorted(team_key))
+        
+        if not team_key:
+            analysis = {
                 "early_power": 0.5,
                 "late_power": 0.5,
                 "balance_score": 1.0,
-                "power_curve": "mid"
+                "power_curve": "mid",
+                "ad_count": 0,
+                "ap_count": 0,
+                "tag_coverage": totals["coverage"],
+                "role_assignments": roles["assignments"],
+                "open_roles": roles["open_roles"]
             }
-        
-        early_scores = []
-        late_scores = []
-        
-        for champ_id in team:
-            meta = self.champion_meta.get(champ_id, {})
-            early_scores.append(meta.get("early_impact", 0.5))
-            late_scores.append(meta.get("late_scaling", 0.5))
-        
-        avg_early = sum(early_scores) / len(early_scores)
-        avg_late = sum(late_scores) / len(late_scores)
-        
-        # Balance score: penalize extreme one-sidedness
-        balance = 1.0 - abs(avg_early - avg_late)
-        
-        # Determine power curve
-        if avg_early > avg_late + 0.2:
-            curve = "early"
-        elif avg_late > avg_early + 0.2:
-            curve = "late"
         else:
-            curve = "mid"
-        
-        # Calculate damage type distribution
-        ad_count = 0
-        ap_count = 0
+            avg_early = float(totals["early_sum"] / totals["size"])
+            avg_late = float(totals["late_sum"] / totals["size"])
+            
+            # Balance score: penalize extreme one-sidedness
+            balance = 1.0 - abs(avg_early - avg_late)
+            
+            # Determine power curve
+            if avg_early > avg_late + 0.2:
+                curve = "early"
+            elif avg_late > avg_early + 0.2:
+                curve = "late"
+            else:
+                curve = "mid"
+            
+            analysis = {
+                "early_power": avg_early,
+                "late_power": avg_late,
+                "balance_score": balance,
+                "power_curve": curve,
+                "ad_count": totals["ad_count"],
+                "ap_count": totals["ap_count"],
+                "tag_coverage": totals["coverage"],
+                "role_assignments": roles["assignments"],
+                "open_roles": roles["open_roles"]
+            }
         
-        for champ_id in team:
-            if champ_id in self.champion_map:
-                dmg_type = self.champion_map[champ_id].get("damage_type", "Adaptive")
-                if dmg_type == "AD":
-                    ad_count += 1
-                elif dmg_type == "AP":
-                    ap_count += 1
-                elif dmg_type in ["Mixed", "Adaptive"]:
-                    ad_count += 0.5
-                    ap_count += 0.5
+        self._analysis_cache[team_key] = analysis
+        return copy_analysis(analysis)
+    
+    def analyze_draft(self, team: List[str] = None, enemy_team: List[str] = None) -> Dict:
+        """
+        Analyze both teams' compositions in one call.
         
-        return {
-            "early_power": avg_early,
-            "late_power": avg_late,
-            "balance_score": balance,
-            "power_curve": curve,
-            "ad_count": ad_count,
-            "ap_count": ap_count
-        }
+        Args:
+            team: List of champion IDs picked by your team
+            enemy_team: List of champion IDs picked by enemy
+            
+        Returns:
+            Dict with the composition profile of each side, plus each side's
+            damage split as AD/AP shares and uncovered COMPOSITION_TAGS groups
+        """
+        profiles = {}
+        for side, picks in (("team", team or []), ("enemy_team", enemy_team or [])):
+            profile = self.analyze_team_composition(picks)
+            damage_total = profile["ad_count"] + profile["ap_count"]
+            profile["ad_share"] = profile["ad_count"] / damage_total if damage_total else 0.5
+            profile["ap_share"] = profile["ap_count"] / damage_total if damage_total else 0.5
+            profile["missing_tags"] = [
+                group for group, count in profile["tag_coverage"].items() if count == 0
+            ]
+            profiles[side] = profile
+        return profiles
     
     def calculate_flex_score(self, champion_id: str, role: str) -> float:
         """Calculate flexibility bonus for champions that can fill multiple roles."""
@@ -166,10 +1148,80 @@ class DraftEngine:
         else:
             return 0.0  # No flex
     
+    def _build_synergy_index(self):
+        """
+        Index synergy rules by tag.
+        
+        Rules over two distinct tags are pairwise (candidate + one teammate);
+        rules over three or more are n-ary combos spread across the candidate
+        and any teammates. Each index maps a tag to the positions of the rules
+        using it, so scoring only visits rules the candidate can take part in.
+        """
+        self.pair_synergies = []
+        self.pair_synergy_index = {}
+        self.nary_synergies = []
+        self.nary_synergy_index = {}
+        
+        for synergy in self.synergies:
+            syn_tags = set(synergy["tags"])
+            if len(syn_tags) == 2:
+                rules, index = self.pair_synergies, self.pair_synergy_index
+            elif len(syn_tags) >= 3:
+                rules, index = self.nary_synergies, self.nary_synergy_index
+            else:
+                continue
+            
+            for tag in syn_tags:
+                index.setdefault(tag, []).append(len(rules))
+            rules.append((rule_tags(synergy), synergy))
+        
+        # Upper bound of each champion's synergy score with any team: every
+        # rule it takes part in firing at full strength (pairwise scores are
+        # normalized by team size, so one full hit per teammate at most)
+        self.synergy_bounds = {}
+        for champ in self.champions:
+            champ_tags = set(champ.get("kit_tags", [])) | {champ["id"]}
+            bound = 0.0
+            for rules, index in ((self.pair_synergies, self.pair_synergy_index),
+                                 (self.nary_synergies, self.nary_synergy_index)):
+                touched = {position for tag in champ_tags for position in index.get(tag, [])}
+                bound += sum(max(rules[position][1]["score"], 0.0) for position in touched)
+            self.synergy_bounds[champ["id"]] = bound
+    
+    def _touched_synergies(self, champ_tags: set) -> Tuple[List[Tuple], List[Tuple]]:
+        """
+        The pairwise and n-ary synergy rules involving any of a candidate's
+        tags, as (tags, rule) in rule order: from the tag indexes, or from the
+        indexed store (memoized per tag set).
+        """
+        if not self.indexed_store:
+            pairs = sorted({position for tag in champ_tags for position in self.pair_synergy_index.get(tag, [])})
+            combos = sorted({position for tag in champ_tags for position in self.nary_synergy_index.get(tag, [])})
+            return [self.pair_synergies[p] for p in pairs], [self.nary_synergies[p] for p in combos]
+        
+        key = frozenset(champ_tags)
+        touched = self._touched_synergies_cache.get(key)
+        if touched is None:
+            pairs, combos = [], []
+            for synergy in self.indexed_store.synergies_touching(sorted(champ_tags)):
+                tags = rule_tags(synergy)
+                if len(tags) == 2:
+                    pairs.append((tags, synergy))
+                elif len(tags) >= 3:
+                    combos.append((tags, synergy))
+            touched = (pairs, combos)
+            self._touched_synergies_cache[key] = touched
+        return touched
+    
     def calculate_synergy_score(self, champion: Dict, team: List[str]) -> Tuple[float, List[str]]:
         """
         Calculate synergy score between a champion and existing team.
         
+        Pairwise rules are counted per teammate with diminishing returns and
+        normalized by team size. An n-ary rule (3+ tags) counts once when the
+        candidate provides at least one of its tags and teammates provide all
+        the others.
+        
         Args:
             champion: Champion data dictionary
             team: List of champion IDs already on the team
@@ -186,6 +1238,10 @@ class DraftEngine:
         # Add champion ID to tags for special synergies (e.g., Yasuo)
         champ_tags.add(champion["id"])
         
+        # Only rules with one of the candidate's tags can ever match
+        touched_pairs, touched_combos = self._touched_synergies(champ_tags)
+        
+        teammates = []
         for teammate_id in team:
             if teammate_id not in self.champion_map:
                 continue
@@ -193,47 +1249,112 @@ class DraftEngine:
             teammate = self.champion_map[teammate_id]
             teammate_tags = set(teammate.get("kit_tags", []))
             teammate_tags.add(teammate["id"])
+            teammates.append((teammate, teammate_tags))
             
-            # Check all synergy rules
-            for synergy in self.synergies:
-                syn_tags = set(synergy["tags"])
+            # Check the pairwise synergy rules the candidate is part of
+            for tags_list, synergy in touched_pairs:
                 synergy_name = synergy["name"]
                 
-                # Check if tags match between champion and teammate
-                if len(syn_tags) == 2:
-                    tags_list = list(syn_tags)
-                    # Check both directions of synergy
-                    if (tags_list[0] in champ_tags and tags_list[1] in teammate_tags) or \
-                       (tags_list[1] in champ_tags and tags_list[0] in teammate_tags):
-                        
-                        # Apply diminishing returns for repeated synergies
-                        synergy_counts[synergy_name] = synergy_counts.get(synergy_name, 0) + 1
-                        count = synergy_counts[synergy_name]
-                        
-                        # Diminishing returns: 100%, 75%, 50%, 33% for 1st, 2nd, 3rd, 4th+ occurrences
-                        if count == 1:
-                            multiplier = 1.0
-                        elif count == 2:
-                            multiplier = 0.75
-                        elif count == 3:
-                            multiplier = 0.5
-                        else:
-                            multiplier = 0.33
-                        
-                        score_contribution = synergy["score"] * multiplier
-                        total_score += score_contribution
-                        
-                        explanations.append(
-                            f"✓ {synergy['name']} with {teammate['name']}: {synergy['explanation']}"
-                            + (f" (x{multiplier:.0%})" if multiplier < 1.0 else "")
-                        )
+                # Check both directions of synergy
+                if (tags_list[0] in champ_tags and tags_list[1] in teammate_tags) or \
+                   (tags_list[1] in champ_tags and tags_list[0] in teammate_tags):
+                    
+                    # Apply diminishing returns for repeated synergies
+                    synergy_counts[synergy_name] = synergy_counts.get(synergy_name, 0) + 1
+                    count = synergy_counts[synergy_name]
+                    
+                    # Diminishing returns: 100%, 75%, 50%, 33% for 1st, 2nd, 3rd, 4th+ occurrences
+                    if count == 1:
+                        multiplier = 1.0
+                    elif count == 2:
+                        multiplier = 0.75
+                    elif count == 3:
+                        multiplier = 0.5
+                    else:
+                        multiplier = 0.33
+                    
+                    score_contribution = synergy["score"] * multiplier
+                    total_score += score_contribution
+                    
+                    explanations.append(
+                        f"✓ {synergy['name']} with {teammate['name']}: {synergy['explanation']}"
+                        + (f" (x{multiplier:.0%})" if multiplier < 1.0 else "")
+                    )
         
         # Normalize by team size to avoid favoring larger teams
         if team:
             total_score = total_score / len(team)
         
+        # N-ary combos: one pass over the rules touched by the candidate's tags
+        for tags_list, synergy in touched_combos if teammates else []:
+            
+            # Each missing tag is provided by the first teammate that has it
+            partners = []
+            for tag in tags_list:
+                if tag in champ_tags:
+                    continue
+                provider = next((mate for mate, mate_tags in teammates if tag in mate_tags), None)
+                if provider is None:
+                    break
+                if provider not in partners:
+                    partners.append(provider)
+            else:
+                if partners:
+                    total_score += synergy["score"]
+                    names = ", ".join(mate["name"] for mate in partners)
+                    explanations.append(f"✓ {synergy['name']} with {names}: {synergy['explanation']}")
+        
         return total_score, explanations
     
+    def _matchup_facts(self, attacker_id: str, defender_id: str) -> Tuple[List, List, List]:
+        """
+        What an attacker's matchup lists and kit say against a defender,
+        memoized per pair.
+        
+        "A counters B" and "B is countered by A" are the same fact: one scan
+        gives the attacker's counter score and the defender's vulnerability,
+        and stays warm for every later draft state.
+        
+        Returns:
+            Tuple of (counters, strong_against, rules): the attacker's
+            matchup entries targeting the defender as (position, entry), in
+            list order, and the archetype counter rules that apply
+        """
+        key = (attacker_id, defender_id)
+        facts = self._matchup_facts_cache.get(key)
+        if facts is not None:
+            return facts
+        
+        if self.indexed_store:
+            entries = self.indexed_store.matchups_between(attacker_id, defender_id)
+            counters = [(position, c) for position, kind, c in entries if kind == "counters"]
+            strong = [(position, c) for position, kind, c in entries if kind == "strong_against"]
+        else:
+            matchups = self.champion_counter_map.get(attacker_id, {})
+            counters = [(i, c) for i, c in enumerate(matchups.get("counters", [])) if c["target"] == defender_id]
+            strong = [(i, c) for i, c in enumerate(matchups.get("strong_against", [])) if c["target"] == defender_id]
+        
+        rules = []
+        attacker = self.champion_map.get(attacker_id)
+        defender = self.champion_map.get(defender_id)
+        if attacker and defender:
+            attacker_tags = set(attacker.get("kit_tags", []))
+            attacker_tags.add(attacker_id)
+            defender_tags = set(defender.get("kit_tags", []))
+            if self.indexed_store:
+                candidates = self.indexed_store.counters_touching(sorted(attacker_tags), sorted(defender_tags))
+            else:
+                candidates = self.counters
+            rules = [
+                counter for counter in candidates
+                if set(counter["attacker_tags"]).issubset(attacker_tags) and
+                len(set(counter["defender_tags"]).intersection(defender_tags)) > 0
+            ]
+        
+        facts = (counters, strong, rules)
+        self._matchup_facts_cache[key] = facts
+        return facts
+    
     def calculate_counter_score(self, champion: Dict, enemy_team: List[str]) -> Tuple[float, List[str]]:
         """
         Calculate how well a champion counters the enemy team.
@@ -247,55 +1368,35 @@ class DraftEngine:
         """
         total_score = 0.0
         explanations = []
-        
-        champ_tags = set(champion.get("kit_tags", []))
-        champ_tags.add(champion["id"])
         champ_id = champion["id"]
         
-        # Check for specific champion counters first (higher priority)
-        if champ_id in self.champion_counter_map:
-            champion_matchups = self.champion_counter_map[champ_id]
-            
-            # Check counters (champions this champion counters)
-            for counter in champion_matchups.get("counters", []):
-                if counter["target"] in enemy_team:
-                    bonus_score = counter["strength"]
-                    total_score += bonus_score
-                    enemy_name = self.champion_map.get(counter["target"], {}).get("name", counter["target"])
-                    explanations.append(
-                        f"⚔ Matchup Advantage vs {enemy_name}: {counter['reason']} (+{bonus_score:.2f})"
-                    )
-            
-            # Check strong_against (additional positive matchups)
-            for strong in champion_matchups.get("strong_against", []):
-                if strong["target"] in enemy_team:
-                    bonus_score = strong["strength"]
-                    total_score += bonus_score
-                    enemy_name = self.champion_map.get(strong["target"], {}).get("name", strong["target"])
-                    explanations.append(
-                        f"⚔ Strong Against {enemy_name}: {strong['reason']} (+{bonus_score:.2f})"
-                    )
+        # Specific champion counters first (higher priority), in the order of
+        # the champion's counters then strong_against lists
+        specific = []
+        for enemy_id in dict.fromkeys(enemy_team):
+            counters, strong, _ = self._matchup_facts(champ_id, enemy_id)
+            specific += [(0, i, counter) for i, counter in counters]
+            specific += [(1, i, counter) for i, counter in strong]
+        specific.sort(key=lambda entry: entry[:2])
+        
+        for kind, _, counter in specific:
+            bonus_score = counter["strength"]
+            total_score += bonus_score
+            enemy_name = self.champion_map.get(counter["target"], {}).get("name", counter["target"])
+            label = f"Matchup Advantage vs {enemy_name}" if kind == 0 else f"Strong Against {enemy_name}"
+            explanations.append(f"⚔ {label}: {counter['reason']} (+{bonus_score:.2f})")
         
-        # Then check archetype-based counters
+        # Then archetype-based counters
         for enemy_id in enemy_team:
             if enemy_id not in self.champion_map:
                 continue
-                
-            enemy = self.champion_map[enemy_id]
-            enemy_tags = set(enemy.get("kit_tags", []))
             
-            # Check all counter rules
-            for counter in self.counters:
-                attacker_tags = set(counter["attacker_tags"])
-                defender_tags = set(counter["defender_tags"])
-                
-                # Check if this champion (attacker) counters enemy (defender)
-                if attacker_tags.issubset(champ_tags) and \
-                   len(defender_tags.intersection(enemy_tags)) > 0:
-                    total_score += counter["score"]
-                    explanations.append(
-                        f"⚔ {counter['name']} vs {enemy['name']}: {counter['explanation']}"
-                    )
+            enemy = self.champion_map[enemy_id]
+            for counter in self._matchup_facts(champ_id, enemy_id)[2]:
+                total_score += counter["score"]
+                explanations.append(
+                    f"⚔ {counter['name']} vs {enemy['name']}: {counter['explanation']}"
+                )
         
         # Normalize by enemy team size
         if enemy_team:
@@ -317,60 +1418,39 @@ class DraftEngine:
         """
         total_score = 0.0
         explanations = []
-        
-        champ_tags = set(champion.get("kit_tags", []))
         champ_id = champion["id"]
         
-        # Check for specific champion vulnerabilities (being countered)
+        # Specific champion vulnerabilities: we are in the enemy's matchup lists
         for enemy_id in enemy_team:
             if enemy_id not in self.champion_map:
                 continue
             
-            # Check if the enemy champion has this champion in their counters list
-            if enemy_id in self.champion_counter_map:
-                enemy_matchups = self.champion_counter_map[enemy_id]
-                
-                # Check if we're in their counters list
-                for counter in enemy_matchups.get("counters", []):
-                    if counter["target"] == champ_id:
-                        penalty_score = abs(counter["strength"])  # Negative becomes positive penalty
-                        total_score += penalty_score
-                        enemy_name = self.champion_map.get(enemy_id, {}).get("name", enemy_id)
-                        explanations.append(
-                            f"⚠ Hard Countered by {enemy_name}: {counter['reason']} (-{penalty_score:.2f})"
-                        )
-                
-                # Check strong_against
-                for strong in enemy_matchups.get("strong_against", []):
-                    if strong["target"] == champ_id:
-                        penalty_score = abs(strong["strength"])
-                        total_score += penalty_score
-                        enemy_name = self.champion_map.get(enemy_id, {}).get("name", enemy_id)
-                        explanations.append(
-                            f"⚠ Weak Against {enemy_name}: {strong['reason']} (-{penalty_score:.2f})"
-                        )
-        
-        # Then check archetype-based vulnerabilities
+            enemy_name = self.champion_map[enemy_id].get("name", enemy_id)
+            counters, strong, _ = self._matchup_facts(enemy_id, champ_id)
+            for _, counter in counters:
+                penalty_score = abs(counter["strength"])  # Negative becomes positive penalty
+                total_score += penalty_score
+                explanations.append(
+                    f"⚠ Hard Countered by {enemy_name}: {counter['reason']} (-{penalty_score:.2f})"
+                )
+            for _, strong_entry in strong:
+                penalty_score = abs(strong_entry["strength"])
+                total_score += penalty_score
+                explanations.append(
+                    f"⚠ Weak Against {enemy_name}: {strong_entry['reason']} (-{penalty_score:.2f})"
+                )
+        
+        # Then archetype-based vulnerabilities (the enemy is the attacker)
         for enemy_id in enemy_team:
             if enemy_id not in self.champion_map:
                 continue
-                
-            enemy = self.champion_map[enemy_id]
-            enemy_tags = set(enemy.get("kit_tags", []))
-            enemy_tags.add(enemy["id"])
             
-            # Check all counter rules (reversed - enemy is attacker)
-            for counter in self.counters:
-                attacker_tags = set(counter["attacker_tags"])
-                defender_tags = set(counter["defender_tags"])
-                
-                # Check if enemy counters this champion
-                if attacker_tags.issubset(enemy_tags) and \
-                   len(defender_tags.intersection(champ_tags)) > 0:
-                    total_score += counter["score"]
-                    explanations.append(
-                        f"⚠ Countered by {enemy['name']} ({counter['name']}): {counter['explanation']}"
-                    )
+            enemy = self.champion_map[enemy_id]
+            for counter in self._matchup_facts(enemy_id, champ_id)[2]:
+                total_score += counter["score"]
+                explanations.append(
+                    f"⚠ Countered by {enemy['name']} ({counter['name']}): {counter['explanation']}"
+                )
         
         # Normalize by enemy team size
         if enemy_team:
@@ -378,13 +1458,150 @@ class DraftEngine:
         
         return total_score, explanations
     
+    def get_lane_weights(self, role: str, enemy_team: List[str],
+                         enemy_roles: Dict[str, str] = None) -> List[Tuple[int, float]]:
+        """
+        Weight each enemy pick by how directly it faces our role.
+        
+        Args:
+            role: Role we are recommending for
+            enemy_team: List of enemy champion IDs
+            enemy_roles: Known enemy roles; the others come from the role solver
+            
+        Returns:
+            List of (champion_index, weight) for the known enemy champions
+        """
+        roles = self.assign_roles(enemy_team)["assignments"]
+        roles.update(enemy_roles or {})
+        role_weights = LANE_WEIGHTS.get(role, {})
+        
+        return [
+            (self.champion_index[enemy_id], role_weights.get(roles.get(enemy_id), DEFAULT_LANE_WEIGHT))
+            for enemy_id in enemy_team
+            if enemy_id in self.champion_index
+        ]
+    
+    def calculate_lane_matchup_scores(self, champion_id: str,
+                                      lanes: List[Tuple[int, float]]) -> Tuple[float, float]:
+        """
+        Lane-weighted counter and vulnerability scores from the matchup tables.
+        
+        Same per-enemy scores as calculate_counter_score and
+        calculate_being_countered_score, averaged with lane weights instead of
+        uniformly.
+        
+        Args:
+            champion_id: Candidate champion ID
+            lanes: Output of get_lane_weights
+            
+        Returns:
+            Tuple of (counter_score, vulnerability_score)
+        """
+        total_weight = sum(weight for _, weight in lanes)
+        if not total_weight:
+            return 0.0, 0.0
+        
+        counters = self.counter_vectors[champion_id]
+        champ_index = self.champion_index[champion_id]
+        
+        counter_score = 0.0
+        vulnerability_score = 0.0
+        for enemy_index, weight in lanes:
+            counter_score += counters[enemy_index] * weight
+            vulnerability_score += self.threat_vectors[self.champions[enemy_index]["id"]][champ_index] * weight
+        
+        return counter_score / total_weight, vulnerability_score / total_weight
+    
+    def _matchup_bound_function(self, enemy_team: List[str], lanes: List[Tuple[int, float]],
+                                weights: Dict[str, float]):
+        """
+        Optimistic bound of the counter + vulnerability contribution to a
+        candidate's total, from the precomputed matchup tables.
+        
+        The tables hold the same per-enemy scores as the rule scans; when the
+        enemy team has unknown or repeated champions the scans can differ, so
+        the bound is left open (no pruning).
+        
+        Returns:
+            Function of a champion ID returning the bound
+        """
+        if lanes is None:
+            enemy_indexes = [self.champion_index.get(enemy_id) for enemy_id in enemy_team]
+            if None in enemy_indexes or len(set(enemy_indexes)) != len(enemy_indexes):
+                return lambda champ_id: float("inf")
+            if not enemy_indexes:
+                return lambda champ_id: PRUNING_EPSILON
+            lanes = [(i, 1.0) for i in enemy_indexes]
+        
+        def bound(champ_id: str) -> float:
+            counter, vulnerability = self.calculate_lane_matchup_scores(champ_id, lanes)
+            return counter * weights["counter"] + vulnerability * weights["vulnerability"] + PRUNING_EPSILON
+        
+        return bound
+    
+    def get_stage_weights(self, team_size: int) -> Dict[str, float]:
+        """
+        Get the scoring weights for the current draft stage.
+        
+        Args:
+            team_size: Number of champions already picked by your team
+            
+        Returns:
+            Dict of component name to weight
+        """
+        # Adaptive weighting based on draft stage
+        # Balanced weights for good differentiation without over-extrapolation
+        if team_size <= 1:
+            # Early draft: prioritize flex picks and strong meta
+            return {
+                "tier": 0.35,
+                "synergy": 0.25,
+                "counter": 0.35,
+                "vulnerability": -0.40,
+                "flex": 0.20,
+                "viability": 0.15,
+                "balance": 0.08,
+                "early_jungle": 0.10,
+                "composition": 0.30
+            }
+        elif team_size <= 3:
+            # Mid draft: balance synergy and counters
+            return {
+                "tier": 0.25,
+                "synergy": 0.50,
+                "counter": 0.45,
+                "vulnerability": -0.50,
+                "flex": 0.10,
+                "viability": 0.15,
+                "balance": 0.15,
+                "early_jungle": 0.10,
+                "composition": 0.50
+            }
+        else:
+            # Late draft: heavily focus on synergy and filling gaps
+            return {
+                "tier": 0.20,
+                "synergy": 0.75,
+                "counter": 0.40,
+                "vulnerability": -0.65,
+                "flex": 0.05,
+                "viability": 0.12,
+                "balance": 0.25,
+                "early_jungle": 0.10,
+                "composition": 0.70
+            }
+    
     def recommend_champions(
         self,
         role: str,
         team: List[str] = None,
         enemy_team: List[str] = None,
         banned_champions: List[str] = None,
-        top_n: int = 5
+        top_n: Optional[int] = 5,
+        lookahead: bool = False,
+        enemy_roles: Dict[str, str] = None,
+        composition_profile: str = None,
+        timings: Dict[str, float] = None
     ) -> List[Dict]:
         """
         Recommend champions for a specific role based on team composition.
@@ -394,11 +1611,23 @@ class DraftEngine:
             team: List of champion IDs already picked by your team
             enemy_team: List of champion IDs picked by enemy
             banned_champions: List of banned champion IDs
-            top_n: Number of recommendations to return
+            top_n: Number of recommendations to return (None ranks every
+                viable champion)
+            lookahead: Penalize each top candidate by the enemy's best counter-pick
+            enemy_roles: Enemy champion ID -> role. When given, counter and
+                vulnerability scores weight each enemy by LANE_WEIGHTS (missing
+                roles are filled in by the role solver)
+            composition_profile: COMPOSITION_PROFILES archetype the team's
+                composition gaps are measured against (defaults to
+                DEFAULT_COMPOSITION_PROFILE)
+            timings: Optional dict filled with the duration (ms) of each phase
+                (prepare, cheap stage, synergy/matchup stages, lookahead) and
+                the number of candidates pruned and fully scored
             
         Returns:
             List of recommended champions with scores and explanations
         """
+        started = time.perf_counter()
         team = team or []
         enemy_team = enemy_team or []
         banned_champions = banned_champions or []
@@ -414,18 +1643,31 @@ class DraftEngine:
         team_analysis = self.analyze_team_composition(team)
         team_size = len(team)
         is_jungle = role == "jungle"
+        weights = self.get_stage_weights(team_size)
+        lanes = self.get_lane_weights(role, enemy_team, enemy_roles) if enemy_roles is not None else None
         
-        # Calculate scores for each champion
-        recommendations = []
+        # Composition gaps only exist once the team has picks
+        gap_scores = self.composition_gap_scores(team, composition_profile) if team else {}
         
-        for champ in viable:
+        # Staged scoring: cheap components first, then synergy, then the
+        # matchup rule scans. Candidates are visited best bound first and
+        # dropped as soon as their optimistic bound falls below the current
+        # k-th best total, so only contenders pay for the expensive stages.
+        if top_n is None:
+            k = len(viable)
+        else:
+            k = top_n * LOOKAHEAD_POOL_FACTOR if lookahead else top_n
+        matchup_bound = self._matchup_bound_function(enemy_team, lanes, weights)
+        stats = self.pruning_stats
+        stats["candidates"] += len(viable)
+        prepared = time.perf_counter()
+        
+        # Stage 1: tier, flex, viability, balance, early impact, damage split, composition gaps
+        candidates = []
+        for index, champ in enumerate(viable):
             champ_id = champ["id"]
             champ_meta = self.champion_meta.get(champ_id, {})
             
-            # Calculate different score components
-            synergy_score, synergy_exp = self.calculate_synergy_score(champ, team)
-            counter_score, counter_exp = self.calculate_counter_score(champ, enemy_team)
-            vulnerability_score, vulnerability_exp = self.calculate_being_countered_score(champ, enemy_team)
             tier_score = self.get_tier_score(champ_id)
             flex_score = self.calculate_flex_score(champ_id, role)
             
@@ -470,48 +1712,70 @@ class DraftEngine:
                     damage_balance_bonus = 0.10
                     damage_explanation = "⚖️ Équilibre les dégâts : Dégâts Mixtes utiles"
             
-            if damage_explanation:
-                synergy_exp.insert(0, damage_explanation)  # Add to top of explanations
-            
-
-            # Adaptive weighting based on draft stage
-            # Balanced weights for good differentiation without over-extrapolation
-            if team_size <= 1:
-                # Early draft: prioritize flex picks and strong meta
-                weights = {
-                    "tier": 0.35,
-                    "synergy": 0.25,
-                    "counter": 0.35,
-                    "vulnerability": -0.40,
-                    "flex": 0.20,
-                    "viability": 0.15,
-                    "balance": 0.08,
-                    "early_jungle": 0.10
-                }
-            elif team_size <= 3:
-                # Mid draft: balance synergy and counters
-                weights = {
-                    "tier": 0.25,
-                    "synergy": 0.50,
-                    "counter": 0.45,
-                    "vulnerability": -0.50,
-                    "flex": 0.10,
-                    "viability": 0.15,
-                    "balance": 0.15,
-                    "early_jungle": 0.10
-                }
-            else:
-                # Late draft: heavily focus on synergy and filling gaps
-                weights = {
-                    "tier": 0.20,
-                    "synergy": 0.75,
-                    "counter": 0.40,
-                    "vulnerability": -0.65,
-                    "flex": 0.05,
-                    "viability": 0.12,
-                    "balance": 0.25,
-                    "early_jungle": 0.10
-                }
+            # Composition gaps filled (engage, frontline, ...)
+            composition_score, filled_groups = gap_scores.get(champ_id, (0.0, []))
+            composition_explanation = None
+            if filled_groups:
+                composition_explanation = f"🧩 Comble la composition : {', '.join(filled_groups)}"
+            
+            base_score = (
+                tier_score * weights["tier"] +
+                flex_score * weights["flex"] +
+                champ["role_viability"] * weights["viability"] +
+                balance_bonus * weights["balance"] +
+                early_game_score * weights["early_jungle"] +
+                damage_balance_bonus +
+                composition_score * weights["composition"]
+            )
+            synergy_bound = self.synergy_bounds[champ_id] if team else 0.0
+            bound = base_score + max(synergy_bound * weights["synergy"], 0.0) + matchup_bound(champ_id)
+            
+            candidates.append((bound, index, champ, base_score, {
+                "tier_score": tier_score,
+                "flex_score": flex_score,
+                "early_impact": early_impact,
+                "late_scaling": late_scaling,
+                "balance_bonus": balance_bonus,
+                "early_game_score": early_game_score,
+                "damage_balance_bonus": damage_balance_bonus,
+                "damage_explanation": damage_explanation,
+                "composition_score": composition_score,
+                "composition_explanation": composition_explanation
+            }))
+        
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        cheap_done = time.perf_counter()
+        best_totals = []  # min-heap of the k best totals so far
+        scored = []
+        
+        for bound, index, champ, base_score, parts in candidates:
+            champ_id = champ["id"]
+            kth_best = best_totals[0] if k > 0 and len(best_totals) >= k else None
+            if kth_best is not None and bound < kth_best:
+                stats["pruned_before_synergy"] += 1
+                continue
+            
+            # Stage 2: synergy with the team
+            synergy_score, synergy_exp = self.calculate_synergy_score(champ, team)
+            if kth_best is not None and \
+                    base_score + synergy_score * weights["synergy"] + matchup_bound(champ_id) < kth_best:
+                stats["pruned_before_matchups"] += 1
+                continue
+            
+            # Stage 3: counters and vulnerability against the enemy team
+            counter_score, counter_exp = self.calculate_counter_score(champ, enemy_team)
+            vulnerability_score, vulnerability_exp = self.calculate_being_countered_score(champ, enemy_team)
+            if lanes is not None:
+                counter_score, vulnerability_score = self.calculate_lane_matchup_scores(champ_id, lanes)
+            stats["fully_scored"] += 1
+            
+            tier_score = parts["tier_score"]
+            flex_score = parts["flex_score"]
+            balance_bonus = parts["balance_bonus"]
+            if parts["composition_explanation"]:
+                synergy_exp.insert(0, parts["composition_explanation"])
+            if parts["damage_explanation"]:
+                synergy_exp.insert(0, parts["damage_explanation"])  # Add to top of explanations
             
             # Combined score
             total_score = (
@@ -522,15 +1786,22 @@ class DraftEngine:
                 flex_score * weights["flex"] +
                 champ["role_viability"] * weights["viability"] +
                 balance_bonus * weights["balance"] +
-                early_game_score * weights["early_jungle"] +
-                damage_balance_bonus
+                parts["early_game_score"] * weights["early_jungle"] +
+                parts["damage_balance_bonus"] +
+                parts["composition_score"] * weights["composition"]
             )
             
+            if k > 0:
+                if len(best_totals) < k:
+                    heapq.heappush(best_totals, total_score)
+                elif total_score > best_totals[0]:
+                    heapq.heapreplace(best_totals, total_score)
+            
             # Get tier info for display
             tier_info = self.champion_tiers.get(champ_id, {})
             tier_name = tier_info.get("tier", "B")
             
-            recommendations.append({
+            scored.append((index, {
                 "champion": champ,
                 "total_score": total_score,
                 "tier_score": tier_score,
@@ -539,18 +1810,421 @@ class DraftEngine:
                 "counter_score": counter_score,
                 "vulnerability_score": vulnerability_score,
                 "flex_score": flex_score,
-                "early_impact": early_impact,
-                "late_scaling": late_scaling,
+                "early_impact": parts["early_impact"],
+                "late_scaling": parts["late_scaling"],
                 "balance_bonus": balance_bonus,
+                "composition_score": parts["composition_score"],
                 "synergy_explanations": synergy_exp,
                 "counter_explanations": counter_exp,
                 "vulnerability_explanations": vulnerability_exp
-            })
+            }))
         
-        # Sort by total score (highest first)
+        # Sort by total score (highest first); ties keep the viability order
+        scored.sort(key=lambda entry: entry[0])
+        recommendations = [recommendation for _, recommendation in scored]
         recommendations.sort(key=lambda x: x["total_score"], reverse=True)
+        staged_done = time.perf_counter()
+        
+        if lookahead:
+            recommendations = recommendations[:k]
+            self._apply_lookahead(recommendations, all_picked, enemy_team, weights)
+            recommendations.sort(key=lambda x: x["total_score"], reverse=True)
+        
+        if timings is not None:
+            finished = time.perf_counter()
+            timings.update({
+                "prepare": (prepared - started) * 1000,
+                "cheap_stage": (cheap_done - prepared) * 1000,
+                "expensive_stages": (staged_done - cheap_done) * 1000,
+                "lookahead": (finished - staged_done) * 1000,
+                "candidates": len(viable),
+                "fully_scored": len(scored)
+            })
         
         return recommendations[:top_n]
+
+    def recommend_both_sides(
+        self,
+        role: str,
+        team: List[str] = None,
+        enemy_team: List[str] = None,
+        banned_champions: List[str] = None,
+        top_n: int = 5,
+        lookahead: bool = False,
+        enemy_role: str = None,
+        team_roles: Dict[str, str] = None,
+        enemy_roles: Dict[str, str] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Recommend champions for both sides of the draft in one call.
+
+        The enemy side's recommendations are recommend_champions with the
+        teams swapped; each side is scored independently.
+
+        Args:
+            role: Role to recommend for on our side
+            team, enemy_team, banned_champions, top_n, lookahead: As in recommend_champions
+            enemy_role: Role to recommend for on the enemy side (defaults to role)
+            team_roles: Our champion ID -> role, for the enemy side's lane weighting
+            enemy_roles: Enemy champion ID -> role, for our side's lane weighting
+
+        Returns:
+            Dict with "team" and "enemy" recommendation lists
+        """
+        team = team or []
+        enemy_team = enemy_team or []
+        return {
+            "team": self.recommend_champions(
+                role, team, enemy_team, banned_champions, top_n=top_n,
+                lookahead=lookahead, enemy_roles=enemy_roles
+            ),
+            "enemy": self.recommend_champions(
+                enemy_role or role, enemy_team, team, banned_champions, top_n=top_n,
+                lookahead=lookahead, enemy_roles=team_roles
+            )
+        }
+
+    def find_best_response(self, champion_id: str, unavailable: frozenset,
+                           open_roles: Tuple[str, ...] = tuple(ROLES)) -> Tuple[str, float]:
+        """
+        Find the enemy's best counter-pick against a champion.
+        
+        Walks the precomputed response list for the champion (strongest threat
+        first) and returns the first one still available that can play one of
+        the enemy's open roles. Results are memoized per draft state.
+        
+        Args:
+            champion_id: Champion the enemy would respond to
+            unavailable: Picked and banned champion IDs
+            open_roles: Roles the enemy still has to fill
+            
+        Returns:
+            Tuple of (response champion ID or None, threat score)
+        """
+        key = (champion_id, unavailable, open_roles)
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        role_indexes = [ROLES.index(role) for role in open_roles]
+        
+        best = (None, 0.0)
+        for threat, _, attacker_id in self.counter_responses.get(champion_id, []):
+            if attacker_id in unavailable:
+                continue
+            viability = self.role_viability_table[attacker_id]
+            if any(viability[i] >= 0.5 for i in role_indexes):
+                best = (attacker_id, threat)
+                break
+        
+        if len(self._response_cache) >= RESPONSE_CACHE_SIZE:
+            self._response_cache.clear()
+        self._response_cache[key] = best
+        return best
+    
+    def _apply_lookahead(self, recommendations: List[Dict], unavailable: set,
+                         enemy_team: List[str], weights: Dict[str, float]):
+        """
+        Penalize candidates by the vulnerability the enemy's best answer would add.
+        
+        The penalty is the rise of the per-enemy averaged threat against the
+        candidate once the response joins the enemy team, weighted like the
+        vulnerability component: (sum + threat) / (n + 1) - sum / n. Both
+        terms come from the unweighted threat vectors. An answer that lowers
+        the average scores like no answer at all: lookahead never adds points.
+        """
+        if len(enemy_team) >= 5:
+            return
+        
+        enemies = [self.threat_vectors[e] for e in enemy_team if e in self.threat_vectors]
+        enemy_open_roles = tuple(self.assign_roles(enemy_team)["open_roles"])
+        
+        for rec in recommendations:
+            champ = rec["champion"]
+            response_id, threat = self.find_best_response(
+                champ["id"], frozenset(unavailable | {champ["id"]}), enemy_open_roles
+            )
+            
+            # Averaging the response in re-normalizes the existing threat
+            index = self.champion_index[champ["id"]]
+            existing = sum(vector[index] for vector in enemies)
+            average = existing / len(enemies) if enemies else 0.0
+            delta = (existing + threat) / (len(enemies) + 1) - average
+            penalty = min(0.0, delta * weights["vulnerability"])
+            rec["lookahead_penalty"] = penalty
+            rec["enemy_best_response"] = response_id
+            rec["total_score"] += penalty
+            
+            if response_id:
+                response_name = self.champion_map[response_id]["name"]
+                rec["vulnerability_explanations"].append(
+                    f"🔮 Enemy could answer with {response_name} ({penalty:.2f})"
+                )
+    
+    def recommend_bans(
+        self,
+        team: List[str] = None,
+        enemy_team: List[str] = None,
+        banned_champions: List[str] = None,
+        top_n: int = 5
+    ) -> List[Dict]:
+        """
+        Recommend bans by ranking champions still available to the enemy
+        by how threatening they are to our current team.
+        
+        Args:
+            team: List of champion IDs already picked by your team
+            enemy_team: List of champion IDs picked by enemy
+            banned_champions: List of banned champion IDs
+            top_n: Number of bans to return
+            
+        Returns:
+            List of ban suggestions with threat scores and explanations
+        """
+        team = [c for c in (team or []) if c in self.champion_index]
+        enemy_team = enemy_team or []
+        banned_champions = banned_champions or []
+        
+        unavailable = set(team) | set(enemy_team) | set(banned_champions)
+        team_indexes = [self.champion_index[c] for c in team]
+        
+        scored = []
+        for champ_id, vector in self.threat_vectors.items():
+            if champ_id in unavailable:
+                continue
+            
+            if team_indexes:
+                threat = sum(vector[i] for i in team_indexes) / len(team_indexes)
+            else:
+                # No picks yet: use the champion's average threat over the roster
+                threat = self.average_threat[champ_id]
+            
+            scored.append((self.ban_base_scores[champ_id] + threat * BAN_WEIGHTS["threat"], threat, champ_id))
+        
+        scored.sort(reverse=True)
+        
+        bans = []
+        for total_score, threat, champ_id in scored[:top_n]:
+            champ = self.champion_map[champ_id]
+            vector = self.threat_vectors[champ_id]
+            
+            explanations = []
+            for teammate_id, i in zip(team, team_indexes):
+                if vector[i] > 0:
+                    explanations.append(
+                        f"⚠ Threatens {self.champion_map[teammate_id]['name']} (+{vector[i]:.2f})"
+                    )
+            
+            bans.append({
+                "champion": champ,
+                "total_score": total_score,
+                "threat_score": threat,
+                "tier_score": self.get_tier_score(champ_id),
+                "tier_name": champ.get("tier", "B"),
+                "flex_score": self.calculate_flex_score(champ_id, ""),
+                "threat_explanations": explanations
+            })
+        
+        return bans
+    
+    def _team_synergy(self, team_key: frozenset) -> Tuple[float, List[str]]:
+        """Average synergy of each member with the rest of a team, memoized per set."""
+        cached = self._team_synergy_cache.get(team_key)
+        if cached is not None:
+            return cached
+        
+        members = sorted(team_key)
+        total = 0.0
+        explanations = []
+        for champ_id in members:
+            score, champ_exp = self.calculate_synergy_score(
+                self.champion_map[champ_id], [mate for mate in members if mate != champ_id]
+            )
+            total += score
+            explanations.extend(champ_exp)
+        result = (total / len(members) if members else 0.0, explanations)
+        
+        if len(self._team_synergy_cache) >= ANALYSIS_CACHE_SIZE:
+            self._team_synergy_cache.clear()
+        self._team_synergy_cache[team_key] = result
+        return result
+    
+    def _score_side(self, picks: List[str], analysis: Dict, opponents: List[str],
+                    opponent_roles: Dict[str, str], explain: bool) -> Dict:
+        """Composite score of one side of a complete draft (see evaluate_draft)."""
+        weights = self.get_stage_weights(len(picks))
+        
+        # Counter/vulnerability per pick against the opponents, weighted by lane
+        counter = 0.0
+        vulnerability = 0.0
+        for champ_id in picks:
+            role_weights = LANE_WEIGHTS.get(analysis["role_assignments"].get(champ_id), {})
+            lanes = [
+                (self.champion_index[enemy_id], role_weights.get(opponent_roles.get(enemy_id), DEFAULT_LANE_WEIGHT))
+                for enemy_id in opponents
+            ]
+            pick_counter, pick_vulnerability = self.calculate_lane_matchup_scores(champ_id, lanes)
+            counter += pick_counter
+            vulnerability += pick_vulnerability
+        if picks:
+            counter /= len(picks)
+            vulnerability /= len(picks)
+        
+        synergy, synergy_exp = self._team_synergy(frozenset(picks))
+        damage_total = analysis["ad_count"] + analysis["ap_count"]
+        damage_split = 1.0 - abs(analysis["ad_count"] / damage_total - 0.5) * 2 if damage_total else 0.0
+        
+        components = {
+            "synergy": synergy,
+            "counter": counter,
+            "vulnerability": vulnerability,
+            "balance": analysis["balance_score"],
+            "damage_split": damage_split
+        }
+        score = (
+            synergy * weights["synergy"] +
+            counter * weights["counter"] +
+            vulnerability * weights["vulnerability"] +
+            analysis["balance_score"] * weights["balance"] +
+            damage_split * DAMAGE_SPLIT_WEIGHT
+        )
+        
+        side = {
+            "score": score,
+            "components": components,
+            "roles": analysis["role_assignments"],
+            "power_curve": analysis["power_curve"]
+        }
+        if explain:
+            side["synergy_explanations"] = synergy_exp
+        return side
+    
+    def evaluate_draft(
+        self,
+        team: List[str],
+        enemy_team: List[str],
+        team_roles: Dict[str, str] = None,
+        enemy_roles: Dict[str, str] = None,
+        banned_champions: List[str] = None,
+        explain: bool = False
+    ) -> Dict:
+        """
+        Score a complete (or partial) draft for both sides.
+        
+        Each side gets a composite score from the same components as
+        recommend_champions, averaged over its picks: synergy within the team,
+        lane-weighted counter and vulnerability against the other side, power
+        curve balance and damage split, weighted like a late draft.
+        
+        Args:
+            team, enemy_team: Champion IDs picked by each side
+            team_roles, enemy_roles: Champion ID -> role (missing roles are solved)
+            banned_champions: Banned champion IDs (checked for consistency)
+            explain: Include the synergy explanations of each side
+            
+        Returns:
+            Dict with each side's score and component breakdown, the score
+            difference (team - enemy_team) and the favored side
+            
+        Raises:
+            ValueError: If a champion is unknown, picked twice or both picked and banned
+        """
+        picks = list(team) + list(enemy_team)
+        unknown = [champ_id for champ_id in picks if champ_id not in self.champion_index]
+        if unknown:
+            raise ValueError(f"Unknown champion(s): {', '.join(unknown)}")
+        if len(set(picks)) != len(picks):
+            raise ValueError("A champion is picked more than once")
+        if set(picks) & set(banned_champions or []):
+            raise ValueError("A champion is both picked and banned")
+        
+        # Both sides' analyses are computed once and reused for the other side's lanes
+        analyses = {}
+        for side, side_picks, side_roles in (("team", team, team_roles), ("enemy_team", enemy_team, enemy_roles)):
+            analysis = self.analyze_team_composition(side_picks)
+            analysis["role_assignments"] = {**analysis["role_assignments"], **(side_roles or {})}
+            analyses[side] = analysis
+        
+        result = {
+            "team": self._score_side(team, analyses["team"], enemy_team,
+                                     analyses["enemy_team"]["role_assignments"], explain),
+            "enemy_team": self._score_side(enemy_team, analyses["enemy_team"], team,
+                                           analyses["team"]["role_assignments"], explain)
+        }
+        result["score_diff"] = result["team"]["score"] - result["enemy_team"]["score"]
+        result["favored"] = "team" if result["score_diff"] >= 0 else "enemy_team"
+        return result
+    
+    def evaluate_drafts(self, drafts: Iterable[Dict], explain: bool = False) -> Iterator[Dict]:
+        """
+        Score a stream of drafts, yielding each result as soon as it is computed.
+        
+        Args:
+            drafts: Dicts with team, enemy_team and optional team_roles,
+                enemy_roles, banned_champions and id
+            explain: Include synergy explanations
+            
+        Yields:
+            evaluate_draft results (with the draft's id), or {"id", "error"}
+            for drafts that cannot be scored
+        """
+        for draft in drafts:
+            try:
+                result = self.evaluate_draft(
+                    team=draft.get("team") or [],
+                    enemy_team=draft.get("enemy_team") or [],
+                    team_roles=draft.get("team_roles"),
+                    enemy_roles=draft.get("enemy_roles"),
+                    banned_champions=draft.get("banned_champions"),
+                    explain=explain
+                )
+            except (ValueError, TypeError, AttributeError) as e:
+                result = {"error": str(e)}
+            if "id" in draft:
+                result = {"id": draft["id"], **result}
+            yield result
+    
+    def recommend_open_roles(
+        self,
+        team: List[str] = None,
+        enemy_team: List[str] = None,
+        banned_champions: List[str] = None,
+        top_n: int = 1,
+        lookahead: bool = False
+    ) -> Dict:
+        """
+        Solve the roles of the current picks and recommend for every open role.
+        
+        Args:
+            team: List of champion IDs already picked by your team
+            enemy_team: List of champion IDs picked by enemy
+            banned_champions: List of banned champion IDs
+            top_n: Number of recommendations per open role
+            lookahead: Penalize candidates by the enemy's best counter-pick
+            
+        Returns:
+            Dict with role assignments, open roles and recommendations per open role
+        """
+        team = team or []
+        roles = self.assign_roles(team)
+        
+        recommendations = {
+            role: self.recommend_champions(
+                role=role,
+                team=team,
+                enemy_team=enemy_team,
+                banned_champions=banned_champions,
+                top_n=top_n,
+                lookahead=lookahead
+            )
+            for role in roles["open_roles"]
+        }
+        
+        return {
+            "assignments": roles["assignments"],
+            "open_roles": roles["open_roles"],
+            "recommendations": recommendations
+        }
     
     def explain_recommendation(self, recommendation: Dict) -> str:
         """
@@ -572,6 +2246,7 @@ class DraftEngine:
         explanation += f"  • Synergy: {recommendation['synergy_score']:.2f}\n"
         explanation += f"  • Counter: {recommendation['counter_score']:.2f}\n"
         explanation += f"  • Vulnerability: {recommendation['vulnerability_score']:.2f}\n"
+        explanation += f"  • Composition Gaps: {recommendation['composition_score']:.2f}\n"
         explanation += f"  • Role Fit: {champ['role_viability']:.2f}\n\n"
         
         explanation += f"📝 Champion Info:\n"
@@ -602,36 +2277,6 @@ class DraftEngine:
 
 
 if __name__ == "__main__":
-    # Example usage
-    engine = DraftEngine()
-    
-    print("🎮 Wild Rift Draft Tool - Kit-Based Recommendation Engine\n")
-    
-    # Example scenario
-    team = ["malphite", "thresh"]  # Top: Malphite, Support: Thresh
-    enemy_team = ["yasuo", "jinx"]  # Mid: Yasuo, ADC: Jinx
-    banned = ["leeSin", "masterYi"]
-    
-    print(f"Your Team: {', '.join([engine.champion_map[c]['name'] for c in team])}")
-    print(f"Enemy Team: {', '.join([engine.champion_map[c]['name'] for c in enemy_team])}")
-    print(f"Banned: {', '.join([engine.champion_map[c]['name'] for c in banned])}\n")
-    print("="*60)
-    print("Looking for: JUNGLE")
-    print("="*60)
-    
-    # Get recommendations for jungle
-    recommendations = engine.recommend_champions(
-        role="jungle",
-        team=team,
-        enemy_team=enemy_team,
-        banned_champions=banned,
-        top_n=5
-    )
-    
-    # Print top recommendation with full explanation
-    if recommendations:
-        print(engine.explain_recommendation(recommendations[0]))
-        
-        print("\n📋 Other Top Picks:")
-        for i, rec in enumerate(recommendations[1:], 2):
-            print(f"{i}. {rec['champion']['name']} - Score: {rec['total_score']:.2f}")
+    # Batch recommendations over NDJSON draft states (see batch_recommend.py)
+    from batch_recommend import main
+    main()
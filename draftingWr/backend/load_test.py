@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Wild Rift Draft Tool - Load Test Harness
+Replays a realistic request mix against the API at a target rate.
+
+The mix covers champion listing/search, /recommend at every draft stage and
+/recommend/bans. Draft states are generated from the dataset (random legal
+drafts, one per pick stage) or replayed from a JSONL file of recorded states.
+Requests are sent open-loop on a fixed schedule and latency is measured from
+the scheduled send time, so a slow server cannot hide its queueing delay by
+slowing the generator down.
+
+The API runs either in-process (the ASGI app is called directly, no network
+or extra dependencies) or behind a local uvicorn given with --url.
+
+Usage:
+    cd backend
+    python load_test.py --rate 50 --duration 30 --out results.json
+    python load_test.py --url http://localhost:8000 --rate 200 --duration 60
+    python load_test.py --states recorded_drafts.jsonl --out results.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+sys.path.append(str(Path(__file__).parent))
+from data_store import JSONDataStore
+from draft_engine import ROLES
+from scheduler import percentile
+
+
+# Share of each request kind in the replayed traffic
+REQUEST_MIX = {
+    "champions": 0.2,
+    "recommend": 0.6,
+    "bans": 0.2
+}
+
+# Champion listing requests, picked uniformly
+CHAMPION_ENDPOINTS = ["/champions", "/champions/{role}", "/champions/search"]
+
+
+def generate_draft_states(champions: List[Dict], count: int, seed: int = 0) -> List[Dict]:
+    """
+    Random legal draft states spread over every pick stage.
+
+    Each state has up to 10 bans, 0-4 picks on our side (each viable in a
+    distinct role), as many or one more enemy picks, and the next role we
+    still have to fill.
+
+    Args:
+        champions: Champion list from champions.json
+        count: Number of states to generate
+        seed: Random seed, so runs are comparable across branches
+    """
+    rng = random.Random(seed)
+    states = []
+
+    for i in range(count):
+        pool = list(champions)
+        rng.shuffle(pool)
+        bans = [champ["id"] for champ in pool[:rng.randint(0, 10)]]
+        taken = set(bans)
+
+        def draft_side(size: int) -> Tuple[List[str], List[str]]:
+            roles = list(ROLES)
+            rng.shuffle(roles)
+            picks = []
+            for role in roles[:size]:
+                for champ in pool:
+                    if champ["id"] not in taken and champ.get("roles", {}).get(role, 0) >= 0.5:
+                        picks.append(champ["id"])
+                        taken.add(champ["id"])
+                        break
+            return picks, roles[size:]
+
+        stage = i % 5
+        team, open_roles = draft_side(stage)
+        enemy_team, _ = draft_side(min(5, stage + rng.randint(0, 1)))
+        states.append({
+            "role": open_roles[0],
+            "team": team,
+            "enemy_team": enemy_team,
+            "banned_champions": bans
+        })
+
+    return states
+
+
+def load_draft_states(path: str) -> List[Dict]:
+    """Recorded draft states, one JSON object per line (role, team, enemy_team, banned_champions)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RequestMix:
+    """Draws (label, stage, method, path, body) requests following REQUEST_MIX."""
+
+    def __init__(self, states: List[Dict], champions: List[Dict], seed: int = 0):
+        self.states = states
+        self.champions = champions
+        self.rng = random.Random(seed)
+        self.kinds = list(REQUEST_MIX)
+        self.weights = [REQUEST_MIX[kind] for kind in self.kinds]
+
+    def __call__(self) -> Tuple[str, Optional[int], str, str, Optional[Dict]]:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        state = self.rng.choice(self.states)
+
+        if kind == "recommend":
+            stage = len(state.get("team", []))
+            return "/recommend", stage, "POST", "/recommend", state
+
+        if kind == "bans":
+            body = {key: state.get(key, []) for key in ("team", "enemy_team", "banned_champions")}
+            return "/recommend/bans", None, "POST", "/recommend/bans", body
+
+        label = self.rng.choice(CHAMPION_ENDPOINTS)
+        if label == "/champions/{role}":
+            return label, None, "GET", f"/champions/{self.rng.choice(ROLES)}", None
+        if label == "/champions/search":
+            name = self.rng.choice(self.champions)["name"]
+            query = name[:self.rng.randint(1, len(name))]
+            return label, None, "GET", f"/champions/search?q={quote(query)}", None
+        return label, None, "GET", "/champions", None
+
+
+class ASGITarget:
+    """Calls an ASGI app directly, running its lifespan startup first."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lifespan = None
+        self._shutdown = None
+
+    def describe(self) -> str:
+        return "in-process"
+
+    async def start(self):
+        startup = asyncio.get_running_loop().create_future()
+        self._shutdown = asyncio.Event()
+        sent_startup = False
+
+        async def receive():
+            nonlocal sent_startup
+            if not sent_startup:
+                sent_startup = True
+                return {"type": "lifespan.startup"}
+            await self._shutdown.wait()
+            return {"type": "lifespan.shutdown"}
+
+        async def send(message):
+            if message["type"].startswith("lifespan.startup") and not startup.done():
+                startup.set_result(message)
+
+        async def run():
+            try:
+                await self.app({"type": "lifespan", "asgi": {"version": "3.0"}}, receive, send)
+            except Exception:
+                pass  # app without lifespan support
+            if not startup.done():
+                startup.set_result({"type": "lifespan.startup.complete"})
+
+        self._lifespan = asyncio.ensure_future(run())
+        message = await startup
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(f"App startup failed: {message.get('message', '')}")
+
+    async def stop(self):
+        if self._lifespan is not None:
+            self._shutdown.set()
+            await self._lifespan
+
+    async def request(self, method: str, path: str, body: Optional[Dict]) -> int:
+        path, _, query = path.partition("?")
+        payload = json.dumps(body).encode() if body is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"loadtest"), (b"content-type", b"application/json"),
+                        (b"content-length", str(len(payload)).encode())],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80)
+        }
+        status = None
+        done = asyncio.Event()
+        sent_body = False
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                done.set()
+
+        await self.app(scope, receive, send)
+        done.set()
+        return status
+
+
+class HTTPTarget:
+    """Sends plain HTTP/1.1 requests to a running server (one connection per request)."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+
+    def describe(self) -> str:
+        return self.url
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def request(self, method: str, path: str, body: Optional[Dict]) -> int:
+        payload = json.dumps(body).encode() if body is not None else b""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            head = (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode() + payload)
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
+
+
+async def wait_until_ready(target, timeout: float = 60.0):
+    """Poll /readyz until the API reports ready (servers without the probe count as ready)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            status = await target.request("GET", "/readyz", None)
+        except OSError:
+            status = None
+        if status is not None and status != 503:
+            return
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{target.describe()} not ready after {timeout:g} s")
+        await asyncio.sleep(0.1)
+
+
+async def run_load(target, make_request: Callable, rate: float, duration: float) -> Tuple[List[tuple], float]:
+    """
+    Send requests open-loop at a fixed rate for a duration.
+
+    Returns:
+        (samples, elapsed) with one (label, stage, latency_s, status) sample
+        per request (status is None when the request raised)
+    """
+    loop = asyncio.get_running_loop()
+    samples = []
+
+    async def fire(scheduled, label, stage, method, path, body):
+        try:
+            status = await target.request(method, path, body)
+        except Exception:
+            status = None
+        samples.append((label, stage, loop.time() - scheduled, status))
+
+    tasks = []
+    start = loop.time()
+    total = int(rate * duration)
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(fire(scheduled, *make_request())))
+
+    await asyncio.gather(*tasks)
+    return samples, loop.time() - start
+
+
+def summarize(samples: List[tuple], elapsed: float) -> Dict:
+    """Throughput, error rate and latency percentiles for a set of samples."""
+    latencies = [latency for _, _, latency, _ in samples]
+    errors = sum(1 for _, _, _, status in samples if status is None or status >= 400)
+    statuses: Dict[str, int] = {}
+    for _, _, _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "requests": len(samples),
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "status_codes": statuses,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": max(latencies) * 1000 if latencies else 0.0
+        }
+    }
+
+
+def build_report(samples: List[tuple], elapsed: float, target: str, rate: float, duration: float) -> Dict:
+    """Overall, per-endpoint and per-draft-stage summaries of a run."""
+    endpoints: Dict[str, List[tuple]] = {}
+    stages: Dict[str, List[tuple]] = {}
+    for sample in samples:
+        endpoints.setdefault(sample[0], []).append(sample)
+        if sample[1] is not None:
+            stages.setdefault(f"picks_{sample[1]}", []).append(sample)
+
+    return {
+        "target": target,
+        "rate": rate,
+        "duration": duration,
+        "elapsed": elapsed,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "mix": REQUEST_MIX,
+        "total": summarize(samples, elapsed),
+        "endpoints": {label: summarize(group, elapsed) for label, group in sorted(endpoints.items())},
+        "recommend_by_stage": {stage: summarize(group, elapsed) for stage, group in sorted(stages.items())}
+    }
+
+
+def print_report(report: Dict):
+    print(f"🎯 {report['target']} @ {report['rate']:g} req/s for {report['elapsed']:.1f} s")
+    print(f"{'endpoint':<22}{'reqs':>7}{'rps':>9}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for label, stats in rows:
+        latency = stats["latency_ms"]
+        print(f"{label:<22}{stats['requests']:>7}{stats['throughput_rps']:>9.1f}"
+              f"{stats['error_rate'] * 100:>7.1f}%{latency['p50']:>8.1f}ms"
+              f"{latency['p95']:>7.1f}ms{latency['p99']:>7.1f}ms")
+
+
+async def main_async(args) -> Dict:
+    champions = JSONDataStore(args.data_dir).load("champions.json")["champions"]
+    if args.states:
+        states = load_draft_states(args.states)
+    else:
+        states = generate_draft_states(champions, args.num_states, seed=args.seed)
+
+    if args.url:
+        target = HTTPTarget(args.url)
+    else:
+        from api import app
+        target = ASGITarget(app)
+
+    await target.start()
+    try:
+        await wait_until_ready(target)
+        mix = RequestMix(states, champions, seed=args.seed)
+        if args.warmup:
+            await run_load(target, mix, args.rate, args.warmup)
+        samples, elapsed = await run_load(target, mix, args.rate, args.duration)
+    finally:
+        await target.stop()
+
+    return build_report(samples, elapsed, target.describe(), args.rate, args.duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the draft tool API")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--rate", type=float, default=50, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="Measured run length in seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured warmup in seconds")
+    parser.add_argument("--states", help="JSONL file of recorded draft states")
+    parser.add_argument("--num-states", type=int, default=500, help="Generated draft states")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent.parent / "data"))
+    parser.add_argument("--out", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
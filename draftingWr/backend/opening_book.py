@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Wild Rift Draft Tool - Opening Book
+Precomputed recommendations for the most requested early draft states.
+
+The first picks of a draft come from a small space: the empty draft, one pick
+on either side, and a handful of bans. The builder enumerates, for every
+role, no pick, any single champion (ally or enemy) and any two champions from
+a pool of popular opening picks, in either order and on either side. Their
+rankings from recommend_champions are computed on a process pool and stored
+in a compact gzipped table (data/build/opening_book.json.gz) keyed by state
+and stamped with the data version and the engine code version (a book built
+by other scoring code is refused at load).
+
+Bans only remove candidates (scores do not depend on them without
+lookahead), so states are stored without bans and BOOK_BAN_DEPTH entries
+deeper than BOOK_TOP_N: a lookup filters the request's bans out of the stored
+ranking, and hits as long as enough entries are left.
+
+The API answers exact hits from the table (same data version, no lookahead,
+enemy roles or composition profile, top_n within the table's) and scores
+everything else live. The table is rebuilt by the data pipeline (--book)
+when the data files or the scoring code changed.
+
+Usage:
+    python backend/opening_book.py [--data-dir data] [--workers 4]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from itertools import permutations
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from data_pipeline import BOOK_FILE, BUILD_DIR, compute_code_version
+from draft_engine import ROLES, DraftEngine
+
+
+# Requests up to this top_n can hit the book
+BOOK_TOP_N = 10
+
+# Extra ranking depth stored per state, absorbing banned champions
+BOOK_BAN_DEPTH = 10
+
+# Popular opening picks combined into two-pick states
+BOOK_PICK_POOL = 12
+
+# Recommendation fields holding explanation lists (stored as string table ids)
+EXPLANATION_FIELDS = ("synergy_explanations", "counter_explanations", "vulnerability_explanations")
+
+
+def book_key(role: str, team: List[str] = None, enemy_team: List[str] = None) -> str:
+    """
+    Key of a pick state. Picks keep their order: it decides which of two
+    teammates providing the same synergy gets the diminished explanation.
+    """
+    return "|".join([role, ",".join(team or []), ",".join(enemy_team or [])])
+
+
+def opening_states(engine: DraftEngine, pick_pool: int = BOOK_PICK_POOL) -> Iterator[Tuple]:
+    """
+    Enumerate the early draft states stored in the book.
+
+    Yields:
+        (role, team, enemy_team) tuples, each state once
+    """
+    champion_ids = [c["id"] for c in engine.champions]
+
+    # The most recommended blind picks across roles make up the two-pick pool
+    popular = []
+    for role in ROLES:
+        for rec in engine.recommend_champions(role=role, top_n=pick_pool):
+            if rec["champion"]["id"] not in popular:
+                popular.append(rec["champion"]["id"])
+    popular = popular[:pick_pool]
+
+    pick_sets = [([], [])]
+    pick_sets += [([champ], []) for champ in champion_ids]
+    pick_sets += [([], [champ]) for champ in champion_ids]
+    for first, second in permutations(popular, 2):
+        pick_sets += [([first, second], []), ([], [first, second]), ([first], [second])]
+
+    for role in ROLES:
+        for team, enemy_team in pick_sets:
+            yield role, team, enemy_team
+
+
+# Engine loaded once per worker process by _init_worker
+_worker_engine: Optional[DraftEngine] = None
+
+
+def _init_worker(data_dir: str):
+    global _worker_engine
+    _worker_engine = DraftEngine(data_dir=data_dir)
+
+
+def _score_states(states: List[Tuple], depth: int) -> List[Tuple[str, List[Dict]]]:
+    return [
+        (book_key(role, team, enemy_team),
+         _worker_engine.recommend_champions(role=role, team=team, enemy_team=enemy_team, top_n=depth))
+        for role, team, enemy_team in states
+    ]
+
+
+class OpeningBook:
+    """
+    Lookup table of precomputed recommendations for one data version.
+
+    Recommendations are stored as rows: champion ID, role viability, then the
+    score fields in order, explanation lists as ids into a shared string table.
+    Each state holds up to depth rows (fewer when every viable champion is in).
+    """
+
+    def __init__(self, data_version: str, code_version: str, top_n: int, depth: int,
+                 fields: List[str], strings: List[str], states: Dict[str, List[List]]):
+        self.data_version = data_version
+        self.code_version = code_version
+        self.top_n = top_n
+        self.depth = depth
+        self.fields = fields
+        self.strings = strings
+        self.states = states
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_recommendations(cls, data_version: str, top_n: int, depth: int,
+                             scored: Iterator[Tuple[str, List[Dict]]]) -> "OpeningBook":
+        """Build a book from (state key, recommendations) pairs scored by the running code."""
+        fields = None
+        strings: List[str] = []
+        string_ids: Dict[str, int] = {}
+        states = {}
+
+        def intern(text: str) -> int:
+            if text not in string_ids:
+                string_ids[text] = len(strings)
+                strings.append(text)
+            return string_ids[text]
+
+        for key, recommendations in scored:
+            rows = []
+            for rec in recommendations:
+                if fields is None:
+                    fields = [name for name in rec if name != "champion"]
+                row = [rec["champion"]["id"], rec["champion"]["role_viability"]]
+                for name in fields:
+                    value = rec[name]
+                    row.append([intern(text) for text in value] if name in EXPLANATION_FIELDS else value)
+                rows.append(row)
+            states[key] = rows
+
+        return cls(data_version, compute_code_version(), top_n, depth, fields or [], strings, states)
+
+    def lookup(self, engine: DraftEngine, role: str, team: List[str] = None,
+               enemy_team: List[str] = None, banned_champions: List[str] = None,
+               top_n: Optional[int] = 5, lookahead: bool = False, enemy_roles: Dict[str, str] = None,
+               composition_profile: str = None) -> Optional[List[Dict]]:
+        """
+        Recommendations for a state if the book holds it, else None.
+
+        Takes recommend_champions' arguments; only exact pick states scored
+        without lookahead, enemy roles or a composition profile, by an engine
+        on the book's data version, hit (any bans, as long as enough stored
+        entries remain). Unlimited requests (top_n None) always miss.
+        """
+        rows = None
+        if engine.data_version == self.data_version and not lookahead and enemy_roles is None \
+                and not composition_profile and top_n is not None and top_n <= self.top_n:
+            rows = self.states.get(book_key(role, team, enemy_team))
+        if rows is not None and banned_champions:
+            banned = set(banned_champions)
+            complete = len(rows) < self.depth
+            rows = [row for row in rows if row[0] not in banned]
+            if len(rows) < top_n and not complete:
+                rows = None
+        if rows is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        recommendations = []
+        for champ_id, viability, *values in rows[:top_n]:
+            rec = {"champion": {**engine.champion_map[champ_id], "role_viability": viability}}
+            for name, value in zip(self.fields, values):
+                rec[name] = [self.strings[i] for i in value] if name in EXPLANATION_FIELDS else value
+            recommendations.append(rec)
+        return recommendations
+
+    def to_dict(self) -> Dict:
+        return {
+            "data_version": self.data_version,
+            "code_version": self.code_version,
+            "top_n": self.top_n,
+            "depth": self.depth,
+            "fields": self.fields,
+            "strings": self.strings,
+            "states": self.states
+        }
+
+    def save(self, data_dir: str) -> bool:
+        """
+        Write the book into a data directory's build outputs (gzip without a
+        timestamp, so an identical book keeps its file hash).
+
+        Returns:
+            True if the file changed
+        """
+        path = Path(data_dir) / BUILD_DIR / BOOK_FILE
+        content = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        data = gzip.compress(content, mtime=0)
+        if path.exists() and path.read_bytes() == data:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return True
+
+    @classmethod
+    def load(cls, data_dir: str) -> Optional["OpeningBook"]:
+        """
+        Load the book built for a data directory.
+
+        Returns:
+            The book, or None if there is none or it was built by other
+            engine code (its rankings may be stale)
+        """
+        path = Path(data_dir) / BUILD_DIR / BOOK_FILE
+        if not path.exists():
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("code_version") != compute_code_version():
+            return None
+        return cls(data["data_version"], data["code_version"], data["top_n"], data["depth"],
+                   data["fields"], data["strings"], data["states"])
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "data_version": self.data_version,
+            "code_version": self.code_version,
+            "states": len(self.states),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+def build_book(data_dir: str, workers: int = None, top_n: int = BOOK_TOP_N,
+               ban_depth: int = BOOK_BAN_DEPTH, pick_pool: int = BOOK_PICK_POOL,
+               chunk_size: int = 200) -> OpeningBook:
+    """
+    Enumerate the opening states and score them on a process pool.
+
+    Args:
+        data_dir: Data directory the engine loads
+        workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+        top_n: Largest top_n the book answers
+        ban_depth: Extra entries stored per state for banned champions
+        pick_pool: Popular opening picks combined into two-pick states
+        chunk_size: States per unit of work
+    """
+    engine = DraftEngine(data_dir=data_dir)
+    depth = top_n + ban_depth
+    states = list(opening_states(engine, pick_pool=pick_pool))
+    chunks = [states[i:i + chunk_size] for i in range(0, len(states), chunk_size)]
+    workers = workers or cpu_count()
+
+    if workers == 1:
+        global _worker_engine
+        _worker_engine = engine
+        scored = [_score_states(chunk, depth) for chunk in chunks]
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+            scored = pool.starmap(_score_states, [(chunk, depth) for chunk in chunks])
+
+    return OpeningBook.from_recommendations(
+        engine.data_version, top_n, depth, (entry for chunk in scored for entry in chunk)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book of early draft states")
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent.parent / "data"))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top-n", type=int, default=BOOK_TOP_N)
+    parser.add_argument("--ban-depth", type=int, default=BOOK_BAN_DEPTH)
+    parser.add_argument("--pick-pool", type=int, default=BOOK_PICK_POOL)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    book = build_book(args.data_dir, workers=args.workers, top_n=args.top_n,
+                      ban_depth=args.ban_depth, pick_pool=args.pick_pool)
+    changed = book.save(args.data_dir)
+    path = Path(args.data_dir) / BUILD_DIR / BOOK_FILE
+    elapsed = time.perf_counter() - start
+
+    print(f"📖 {len(book.states)} states, {len(book.strings)} explanations in {elapsed:.1f} s "
+          f"(data version {book.data_version})")
+    print(f"💾 {path} {'written' if changed else 'unchanged'} ({path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
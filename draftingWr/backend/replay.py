@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Wild Rift Draft Tool - Historical Draft Replay
+Measures how often the engine agrees with picks from recorded games.
+
+Drafts are streamed from JSONL or CSV files (never loaded whole). At each
+pick the pre-pick state is replayed through recommend_champions and the
+actual pick's rank, top-k hit and score gap to the engine's first choice are
+recorded. Results are aggregated overall and by role, draft stage (pick
+number within the side) and champion.
+
+Drafts are replayed in chunks on a process pool, each worker loading the
+engine once; at most two chunks per worker are in flight at a time.
+
+Input formats:
+    JSONL, one draft per line, actions in draft order:
+        {"id": "g1", "actions": [{"side": "blue", "action": "ban", "champion": "zed"},
+                                  {"side": "blue", "action": "pick", "champion": "jinx", "role": "adc"}, ...]}
+    CSV, one action per row, rows of a draft contiguous and in order:
+        draft_id,side,action,champion,role
+
+Usage:
+    python backend/replay.py drafts.jsonl [--top-k 5] [--workers 4] [--out report.json]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import deque
+from itertools import groupby, islice
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from draft_engine import DraftEngine
+
+
+# Drafts per unit of work sent to a worker process
+CHUNK_SIZE = 50
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """Stream drafts from a JSONL file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_csv(path: str) -> Iterator[Dict]:
+    """Stream drafts from a CSV file with one action per row."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for draft_id, rows in groupby(csv.DictReader(f), key=lambda row: row["draft_id"]):
+            yield {
+                "id": draft_id,
+                "actions": [
+                    {
+                        "side": row["side"],
+                        "action": row.get("action") or "pick",
+                        "champion": row["champion"],
+                        "role": row.get("role") or None
+                    }
+                    for row in rows
+                ]
+            }
+
+
+def read_drafts(path: str) -> Iterator[Dict]:
+    """Stream drafts from a .jsonl or .csv file."""
+    if path.endswith(".csv"):
+        return read_csv(path)
+    return read_jsonl(path)
+
+
+def replay_draft(engine: DraftEngine, draft: Dict, top_k: int) -> List[Dict]:
+    """
+    Replay every pick of a draft through recommend_champions.
+
+    Args:
+        engine: Draft engine to evaluate with
+        draft: Draft with its actions in order
+        top_k: Rank at or under which a pick counts as a hit
+
+    Returns:
+        One record per pick: rank of the actual pick among the engine's
+        candidates (None if the engine does not consider it for the role),
+        hit, score gap to the top candidate, and the pick's context. Picks
+        without a role are recorded with rank None and skipped=True.
+    """
+    picks: Dict[str, List[str]] = {}
+    bans: List[str] = []
+    records = []
+
+    for action in draft.get("actions", []):
+        side = action["side"]
+        champion = action["champion"]
+        if action.get("action", "pick") == "ban":
+            bans.append(champion)
+            continue
+
+        team = picks.setdefault(side, [])
+        enemy_team = [champ for other, other_picks in picks.items() if other != side for champ in other_picks]
+        role = action.get("role")
+        record = {
+            "draft": draft.get("id"),
+            "side": side,
+            "pick": len(team) + 1,
+            "champion": champion,
+            "role": role,
+            "rank": None,
+            "hit": False,
+            "score_gap": None,
+            "skipped": not role
+        }
+
+        if role:
+            ranking = engine.recommend_champions(
+                role=role,
+                team=team,
+                enemy_team=enemy_team,
+                banned_champions=bans,
+                top_n=len(engine.champions)
+            )
+            ids = [rec["champion"]["id"] for rec in ranking]
+            if champion in ids:
+                rank = ids.index(champion) + 1
+                record["rank"] = rank
+                record["hit"] = rank <= top_k
+                record["score_gap"] = ranking[0]["total_score"] - ranking[rank - 1]["total_score"]
+
+        records.append(record)
+        team.append(champion)
+
+    return records
+
+
+class AgreementStats:
+    """Mergeable agreement counters for one group of picks."""
+
+    def __init__(self):
+        self.picks = 0
+        self.skipped = 0
+        self.ranked = 0
+        self.hits = 0
+        self.rank_sum = 0
+        self.gap_sum = 0.0
+
+    def add(self, record: Dict):
+        self.picks += 1
+        if record["skipped"]:
+            self.skipped += 1
+            return
+        if record["rank"] is not None:
+            self.ranked += 1
+            self.rank_sum += record["rank"]
+            self.gap_sum += record["score_gap"]
+        if record["hit"]:
+            self.hits += 1
+
+    def merge(self, other: "AgreementStats"):
+        self.picks += other.picks
+        self.skipped += other.skipped
+        self.ranked += other.ranked
+        self.hits += other.hits
+        self.rank_sum += other.rank_sum
+        self.gap_sum += other.gap_sum
+
+    def to_dict(self) -> Dict:
+        scored = self.picks - self.skipped
+        return {
+            "picks": self.picks,
+            "skipped": self.skipped,
+            "top_k_hits": self.hits,
+            "top_k_rate": self.hits / scored if scored else 0.0,
+            "not_considered": scored - self.ranked,
+            "mean_rank": self.rank_sum / self.ranked if self.ranked else None,
+            "mean_score_gap": self.gap_sum / self.ranked if self.ranked else None
+        }
+
+
+class AgreementReport:
+    """Agreement stats overall and by role, draft stage and champion."""
+
+    BREAKDOWNS = {
+        "by_role": lambda record: record["role"] or "unknown",
+        "by_stage": lambda record: f"pick_{record['pick']}",
+        "by_champion": lambda record: record["champion"]
+    }
+
+    def __init__(self):
+        self.drafts = 0
+        self.overall = AgreementStats()
+        self.groups: Dict[str, Dict[str, AgreementStats]] = {name: {} for name in self.BREAKDOWNS}
+
+    def add_draft(self, records: List[Dict]):
+        self.drafts += 1
+        for record in records:
+            self.overall.add(record)
+            for name, key in self.BREAKDOWNS.items():
+                self.groups[name].setdefault(key(record), AgreementStats()).add(record)
+
+    def merge(self, other: "AgreementReport"):
+        self.drafts += other.drafts
+        self.overall.merge(other.overall)
+        for name, groups in other.groups.items():
+            for key, stats in groups.items():
+                self.groups[name].setdefault(key, AgreementStats()).merge(stats)
+
+    def to_dict(self) -> Dict:
+        return {
+            "drafts": self.drafts,
+            "overall": self.overall.to_dict(),
+            **{
+                name: {key: stats.to_dict() for key, stats in sorted(groups.items())}
+                for name, groups in self.groups.items()
+            }
+        }
+
+
+def replay_chunk(engine: DraftEngine, drafts: List[Dict], top_k: int,
+                 keep_records: bool) -> Tuple[AgreementReport, List[Dict]]:
+    report = AgreementReport()
+    records = []
+    for draft in drafts:
+        draft_records = replay_draft(engine, draft, top_k)
+        report.add_draft(draft_records)
+        if keep_records:
+            records.extend(draft_records)
+    return report, records
+
+
+# Engine loaded once per worker process by _init_worker
+_worker_engine: Optional[DraftEngine] = None
+
+
+def _init_worker(data_dir: str):
+    global _worker_engine
+    _worker_engine = DraftEngine(data_dir=data_dir)
+
+
+def _replay_chunk_in_worker(drafts: List[Dict], top_k: int, keep_records: bool):
+    return replay_chunk(_worker_engine, drafts, top_k, keep_records)
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def replay(drafts: Iterable[Dict], data_dir: str, top_k: int = 5, workers: int = None,
+           chunk_size: int = CHUNK_SIZE, record_sink=None) -> AgreementReport:
+    """
+    Replay a stream of drafts and aggregate agreement stats.
+
+    Args:
+        drafts: Iterable of drafts (consumed lazily)
+        data_dir: Data directory the engine loads
+        top_k: Rank at or under which a pick counts as a hit
+        workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+        chunk_size: Drafts per unit of work
+        record_sink: Optional callable receiving each pick record, in draft order
+
+    Returns:
+        The merged AgreementReport
+    """
+    workers = workers or cpu_count()
+    keep_records = record_sink is not None
+    report = AgreementReport()
+
+    def collect(result: Tuple[AgreementReport, List[Dict]]):
+        chunk_report, records = result
+        report.merge(chunk_report)
+        for record in records:
+            record_sink(record)
+
+    if workers == 1:
+        engine = DraftEngine(data_dir=data_dir)
+        for chunk in chunked(drafts, chunk_size):
+            collect(replay_chunk(engine, chunk, top_k, keep_records))
+        return report
+
+    with Pool(workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+        pending = deque()
+        for chunk in chunked(drafts, chunk_size):
+            pending.append(pool.apply_async(_replay_chunk_in_worker, (chunk, top_k, keep_records)))
+            # Bound the chunks in flight so the input is never read ahead
+            if len(pending) >= workers * 2:
+                collect(pending.popleft().get())
+        while pending:
+            collect(pending.popleft().get())
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded drafts and measure recommendation agreement")
+    parser.add_argument("inputs", nargs="+", help="JSONL or CSV files of recorded drafts")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent.parent / "data"))
+    parser.add_argument("--out", help="Write the JSON report to this file")
+    parser.add_argument("--records", help="Write every pick record to this JSONL file")
+    args = parser.parse_args()
+
+    drafts = (draft for path in args.inputs for draft in read_drafts(path))
+    records_file = open(args.records, 'w', encoding='utf-8') if args.records else None
+    sink = (lambda record: records_file.write(json.dumps(record) + "\n")) if records_file else None
+
+    start = time.perf_counter()
+    try:
+        report = replay(drafts, args.data_dir, top_k=args.top_k, workers=args.workers,
+                        chunk_size=args.chunk_size, record_sink=sink)
+    finally:
+        if records_file:
+            records_file.close()
+    elapsed = time.perf_counter() - start
+
+    result = {"top_k": args.top_k, "elapsed": elapsed, **report.to_dict()}
+    overall = result["overall"]
+    print(f"🎮 {result['drafts']} drafts, {overall['picks']} picks in {elapsed:.1f} s")
+    print(f"🎯 Top-{args.top_k} agreement: {overall['top_k_rate']:.1%}"
+          + (f", mean rank {overall['mean_rank']:.1f}" if overall["mean_rank"] else ""))
+    for role, stats in result["by_role"].items():
+        print(f"  • {role:<8} {stats['top_k_rate']:.1%} ({stats['picks']} picks)")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
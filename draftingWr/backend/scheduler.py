@@ -0,0 +1,194 @@
+"""
+Wild Rift Draft Tool - Work Scheduler
+Admission control and priority scheduling for engine work in the API.
+
+Requests are classified by cost into named queues. Each queue is bounded
+and has a priority and a latency budget; a fixed pool of worker threads
+always takes the next job from the highest-priority non-empty queue, so
+interactive recommendations go before bulk analytics. A job that cannot
+finish within its budget is rejected up front (or when it reaches a worker)
+instead of queueing uselessly.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List
+
+
+# Weight of the latest run in the per-queue service time estimate
+SERVICE_TIME_SMOOTHING = 0.2
+
+# Number of recent wait times kept per queue for percentiles
+WAIT_SAMPLES = 1000
+
+
+class SchedulerRejected(Exception):
+    """Raised when a job is refused: its queue is full or its deadline cannot be met."""
+
+    def __init__(self, queue: str, reason: str):
+        super().__init__(f"{queue} queue: {reason}")
+        self.queue = queue
+        self.reason = reason
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list (0.0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class WorkQueue:
+    """A bounded queue of jobs with a priority (lower runs first) and a latency budget."""
+
+    def __init__(self, name: str, priority: int, max_depth: int, budget: float):
+        self.name = name
+        self.priority = priority
+        self.max_depth = max_depth
+        self.budget = budget
+        self.jobs = deque()
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected_full = 0
+        self.rejected_deadline = 0
+        self.service_time = 0.0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+    def record_service_time(self, duration: float):
+        if self.completed == 0:
+            self.service_time = duration
+        else:
+            self.service_time += SERVICE_TIME_SMOOTHING * (duration - self.service_time)
+
+    def stats(self) -> Dict:
+        waits = list(self.waits)
+        return {
+            "priority": self.priority,
+            "depth": len(self.jobs),
+            "max_depth": self.max_depth,
+            "running": self.running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected_full": self.rejected_full,
+            "rejected_deadline": self.rejected_deadline,
+            "budget_ms": self.budget * 1000,
+            "service_ms": self.service_time * 1000,
+            "wait_ms_p50": percentile(waits, 0.50) * 1000,
+            "wait_ms_p95": percentile(waits, 0.95) * 1000,
+            "wait_ms_max": max(waits) * 1000 if waits else 0.0
+        }
+
+
+class Job:
+    __slots__ = ("call", "future", "enqueued", "deadline")
+
+    def __init__(self, call: Callable, future: asyncio.Future, enqueued: float, deadline: float):
+        self.call = call
+        self.future = future
+        self.enqueued = enqueued
+        self.deadline = deadline
+
+
+class PriorityScheduler:
+    """
+    Runs blocking engine calls on a worker pool, highest-priority queue first.
+
+    Args:
+        queues: Queue name -> {"priority", "max_depth", "budget" (seconds)}
+        workers: Number of worker threads (defaults to the CPU count, max 4)
+    """
+
+    def __init__(self, queues: Dict[str, Dict], workers: int = None):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="engine")
+        self.queues = {name: WorkQueue(name, **config) for name, config in queues.items()}
+        self._by_priority = sorted(self.queues.values(), key=lambda q: q.priority)
+        self.running = 0
+
+    def _estimated_wait(self, queue: WorkQueue) -> float:
+        """Rough time before a new job in this queue reaches a worker."""
+        ahead = sum(len(q.jobs) for q in self._by_priority if q.priority <= queue.priority)
+        if ahead == 0 and self.running < self.workers:
+            return 0.0
+        return (ahead + 1) * queue.service_time / self.workers
+
+    async def submit(self, queue_name: str, func: Callable, *args, budget: float = None, **kwargs):
+        """
+        Queue func(*args, **kwargs) and wait for its result.
+
+        Args:
+            queue_name: Queue to run in (e.g. 'interactive' or 'bulk')
+            func: Blocking callable to run on a worker thread
+            budget: Latency budget in seconds (defaults to the queue's)
+
+        Raises:
+            SchedulerRejected: If the queue is full or the budget cannot be met
+        """
+        queue = self.queues[queue_name]
+        now = time.monotonic()
+        deadline = now + (queue.budget if budget is None else budget)
+
+        if len(queue.jobs) >= queue.max_depth:
+            queue.rejected_full += 1
+            raise SchedulerRejected(queue_name, "queue is full")
+        if now + self._estimated_wait(queue) + queue.service_time > deadline:
+            queue.rejected_deadline += 1
+            raise SchedulerRejected(queue_name, "budget cannot be met")
+
+        future = asyncio.get_running_loop().create_future()
+        queue.jobs.append(Job(partial(func, *args, **kwargs), future, now, deadline))
+        queue.submitted += 1
+        self._dispatch()
+        return await future
+
+    def _dispatch(self):
+        """Start queued jobs while workers are free, highest priority first."""
+        loop = asyncio.get_running_loop()
+        while self.running < self.workers:
+            queue = next((q for q in self._by_priority if q.jobs), None)
+            if queue is None:
+                return
+
+            job = queue.jobs.popleft()
+            if job.future.done():  # caller went away
+                continue
+
+            now = time.monotonic()
+            queue.waits.append(now - job.enqueued)
+            if now + queue.service_time > job.deadline:
+                queue.rejected_deadline += 1
+                job.future.set_exception(SchedulerRejected(queue.name, "deadline passed while queued"))
+                continue
+
+            self.running += 1
+            queue.running += 1
+            run = loop.run_in_executor(self.executor, job.call)
+            run.add_done_callback(partial(self._finished, queue, job, now))
+
+    def _finished(self, queue: WorkQueue, job: Job, started: float, run: asyncio.Future):
+        self.running -= 1
+        queue.running -= 1
+        queue.record_service_time(time.monotonic() - started)
+        queue.completed += 1
+
+        if not job.future.done():
+            if run.exception() is not None:
+                job.future.set_exception(run.exception())
+            else:
+                job.future.set_result(run.result())
+
+        self._dispatch()
+
+    def stats(self) -> Dict:
+        """Per-queue depth, wait times and rejection counts for the metrics endpoint."""
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queues": {name: queue.stats() for name, queue in self.queues.items()}
+        }
@@ -0,0 +1,178 @@
+"""
+Wild Rift Draft Tool - Champion Search Index
+Prefix trie with bounded edit-distance matching for the champion picker.
+
+Champion names, IDs, single name words and DDragon aliases are normalized
+(lowercase, letters and digits only) so "kaisa", "Kai'Sa" and "kai sa" all
+find Kai'Sa, and "mundo" or "nunu" find Dr. Mundo and Nunu & Willump.
+"""
+
+import re
+from typing import Dict, List, Set
+
+from data_pipeline import get_ddragon_name
+
+
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]")
+
+# Maximum number of memoized queries (keystrokes repeat a lot across clients)
+SEARCH_CACHE_SIZE = 4096
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip everything but letters and digits."""
+    return NON_ALPHANUMERIC.sub("", text.lower())
+
+
+class TrieNode:
+    """Trie node; champions holds every champion whose key passes through it."""
+
+    __slots__ = ("children", "champions")
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.champions: Set[int] = set()
+
+
+class ChampionSearchIndex:
+    """
+    Search index over a champion list, built once per dataset snapshot.
+
+    A query matches a champion when one of its keys starts with the query
+    (distance 0) or with a string within a small edit distance of it.
+    """
+
+    def __init__(self, champions: List[Dict]):
+        self.champions = champions
+        self.root = TrieNode()
+        self._cache: Dict[str, List[tuple]] = {}
+
+        for i, champ in enumerate(champions):
+            for key in self._keys(champ):
+                self._insert(key, i)
+
+    @staticmethod
+    def _keys(champ: Dict) -> Set[str]:
+        keys = {
+            normalize(champ["name"]),
+            normalize(champ["id"]),
+            normalize(get_ddragon_name(champ["name"])),
+        }
+        # Each word on its own, e.g. "willump" or "mundo"
+        keys.update(normalize(word) for word in re.split(r"[\s&.]+", champ["name"]))
+        keys.discard("")
+        return keys
+
+    def _insert(self, key: str, champion: int):
+        node = self.root
+        node.champions.add(champion)
+        for char in key:
+            node = node.children.setdefault(char, TrieNode())
+            node.champions.add(champion)
+
+    @staticmethod
+    def max_distance(query: str) -> int:
+        """Typos tolerated for a query length: none under 3 letters, then 1, then 2."""
+        if len(query) < 3:
+            return 0
+        return 1 if len(query) < 8 else 2
+
+    def _fuzzy(self, query: str, max_distance: int) -> Dict[int, int]:
+        """
+        Champions whose key has a prefix within max_distance edits of query.
+
+        Walks the trie carrying one Levenshtein row per node and prunes a
+        branch as soon as no cell of its row is within the bound.
+        """
+        matches: Dict[int, int] = {}
+        size = len(query) + 1
+        first_row = list(range(size))
+
+        def visit(node: TrieNode, char: str, previous: List[int]):
+            row = [previous[0] + 1]
+            left = row[0]
+            for i in range(1, size):
+                cost = previous[i - 1] + (query[i - 1] != char)
+                above = previous[i] + 1
+                if above < cost:
+                    cost = above
+                if left + 1 < cost:
+                    cost = left + 1
+                row.append(cost)
+                left = cost
+
+            distance = row[-1]
+            if distance <= max_distance:
+                for champion in node.champions:
+                    if distance < matches.get(champion, max_distance + 1):
+                        matches[champion] = distance
+
+            # Row minimums never decrease going deeper: stop once no cell can
+            # beat the bound (or the distance already recorded for this subtree)
+            if min(row) < min(distance, max_distance + 1):
+                for next_char, child in node.children.items():
+                    visit(child, next_char, row)
+
+        for char, child in self.root.children.items():
+            visit(child, char, first_row)
+        return matches
+
+    def search(self, query: str, limit: int = 10, exclude: Set[str] = None) -> List[Dict]:
+        """
+        Search champions by name, ID or alias prefix, tolerating typos.
+
+        Args:
+            query: What the user typed so far
+            limit: Maximum number of results
+            exclude: Champion IDs to leave out (e.g. already picked or banned)
+
+        Returns:
+            Matching champions with their edit distance, best first
+        """
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+        exclude = exclude or set()
+
+        ranked = self._cache.get(query)
+        if ranked is None:
+            ranked = self._rank(query)
+            if len(self._cache) >= SEARCH_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[query] = ranked
+
+        results = []
+        for distance, i in ranked:
+            if self.champions[i]["id"] in exclude:
+                continue
+            results.append({**self.champions[i], "match_distance": distance})
+            if len(results) == limit:
+                break
+        return results
+
+    def _rank(self, query: str) -> List[tuple]:
+        """All matches for a normalized query as (distance, champion index), best first."""
+        # Exact prefix matches: a single walk down the trie
+        matches: Dict[int, int] = {}
+        node = self.root
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                break
+        else:
+            matches = {champion: 0 for champion in node.champions}
+
+        # A second typo is only worth searching for when nothing matches as typed
+        max_distance = self.max_distance(query)
+        if matches:
+            max_distance = min(max_distance, 1)
+        if max_distance:
+            for champion, distance in self._fuzzy(query, max_distance).items():
+                matches.setdefault(champion, distance)
+
+        # Closest first, then names that start with the query, then alphabetical
+        ranked = sorted(
+            (distance, not normalize(self.champions[i]["name"]).startswith(query), self.champions[i]["name"], i)
+            for i, distance in matches.items()
+        )
+        return [(distance, i) for distance, _, _, i in ranked]
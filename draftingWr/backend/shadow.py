@@ -0,0 +1,186 @@
+"""
+Wild Rift Draft Tool - Shadow Execution
+Compares an alternate engine against the serving one on live traffic.
+
+A sampled fraction of requests is run a second time, in the background,
+through a shadow target: another dataset version or an alternate
+implementation of recommend_champions (any callable with its signature). The
+response is never affected; the shadow result is only compared with what was
+served: ranking differences, score deltas beyond a tolerance, and the
+latency ratio shadow / primary.
+"""
+
+import random
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from scheduler import percentile
+
+
+# Default fraction of requests shadowed
+SHADOW_SAMPLE_RATE = 0.05
+
+# Score differences up to this are not reported
+SHADOW_TOLERANCE = 1e-6
+
+# Number of recent differing requests kept for inspection
+SHADOW_MAX_DIFFS = 100
+
+# Number of recent latency ratios kept for percentiles
+SHADOW_LATENCY_SAMPLES = 1000
+
+
+def compare_rankings(primary: List[Dict], shadow: List[Dict], tolerance: float = SHADOW_TOLERANCE) -> Dict:
+    """
+    Compare two recommendation lists for the same request.
+
+    Returns:
+        Dict with:
+        - same_ranking: same champions in the same order
+        - first_divergence: first rank (1-based) where the lists differ, or None
+        - top1_match: same first recommendation
+        - overlap: share of the primary's champions also in the shadow's list
+        - score_deltas: champions in both lists whose total score differs by
+          more than the tolerance (primary, shadow, delta)
+        - max_score_delta: largest absolute score difference over shared champions
+    """
+    primary_ids = [rec["champion"]["id"] for rec in primary]
+    shadow_ids = [rec["champion"]["id"] for rec in shadow]
+
+    first_divergence = None
+    for rank, (a, b) in enumerate(zip(primary_ids, shadow_ids), 1):
+        if a != b:
+            first_divergence = rank
+            break
+    else:
+        if len(primary_ids) != len(shadow_ids):
+            first_divergence = min(len(primary_ids), len(shadow_ids)) + 1
+
+    shadow_scores = {rec["champion"]["id"]: rec["total_score"] for rec in shadow}
+    deltas = []
+    max_delta = 0.0
+    for rec in primary:
+        champ_id = rec["champion"]["id"]
+        if champ_id not in shadow_scores:
+            continue
+        delta = shadow_scores[champ_id] - rec["total_score"]
+        max_delta = max(max_delta, abs(delta))
+        if abs(delta) > tolerance:
+            deltas.append({
+                "champion": champ_id,
+                "primary": rec["total_score"],
+                "shadow": shadow_scores[champ_id],
+                "delta": delta
+            })
+
+    return {
+        "same_ranking": primary_ids == shadow_ids,
+        "first_divergence": first_divergence,
+        "top1_match": primary_ids[:1] == shadow_ids[:1],
+        "overlap": len(set(primary_ids) & set(shadow_ids)) / len(primary_ids) if primary_ids else 1.0,
+        "score_deltas": deltas,
+        "max_score_delta": max_delta
+    }
+
+
+class ShadowStats:
+    """
+    Aggregated shadow comparisons, plus the most recent differing requests.
+
+    Args:
+        target: Name of the shadow target (for the summary)
+        sample_rate: Fraction of requests to shadow
+        tolerance: Score differences up to this count as equal
+    """
+
+    def __init__(self, target: str, sample_rate: float = SHADOW_SAMPLE_RATE,
+                 tolerance: float = SHADOW_TOLERANCE):
+        self.target = target
+        self.sample_rate = sample_rate
+        self.tolerance = tolerance
+        self._lock = threading.Lock()
+        self.sampled = 0
+        self.skipped = 0
+        self.errors = 0
+        self.compared = 0
+        self.identical = 0
+        self.ranking_differences = 0
+        self.top1_differences = 0
+        self.score_differences = 0
+        self.max_score_delta = 0.0
+        self.latency_ratios = deque(maxlen=SHADOW_LATENCY_SAMPLES)
+        self.recent_diffs = deque(maxlen=SHADOW_MAX_DIFFS)
+
+    def should_sample(self) -> bool:
+        """Draw whether the current request is shadowed (and count it)."""
+        if random.random() >= self.sample_rate:
+            return False
+        with self._lock:
+            self.sampled += 1
+        return True
+
+    def record_skipped(self):
+        """The shadow run could not be scheduled (its queue was busy)."""
+        with self._lock:
+            self.skipped += 1
+
+    def record_error(self, request: Dict, error: Exception):
+        """The shadow target raised on a request the primary served."""
+        with self._lock:
+            self.errors += 1
+            self.recent_diffs.append({"request": request, "error": f"{type(error).__name__}: {error}"})
+
+    def record(self, request: Dict, primary: List[Dict], primary_ms: float,
+               shadow: List[Dict], shadow_ms: float) -> Dict:
+        """
+        Compare a shadow result with the primary one and add it to the stats.
+
+        Returns:
+            The comparison (see compare_rankings)
+        """
+        comparison = compare_rankings(primary, shadow, self.tolerance)
+        with self._lock:
+            self.compared += 1
+            if primary_ms > 0:
+                self.latency_ratios.append(shadow_ms / primary_ms)
+            self.max_score_delta = max(self.max_score_delta, comparison["max_score_delta"])
+            if not comparison["same_ranking"]:
+                self.ranking_differences += 1
+            if not comparison["top1_match"]:
+                self.top1_differences += 1
+            if comparison["score_deltas"]:
+                self.score_differences += 1
+            if comparison["same_ranking"] and not comparison["score_deltas"]:
+                self.identical += 1
+            else:
+                self.recent_diffs.append({
+                    "request": request,
+                    "primary_ms": primary_ms,
+                    "shadow_ms": shadow_ms,
+                    **comparison
+                })
+        return comparison
+
+    def summary(self, recent: Optional[int] = 10) -> Dict:
+        """Counters, latency ratio percentiles and the most recent differences."""
+        with self._lock:
+            ratios = list(self.latency_ratios)
+            diffs = list(self.recent_diffs)
+        return {
+            "target": self.target,
+            "sample_rate": self.sample_rate,
+            "tolerance": self.tolerance,
+            "sampled": self.sampled,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "compared": self.compared,
+            "identical": self.identical,
+            "ranking_differences": self.ranking_differences,
+            "top1_differences": self.top1_differences,
+            "score_differences": self.score_differences,
+            "max_score_delta": self.max_score_delta,
+            "latency_ratio_p50": percentile(ratios, 0.50),
+            "latency_ratio_p95": percentile(ratios, 0.95),
+            "recent_differences": diffs[-recent:] if recent else diffs
+        }
@@ -10,6 +10,9 @@ import TeamHeader from './components/TeamHeader';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Recommendations fetched per page (pages within the opening book's top_n are precomputed)
+const PAGE_SIZE = 10;
+
 function App() {
   const [champions, setChampions] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -18,8 +21,9 @@ function App() {
   const [teamPicks, setTeamPicks] = useState(Array(5).fill(null));
   const [enemyPicks, setEnemyPicks] = useState(Array(5).fill(null));
 
-  // Recommendations
-  const [recommendations, setRecommendations] = useState([]);
+  // Recommendations for both sides (one /recommend/both call per draft update)
+  const [sideRecommendations, setSideRecommendations] = useState({ team: [], enemy: [] });
+  const [shownCount, setShownCount] = useState(PAGE_SIZE);
   const [filters, setFilters] = useState({ role: 'top', search: '' }); // Default to top
 
   // Active slot selection (instead of modal)
@@ -41,7 +45,7 @@ function App() {
     if (champions.length > 0) {
       updateRecommendations();
     }
-  }, [teamPicks, enemyPicks, filters.role, champions]);
+  }, [teamPicks, enemyPicks, filters.role, champions, shownCount]);
 
   const loadChampions = async () => {
     try {
@@ -60,23 +64,19 @@ function App() {
     const enemy = enemyPicks.filter(c => c !== null).map(c => c.id);
     const bans = []; // Add bans support later if needed
 
-    // If we're selecting for enemy team, invert the logic
-    // Enemy slot should get recommendations that synergize with enemy team and counter ally team
-    const isSelectingEnemy = activeSlot.side === 'enemy';
-    const apiTeam = isSelectingEnemy ? enemy : team;
-    const apiEnemy = isSelectingEnemy ? team : enemy;
-
+    // Both sides come back at once: enemy slots get recommendations that
+    // synergize with the enemy team and counter the ally team
     try {
-      const response = await axios.post(`${API_URL}/recommend`, {
+      const response = await axios.post(`${API_URL}/recommend/both`, {
         role: filters.role,
-        team: apiTeam,
-        enemy_team: apiEnemy,
+        team,
+        enemy_team: enemy,
         banned_champions: bans,
-        top_n: 200 // Get many to scroll
+        top_n: shownCount // Only what the list shows, more on demand
       });
 
       // Merge champion data - keep backend data but add local image if needed
-      const enhancedRecs = response.data.recommendations.map(rec => {
+      const enhance = recs => recs.map(rec => {
         const localChamp = champions.find(c => c.id === rec.champion.id);
         return {
           ...rec,
@@ -87,7 +87,10 @@ function App() {
         };
       });
 
-      setRecommendations(enhancedRecs);
+      setSideRecommendations({
+        team: enhance(response.data.team),
+        enemy: enhance(response.data.enemy)
+      });
     } catch (error) {
       console.error('Error getting recommendations', error);
     }
@@ -329,12 +332,17 @@ function App() {
 
           <div className="rec-list">
             <ChampionTable
-              recommendations={recommendations}
+              recommendations={activeSlot.side === 'enemy' ? sideRecommendations.enemy : sideRecommendations.team}
               filter={filters.search}
               onChampionClick={handleRecommendationClick}
               isSelectionMode={activeSlot.side !== null}
               takenChampions={[...teamPicks, ...enemyPicks].filter(p => p).map(p => p.id)}
             />
+            {(activeSlot.side === 'enemy' ? sideRecommendations.enemy : sideRecommendations.team).length >= shownCount && (
+              <button className="show-more-btn" onClick={() => setShownCount(shownCount + PAGE_SIZE)}>
+                {t('app.show_more')}
+              </button>
+            )}
           </div>
         </div>
 
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for memoized composition analysis
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+def test_incremental_matches_fresh():
+    """Adding a pick to a cached team gives the same profile as a fresh engine"""
+    engine = DraftEngine(data_dir="data")
+    team = ["malphite", "yasuo", "thresh"]
+    
+    engine.analyze_team_composition(team)
+    incremental = engine.analyze_team_composition(team + ["jinx"])
+    fresh = DraftEngine(data_dir="data").analyze_team_composition(["jinx"] + team)
+    
+    for key in ("ad_count", "ap_count", "power_curve", "tag_coverage", "role_assignments"):
+        assert incremental[key] == fresh[key], key
+    assert abs(incremental["early_power"] - fresh["early_power"]) < 1e-9
+    assert abs(incremental["late_power"] - fresh["late_power"]) < 1e-9
+
+
+def test_added_pick_derives_from_previous_state():
+    """A new pick costs one entry, whatever its ID sorts as"""
+    engine = DraftEngine(data_dir="data")
+    team = ["malphite", "yasuo", "thresh"]
+    engine.analyze_team_composition(team)
+    entries = len(engine._composition_cache)
+    
+    engine.analyze_team_composition(team + ["aatrox"])
+    
+    assert len(engine._composition_cache) == entries + 1
+    assert engine.analyze_team_composition(["aatrox"] + team)["early_power"] == \
+        DraftEngine(data_dir="data").analyze_team_composition(["aatrox"] + team)["early_power"]
+
+
+def test_returned_profile_does_not_alias_the_memo():
+    """Mutating a returned analysis leaves the cached one intact"""
+    engine = DraftEngine(data_dir="data")
+    team = ["malphite", "yasuo"]
+    first = engine.analyze_team_composition(team)
+    expected = engine.analyze_team_composition(team)
+    
+    first["tag_coverage"]["engage"] = 99
+    first["role_assignments"]["malphite"] = "support"
+    first["open_roles"].clear()
+    
+    assert engine.analyze_team_composition(team) == expected
+    assert engine.analyze_team_composition(team + ["jinx"])["tag_coverage"]["engage"] != 100
+
+
+def test_both_sides():
+    """Both sides are profiled and uncovered tag groups are reported"""
+    engine = DraftEngine(data_dir="data")
+    result = engine.analyze_draft(team=["malphite", "yasuo"], enemy_team=["jinx", "lux"])
+    
+    for side in ("team", "enemy_team"):
+        profile = result[side]
+        print(f"\n{side}: {profile['power_curve']} curve, missing {profile['missing_tags']}")
+        assert abs(profile["ad_share"] + profile["ap_share"] - 1.0) < 1e-9
+        assert all(profile["tag_coverage"][group] == 0 for group in profile["missing_tags"])
+    
+    assert result["enemy_team"]["role_assignments"] == {"jinx": "adc", "lux": "mid"}
+
+
+if __name__ == "__main__":
+    test_incremental_matches_fresh()
+    test_added_pick_derives_from_previous_state()
+    test_returned_profile_does_not_alias_the_memo()
+    test_both_sides()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test script for the API startup lifecycle and shadow execution
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from fastapi.testclient import TestClient
+
+import api
+from capture import CaptureBuffer
+from opening_book import OpeningBook, book_key
+from shadow import ShadowStats
+
+
+def wait_until_ready(client: TestClient, timeout: float = 60.0):
+    """Poll /readyz until the background startup has finished."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        response = client.get("/readyz")
+        if response.status_code == 200:
+            return response
+        assert response.json()["status"] == "starting", response.json()
+        time.sleep(0.05)
+    raise AssertionError("Engine did not become ready")
+
+
+def wait_for_shadow(client: TestClient, counter: str, expected: int, timeout: float = 10.0) -> dict:
+    """Poll /shadow until a counter reaches the expected value and no run is left in flight."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        summary = client.get("/shadow").json()
+        if summary[counter] >= expected and not api.shadow_tasks:
+            return summary
+        time.sleep(0.02)
+    raise AssertionError(f"Shadow {counter} did not reach {expected}")
+
+
+def ids(recommendations):
+    return [rec["champion"]["id"] for rec in recommendations]
+
+
+def test_not_ready_gate():
+    """Before the engine is warmed up only the probes answer"""
+    ready = api.startup["ready"]
+    api.startup["ready"] = False
+    try:
+        client = TestClient(api.app)  # no lifespan: the engine never starts
+
+        assert client.get("/healthz").status_code == 200
+        readyz = client.get("/readyz")
+        assert readyz.status_code == 503
+        assert readyz.json()["status"] == "starting"
+
+        response = client.post("/recommend", json={"role": "mid"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert client.get("/champions").status_code == 503
+    finally:
+        api.startup["ready"] = ready
+
+
+def test_ready_after_startup():
+    """The lifespan loads and warms the engine, then every endpoint serves"""
+    with TestClient(api.app) as client:
+        readyz = wait_until_ready(client)
+
+        assert readyz.json()["status"] == "ready"
+        assert readyz.json()["warmed_states"] > 0
+        assert {"load", "index", "warmup", "total"} <= set(readyz.json()["phases_ms"])
+        assert client.get("/healthz").status_code == 200
+        response = client.post("/recommend", json={"role": "mid", "team": ["thresh"], "top_n": 3})
+        assert response.status_code == 200
+        assert len(response.json()["recommendations"]) == 3
+
+
+
+def test_failed_request_references_its_capture():
+    """A 500 names the capture slot only when the failure was captured"""
+    with TestClient(api.app) as client:
+        wait_until_ready(client)
+        saved = api.capture_buffer
+        directory = tempfile.mkdtemp()
+        
+        def fail(**params):
+            raise RuntimeError("boom")
+        
+        api.engine.recommend_champions = fail
+        try:
+            body = {"role": "mid", "team": ["thresh", "jinx", "lux"]}
+            buffer = api.capture_buffer = CaptureBuffer(directory)
+            response = client.post("/recommend", json=body)
+            assert response.status_code == 500
+            assert response.json()["detail"] == "Error generating recommendations: boom (capture #0)"
+            buffer.flush()
+            assert buffer.entries()[0]["error"] == "RuntimeError: boom"
+            
+            api.capture_buffer = None
+            response = client.post("/recommend", json=body)
+            assert response.json()["detail"] == "Error generating recommendations: boom"
+        finally:
+            del api.engine.recommend_champions
+            api.capture_buffer = saved
+            shutil.rmtree(directory)
+
+
+def test_both_sides_go_through_the_recommend_path():
+    """/recommend/both serves each side like /recommend: book hits, coalescing, capture"""
+    with TestClient(api.app) as client:
+        wait_until_ready(client)
+        saved = api.opening_book, api.capture_buffer
+        engine = api.engine
+        api.opening_book = OpeningBook.from_recommendations(
+            engine.data_version, 10, 20, [(book_key("mid"), engine.recommend_champions(role="mid", top_n=20))]
+        )
+        directory = tempfile.mkdtemp()
+        buffer = api.capture_buffer = CaptureBuffer(directory, threshold_ms=0)
+        try:
+            executed = api.recommend_flight.stats()["executed"]
+            body = {"role": "mid", "enemy_role": "top", "team": [], "enemy_team": [], "top_n": 3}
+            response = client.post("/recommend/both", json=body)
+            assert response.status_code == 200
+            sides = engine.recommend_both_sides("mid", [], [], top_n=3, enemy_role="top")
+            assert ids(response.json()["team"]) == ids(sides["team"])
+            assert ids(response.json()["enemy"]) == ids(sides["enemy"])
+            
+            # Our side is an opening book hit, the enemy side runs live and is captured
+            assert api.opening_book.hits == 1
+            assert api.recommend_flight.stats()["executed"] == executed + 1
+            buffer.flush()
+            entries = buffer.entries()
+            assert [e["endpoint"] for e in entries] == ["/recommend/both"]
+            assert entries[0]["request"]["role"] == "top"
+        finally:
+            api.opening_book, api.capture_buffer = saved
+            shutil.rmtree(directory)
+
+
+def test_shadow_runs_are_sampled_dropped_and_never_served():
+    """Sampled engine runs are shadowed without touching the response; book hits are not"""
+    with TestClient(api.app) as client:
+        wait_until_ready(client)
+        saved = api.shadow_call, api.shadow_stats, api.opening_book
+        shadow_queue = api.scheduler.queues["shadow"]
+        max_depth, rejected = shadow_queue.max_depth, shadow_queue.rejected_full
+        engine = api.engine
+        # A shadow target that ranks everything backwards
+        api.shadow_call = lambda **params: list(reversed(engine.recommend_champions(**params)))
+        api.shadow_stats = ShadowStats("reversed", sample_rate=1.0)
+        api.opening_book = OpeningBook.from_recommendations(
+            engine.data_version, 10, 20, [(book_key("mid"), engine.recommend_champions(role="mid", top_n=20))]
+        )
+        try:
+            live = {"role": "mid", "team": ["thresh", "jinx", "lux"], "top_n": 3}
+            booked = {"role": "mid", "top_n": 3}
+            for body in (live, booked):
+                response = client.post("/recommend", json=body)
+                assert response.status_code == 200
+                assert ids(response.json()["recommendations"]) == ids(engine.recommend_champions(**body))
+            assert api.opening_book.hits == 1
+            
+            summary = wait_for_shadow(client, "compared", 1)
+            assert summary["sampled"] == 1
+            assert summary["ranking_differences"] == 1
+            assert summary["skipped"] == 0
+            
+            # A full shadow queue drops the run; the request is still served
+            shadow_queue.max_depth = 0
+            response = client.post("/recommend", json=live)
+            assert response.status_code == 200
+            summary = wait_for_shadow(client, "skipped", 1)
+            assert summary["sampled"] == 2 and summary["compared"] == 1
+            assert shadow_queue.rejected_full == rejected + 1
+            shadow_queue.max_depth = max_depth
+            
+            # Unsampled requests are not shadowed
+            api.shadow_stats.sample_rate = 0.0
+            assert client.post("/recommend", json=live).status_code == 200
+            assert client.get("/shadow").json()["sampled"] == 2
+            assert not api.shadow_tasks
+        finally:
+            api.shadow_call, api.shadow_stats, api.opening_book = saved
+            shadow_queue.max_depth = max_depth
+
+
+if __name__ == "__main__":
+    test_not_ready_gate()
+    test_ready_after_startup()
+    test_failed_request_references_its_capture()
+    test_both_sides_go_through_the_recommend_path()
+    test_shadow_runs_are_sampled_dropped_and_never_served()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for ban recommendations
+"""
+
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+engine = DraftEngine(data_dir="data")
+
+
+def test_bans_exclude_unavailable():
+    """Bans never suggest picked or already banned champions"""
+    team = ["malphite", "yasuo"]
+    enemy_team = ["jinx"]
+    banned = ["amumu"]
+    
+    bans = engine.recommend_bans(team=team, enemy_team=enemy_team, banned_champions=banned, top_n=10)
+    
+    print("\nBan suggestions vs Malphite + Yasuo:")
+    for i, ban in enumerate(bans, 1):
+        print(f"  {i}. {ban['champion']['name']} - Score: {ban['total_score']:.2f}")
+        for exp in ban['threat_explanations']:
+            print(f"     {exp}")
+    
+    ids = {ban["champion"]["id"] for ban in bans}
+    assert len(bans) == 10
+    assert not ids & set(team + enemy_team + banned)
+
+
+def test_bans_rank_counters_higher():
+    """A champion that hard counters our pick ranks above its tier-only score"""
+    bans = engine.recommend_bans(team=["malphite"], top_n=len(engine.champions))
+    by_id = {ban["champion"]["id"]: ban for ban in bans}
+    
+    assert by_id["vayne"]["threat_score"] > 0
+    assert by_id["vayne"]["threat_score"] == engine.threat_vectors["vayne"][engine.champion_index["malphite"]]
+
+
+def test_bans_are_fast():
+    """Ranking the whole roster stays well under a millisecond"""
+    team = ["malphite", "yasuo", "thresh", "jinx"]
+    runs = 200
+    
+    start = time.perf_counter()
+    for _ in range(runs):
+        engine.recommend_bans(team=team)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+    
+    print(f"\nAverage ban ranking time: {elapsed_ms:.3f} ms")
+    assert elapsed_ms < 1.0
+
+
+if __name__ == "__main__":
+    test_bans_exclude_unavailable()
+    test_bans_rank_counters_higher()
+    test_bans_are_fast()
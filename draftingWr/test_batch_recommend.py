@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the NDJSON batch recommender
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from batch_recommend import run_batch
+from draft_engine import DraftEngine
+
+DATA_DIR = str(Path(__file__).parent / "data")
+
+STATES = [
+    {"id": "s1", "team": ["thresh"], "enemy_team": ["zed"]},
+    {"id": "s2", "role": "adc", "team": ["lulu", "malphite"], "banned_champions": ["jinx"], "top_n": 3},
+    "not json",
+    {"id": "s3", "team": [], "enemy_team": ["ahri", "garen"], "enemy_roles": {"ahri": "mid"}},
+    {"id": "s4", "role": "support", "lookahead": True},
+]
+
+
+def run(workers: int, explain: str = "reasons") -> list:
+    lines = [state if isinstance(state, str) else json.dumps(state) for state in STATES]
+    output = io.StringIO()
+    processed = run_batch(iter(line + "\n" for line in lines), output, DATA_DIR, role="mid",
+                          top_n=2, explain=explain, workers=workers, chunk_size=2)
+    assert processed == len(STATES)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_batch_matches_engine_in_input_order():
+    """Results follow the input order and match recommend_champions"""
+    engine = DraftEngine(data_dir=DATA_DIR)
+    results = run(workers=1)
+    
+    assert [r["line"] for r in results] == [1, 2, 3, 4, 5]
+    assert "error" in results[2] and "id" not in results[2]
+    
+    expected = engine.recommend_champions(role="adc", team=["lulu", "malphite"], enemy_team=[],
+                                          banned_champions=["jinx"], top_n=3)
+    assert [rec["champion"] for rec in results[1]["recommendations"]] == [rec["champion"]["id"] for rec in expected]
+    assert results[1]["recommendations"][0]["synergy_explanations"] == expected[0]["synergy_explanations"]
+    assert results[0]["role"] == "mid" and len(results[0]["recommendations"]) == 2
+
+
+def test_worker_pool_output_is_stable():
+    """A process pool writes the same lines as an in-process run"""
+    assert run(workers=2) == run(workers=1)
+    
+    scores = run(workers=1, explain="scores")
+    assert "synergy_explanations" not in scores[0]["recommendations"][0]
+    full = run(workers=1, explain="full")
+    assert full[0]["recommendations"][0]["champion"]["id"] == scores[0]["recommendations"][0]["champion"]
+    assert "explanation" in full[0]["recommendations"][0]
+
+
+if __name__ == "__main__":
+    test_batch_matches_engine_in_input_order()
+    test_worker_pool_output_is_stable()
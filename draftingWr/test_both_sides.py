@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Test script for two-sided recommendations
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+def test_both_sides_match_swapped_calls():
+    """Each side equals recommend_champions with the teams swapped"""
+    engine = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+    team = ["thresh", "jinx"]
+    enemy_team = ["zed", "leesin", "garen"]
+    
+    sides = engine.recommend_both_sides("mid", team, enemy_team, ["ahri"], top_n=10, enemy_role="adc")
+    
+    assert sides["team"] == engine.recommend_champions("mid", team, enemy_team, ["ahri"], top_n=10)
+    assert sides["enemy"] == engine.recommend_champions("adc", enemy_team, team, ["ahri"], top_n=10)
+
+
+if __name__ == "__main__":
+    test_both_sides_match_swapped_calls()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for slow-request capture and replay
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from capture import CaptureBuffer, canonical_request, replay_captures
+from draft_engine import DraftEngine
+
+
+def test_ring_buffer_keeps_the_latest_captures():
+    """Once full, the oldest slot is overwritten; sequence numbers survive a restart"""
+    tmp_path = Path(tempfile.mkdtemp())
+    try:
+        buffer = CaptureBuffer(str(tmp_path), capacity=3, threshold_ms=100)
+        seqs = [buffer.capture({"endpoint": "/recommend", "request": {"role": "mid"}}) for _ in range(5)]
+        
+        assert seqs == [0, 1, 2, 3, 4]
+        assert [e["seq"] for e in buffer.entries()] == [2, 3, 4]
+        assert len(list(tmp_path.glob("*.json"))) == 3
+        
+        reopened = CaptureBuffer(str(tmp_path), capacity=3)
+        assert reopened.capture({"endpoint": "/recommend", "request": {}}) == 5
+        
+        assert buffer.should_capture(150) and not buffer.should_capture(50)
+        assert buffer.should_capture(1, failed=True)
+    finally:
+        shutil.rmtree(tmp_path)
+
+
+def test_replay_compares_timings_and_reproduces_errors():
+    """Replaying a corpus re-runs each request and reports timing ratios"""
+    tmp_path = Path(tempfile.mkdtemp())
+    try:
+        engine = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+        buffer = CaptureBuffer(str(tmp_path))
+        request = canonical_request({"role": "mid", "team": ["thresh", "jinx"], "enemy_team": ["zed"],
+                                     "banned_champions": ["vayne", "ahri"], "top_n": 5})
+        assert request["team"] == ["thresh", "jinx"]
+        assert request["banned_champions"] == ["ahri", "vayne"]
+        
+        buffer.capture({"endpoint": "/recommend", "request": request,
+                        "data_version": engine.data_version, "timings_ms": {"engine": 300.0}})
+        buffer.capture({"endpoint": "/recommend", "request": {"role": "mid", "team": 5},
+                        "data_version": "old", "error": "TypeError: boom"})
+        
+        ok, failed = replay_captures(engine, buffer.entries(), repeat=3)
+        
+        assert ok["same_data_version"] and ok["replayed_error"] is None
+        assert ok["ratio"] == ok["replayed_ms"] / 300.0
+        assert set(ok["replayed_phases_ms"]) >= {"prepare", "cheap_stage", "expensive_stages"}
+        assert failed["replayed_error"].startswith("TypeError")
+        assert not failed["same_data_version"]
+    finally:
+        shutil.rmtree(tmp_path)
+
+
+if __name__ == "__main__":
+    test_ring_buffer_keeps_the_latest_captures()
+    test_replay_compares_timings_and_reproduces_errors()
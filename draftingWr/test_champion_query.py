@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for bitset tag queries
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+engine = DraftEngine(data_dir="data")
+
+
+def brute_force(predicate):
+    return sorted(c["id"] for c in engine.champions if predicate(c))
+
+
+def tags(champ):
+    return {t.lower() for t in champ.get("kit_tags", [])} | {champ["id"]}
+
+
+def test_boolean_expressions():
+    """Bitset evaluation matches a plain loop over the roster"""
+    cases = [
+        ("cc AND (hook OR knockup)", lambda t: "cc" in t and ("hook" in t or "knockup" in t)),
+        ("burst & !melee", lambda t: "burst" in t and "melee" not in t),
+        ("NOT (mage OR ranged)", lambda t: not ("mage" in t or "ranged" in t)),
+        ("AoE", lambda t: "aoe" in t),
+    ]
+    for expression, predicate in cases:
+        result = sorted(c["id"] for c in engine.query_champions(expression))
+        print(f"  {expression}: {len(result)} champions")
+        assert result == brute_force(lambda c: predicate(tags(c)))
+
+
+def test_role_and_filters():
+    """Role thresholds and damage/scaling filters combine with tags"""
+    result = engine.query_champions("cc", role="support", min_viability=0.6, damage_types=["AP", "Adaptive"])
+    
+    expected = brute_force(lambda c: "cc" in tags(c)
+                           and engine.get_role_viability(c["id"], "support") >= 0.6
+                           and c["damage_type"] in ("AP", "Adaptive"))
+    assert sorted(c["id"] for c in result) == expected
+    
+    viabilities = [c["role_viability"] for c in result]
+    assert viabilities == sorted(viabilities, reverse=True)
+
+
+def test_malformed_expression():
+    """Malformed expressions raise ValueError"""
+    for expression in ["cc AND", "(cc", "cc )", "OR cc"]:
+        try:
+            engine.query_champions(expression)
+        except ValueError:
+            continue
+        raise AssertionError(f"Expected ValueError for {expression!r}")
+
+
+if __name__ == "__main__":
+    test_boolean_expressions()
+    test_role_and_filters()
+    test_malformed_expression()
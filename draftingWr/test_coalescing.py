@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight request coalescing
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from coalescing import SingleFlight, canonical_draft_key
+
+
+def test_canonical_key_keeps_pick_order():
+    """Pick order changes explanations, so it is part of the key; ban order is not"""
+    a = canonical_draft_key(role="mid", team=["ahri", "jinx"], enemy_team=["zed"],
+                            banned_champions=["lux", "garen"], top_n=5)
+    b = canonical_draft_key(role="mid", team=["ahri", "jinx"], enemy_team=["zed"],
+                            banned_champions=["garen", "lux"], top_n=5)
+    c = canonical_draft_key(role="mid", team=["jinx", "ahri"], enemy_team=["zed"],
+                            banned_champions=["lux", "garen"], top_n=5)
+    d = canonical_draft_key(role="mid", team=["ahri", "jinx"], enemy_team=["zed"],
+                            banned_champions=["lux", "garen"], top_n=10)
+    assert a == b
+    assert a != c
+    assert a != d
+
+
+def test_concurrent_identical_calls_share_one_run():
+    """Ten identical concurrent calls run the computation once"""
+    flight = SingleFlight()
+    calls = []
+    lock = threading.Lock()
+    
+    def compute(value):
+        with lock:
+            calls.append(value)
+        time.sleep(0.05)
+        return {"value": value}
+    
+    async def main():
+        same = [flight.run("draft-a", compute, 1) for _ in range(10)]
+        other = flight.run("draft-b", compute, 2)
+        return await asyncio.gather(*same, other)
+    
+    results = asyncio.run(main())
+    
+    assert len(calls) == 2
+    assert all(r is results[0] for r in results[:10])
+    assert results[10] == {"value": 2}
+    assert flight.stats()["coalesced"] == 9
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_errors_are_shared_and_not_cached():
+    """A failing computation fails every waiter, the next call runs again"""
+    flight = SingleFlight()
+    
+    def fail():
+        time.sleep(0.01)
+        raise ValueError("boom")
+    
+    async def main():
+        return await asyncio.gather(*[flight.run("k", fail) for _ in range(3)], return_exceptions=True)
+    
+    assert all(isinstance(r, ValueError) for r in asyncio.run(main()))
+    assert asyncio.run(flight.run("k", lambda: "ok")) == "ok"
+
+
+if __name__ == "__main__":
+    test_canonical_key_keeps_pick_order()
+    test_concurrent_identical_calls_share_one_run()
+    test_errors_are_shared_and_not_cached()
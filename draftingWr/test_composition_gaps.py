@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for composition-gap scoring
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import COMPOSITION_PROFILES, COMPOSITION_TAGS, DraftEngine
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def test_gap_scores_match_per_champion_coverage():
+    """Bitset gap scores equal a per-champion walk over the deficit vector"""
+    engine = DraftEngine(data_dir=str(DATA_DIR))
+    team = ["jinx", "lux"]
+
+    for profile, targets in COMPOSITION_PROFILES.items():
+        gaps = engine.composition_gaps(team, profile)
+        scores = engine.composition_gap_scores(team, profile)
+        for champ in engine.champions:
+            tags = set(champ.get("kit_tags", []))
+            filled = [group for group in COMPOSITION_TAGS
+                      if group in gaps and tags.intersection(COMPOSITION_TAGS[group])]
+            expected = sum(1.0 / (targets[group] * len(targets)) for group in filled)
+            score, groups = scores.get(champ["id"], (0.0, []))
+            assert groups == filled
+            assert abs(score - expected) < 1e-9
+
+
+def test_recommendations_reward_missing_frontline():
+    """A team without frontline gets tanks pushed up, with an explanation"""
+    engine = DraftEngine(data_dir=str(DATA_DIR))
+    team = ["jinx", "lux", "ahri"]
+    assert "frontline" in engine.composition_gaps(team)
+
+    recommendations = engine.recommend_champions("support", team, [], top_n=10)
+    filling = [rec for rec in recommendations if rec["composition_score"] > 0]
+    assert filling
+    for rec in filling:
+        assert any(exp.startswith("🧩") and "frontline" in exp for exp in rec["synergy_explanations"])
+
+    # No picks, no gaps
+    assert all(rec["composition_score"] == 0.0 for rec in engine.recommend_champions("top", top_n=10))
+
+
+def test_unknown_profile_is_rejected():
+    """Profiles must be COMPOSITION_PROFILES archetypes"""
+    engine = DraftEngine(data_dir=str(DATA_DIR))
+    try:
+        engine.recommend_champions("mid", ["jinx"], [], composition_profile="turtle")
+    except ValueError:
+        return
+    raise AssertionError("Expected ValueError for an unknown profile")
+
+
+if __name__ == "__main__":
+    test_gap_scores_match_per_champion_coverage()
+    test_recommendations_reward_missing_frontline()
+    test_unknown_profile_is_rejected()
+    print("✅ Composition gap tests passed")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental dataset build pipeline
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+import data_pipeline
+from draft_engine import DraftEngine
+
+
+ROOT = Path(__file__).parent
+
+
+def make_project_copy() -> Path:
+    """Copy champions_list.txt, data/ and the engine sources into a scratch project root"""
+    root = Path(tempfile.mkdtemp())
+    shutil.copy(ROOT / "champions_list.txt", root / "champions_list.txt")
+    (root / "backend").mkdir()
+    for filename in data_pipeline.ENGINE_SOURCES:
+        shutil.copy(ROOT / "backend" / filename, root / "backend" / filename)
+    shutil.copytree(ROOT / "data", root / "data", ignore=shutil.ignore_patterns("build"))
+    return root
+
+
+def test_dataset_is_valid():
+    """The shipped dataset has no referential integrity errors"""
+    result = data_pipeline.validate(ROOT / "data")
+    for error in result["errors"]:
+        print(f"  ❌ {error}")
+    assert not result["errors"]
+
+
+def test_tier_edit_only_rebuilds_tier_stage():
+    """A tier list edit leaves the other stages, the compiled tables and the book alone"""
+    root = make_project_copy()
+    try:
+        first = data_pipeline.build(root, verbose=False)
+        
+        tier_path = root / "data" / "tier_list.json"
+        tiers = json.loads(tier_path.read_text(encoding="utf-8"))
+        tiers["champion_tiers"]["ahri"]["tier"] = "C"
+        tier_path.write_text(json.dumps(tiers), encoding="utf-8")
+        
+        second = data_pipeline.build(root, verbose=False)
+        
+        assert second["data_version"] != first["data_version"]
+        assert second["stages"]["compiled"] == first["stages"]["compiled"]
+        assert second["stages"]["champions"] == first["stages"]["champions"]
+        # The opening book is only built on request
+        assert "opening_book" not in second["stages"]
+        assert not (root / "data" / data_pipeline.BUILD_DIR / data_pipeline.BOOK_FILE).exists()
+        
+        engine = DraftEngine(data_dir=str(root / "data"))
+        assert engine.data_version == second["data_version"]
+        assert engine.champion_tiers["ahri"]["tier"] == "C"
+    finally:
+        shutil.rmtree(root)
+
+
+def test_compiled_artifacts_from_other_code_are_ignored():
+    """Compiled vectors stamped with another engine code version are not loaded"""
+    root = make_project_copy()
+    try:
+        data_dir = root / "data"
+        data_pipeline.build_compiled(root, data_dir)
+        assert data_pipeline.load_compiled(data_dir) is not None
+        
+        path = data_dir / data_pipeline.BUILD_DIR / data_pipeline.COMPILED_FILE
+        compiled = json.loads(path.read_text(encoding="utf-8"))
+        compiled["code_version"] = "older"
+        path.write_text(json.dumps(compiled), encoding="utf-8")
+        assert data_pipeline.load_compiled(data_dir) is None
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    test_dataset_is_valid()
+    test_tier_edit_only_rebuilds_tier_stage()
+    test_compiled_artifacts_from_other_code_are_ignored()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite data store
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from data_pipeline import DATA_FILES
+from data_store import JSONDataStore, SQLiteDataStore, build_sqlite
+from draft_engine import DraftEngine
+
+
+json_store = JSONDataStore("data")
+db_path = Path(tempfile.mkdtemp()) / "draft.db"
+build_sqlite("data", db_path)
+sqlite_store = SQLiteDataStore(db_path)
+
+
+def test_sqlite_round_trip():
+    """Every data file loads back from SQLite exactly as from JSON"""
+    for filename in DATA_FILES:
+        assert sqlite_store.load(filename) == json_store.load(filename), filename
+    assert sqlite_store.data_version() == json_store.data_version()
+
+
+def test_engine_on_sqlite_matches_json():
+    """The engine gives the same recommendations on both stores"""
+    json_engine = DraftEngine(data_dir="data")
+    sqlite_engine = DraftEngine(data_dir="data", store=sqlite_store)
+    
+    kwargs = dict(role="jungle", team=["malphite", "yasuo"], enemy_team=["jinx", "lux"])
+    expected = json_engine.recommend_champions(**kwargs)
+    actual = sqlite_engine.recommend_champions(**kwargs)
+    
+    assert [r["champion"]["id"] for r in actual] == [r["champion"]["id"] for r in expected]
+    assert [r["total_score"] for r in actual] == [r["total_score"] for r in expected]
+
+
+def test_engine_lookups_go_through_the_indexes():
+    """Per-request lookups are answered by the store, not the in-memory tables"""
+    json_engine = DraftEngine(data_dir="data")
+    sqlite_engine = DraftEngine(data_dir="data", store=sqlite_store)
+    assert sqlite_engine.indexed_store is sqlite_store
+    
+    # Drop the tables the lookups would otherwise scan
+    sqlite_engine.champion_counter_map = {}
+    sqlite_engine.counters = []
+    sqlite_engine.pair_synergies = sqlite_engine.nary_synergies = []
+    
+    states = [
+        dict(role="mid", team=["thresh", "jinx"], enemy_team=["zed", "fiora"]),
+        dict(role="top", team=["malphite", "yasuo", "amumu"], enemy_team=["aatrox", "lux"]),
+        dict(role="support", team=["jinx"], enemy_team=["leesin"], lookahead=True),
+    ]
+    for state in states:
+        assert sqlite_engine.recommend_champions(**state, top_n=10) == \
+            json_engine.recommend_champions(**state, top_n=10)
+
+
+def test_indexed_queries():
+    """Indexed queries agree with the in-memory data"""
+    engine = DraftEngine(data_dir="data")
+    
+    viable = [c["id"] for c in sqlite_store.viable_champions("support")]
+    assert sorted(viable) == sorted(c["id"] for c in engine.get_viable_champions("support"))
+    
+    assert "fiora" in [m["source"] for m in sqlite_store.matchups_against("aatrox")]
+    assert all("malphite" in c["kit_tags"] for c in
+               [engine.champion_map[i] for i in sqlite_store.champions_with_tag("malphite")])
+
+
+if __name__ == "__main__":
+    test_sqlite_round_trip()
+    test_engine_on_sqlite_matches_json()
+    test_engine_lookups_go_through_the_indexes()
+    test_indexed_queries()
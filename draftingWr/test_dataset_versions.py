@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for side-by-side dataset versions
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from dataset_versions import DatasetVersions
+from draft_engine import DraftEngine
+
+DATA_DIR = Path(__file__).parent / "data"
+
+STATES = [
+    {"role": "mid", "team": [], "enemy_team": []},
+    {"role": "adc", "team": ["thresh"], "enemy_team": ["zed", "garen"]},
+    {"role": "top", "team": ["jinx", "lux"], "enemy_team": ["fiora", "ahri", "leesin"]},
+]
+
+
+def write_patch(patch_dir: Path):
+    """Patch tiers, one champion's flex roles and one champion's matchups."""
+    patch_dir.mkdir(parents=True)
+    tier_list = json.loads((DATA_DIR / "tier_list.json").read_text(encoding="utf-8"))
+    tier_list["champion_tiers"]["aatrox"]["tier"] = "D"
+    tier_list["champion_tiers"]["garen"] = {"tier": "S+"}
+    meta = json.loads((DATA_DIR / "champion_meta.json").read_text(encoding="utf-8"))
+    meta["champion_meta"]["aatrox"]["flex_roles"] = ["top", "jungle", "mid"]
+    counters = json.loads((DATA_DIR / "champion_counters.json").read_text(encoding="utf-8"))
+    counters[0]["counters"][0]["strength"] = 0.1
+    for name, content in (("tier_list.json", tier_list), ("champion_meta.json", meta),
+                          ("champion_counters.json", counters)):
+        (patch_dir / name).write_text(json.dumps(content, ensure_ascii=False), encoding="utf-8")
+
+
+def test_derived_version_matches_full_load():
+    """A derived version scores like an engine loaded from the full patched data"""
+    tmp_path = Path(tempfile.mkdtemp())
+    try:
+        write_patch(tmp_path / "versions" / "next")
+        full_dir = tmp_path / "full"
+        shutil.copytree(DATA_DIR, full_dir, ignore=shutil.ignore_patterns("build", "captures", "versions"))
+        for patched in (tmp_path / "versions" / "next").iterdir():
+            shutil.copy(patched, full_dir / patched.name)
+        
+        base = DraftEngine(data_dir=str(DATA_DIR))
+        datasets = DatasetVersions(base)
+        assert datasets.load_directory(str(tmp_path / "versions")) == ["next"]
+        next_engine = datasets.get("next")
+        full = DraftEngine(data_dir=str(full_dir), use_compiled=False)
+        
+        for state in STATES:
+            assert next_engine.recommend_champions(**state, top_n=10) == full.recommend_champions(**state, top_n=10)
+        assert next_engine.recommend_bans(top_n=10) == full.recommend_bans(top_n=10)
+        assert next_engine.find_similar_champions("aatrox") == full.find_similar_champions("aatrox")
+        assert next_engine.champion_map["garen"]["tier"] == "S+"
+        
+        # The base is untouched
+        assert datasets.get() is base
+        assert base.champion_map["garen"]["tier"] != "S+"
+        assert base.recommend_bans(top_n=10) == DraftEngine(data_dir=str(DATA_DIR)).recommend_bans(top_n=10)
+    finally:
+        shutil.rmtree(tmp_path)
+
+
+def test_versions_share_unchanged_structures():
+    """Only the changed tables, indexes and matchup rows are rebuilt"""
+    tmp_path = Path(tempfile.mkdtemp())
+    try:
+        write_patch(tmp_path / "next")
+        base = DraftEngine(data_dir=str(DATA_DIR))
+        datasets = DatasetVersions(base)
+        datasets.load_directory(str(tmp_path))
+        next_engine = datasets.get("next")
+        
+        assert next_engine.synergy_bounds is base.synergy_bounds
+        assert next_engine.tag_bitsets is base.tag_bitsets
+        assert next_engine.champion_map["ahri"] is base.champion_map["ahri"]
+        # Only fiora's matchups changed: every other row is shared
+        assert "matchup_rows:1" in next_engine.rebuilt_indexes
+        assert next_engine.threat_vectors["fiora"] is not base.threat_vectors["fiora"]
+        assert next_engine.threat_vectors["ahri"] is base.threat_vectors["ahri"]
+        assert next_engine.data_version != base.data_version
+        
+        described = datasets.describe()
+        assert described["live"]["default"]
+        assert 0 < described["next"]["shared_attributes"] < described["next"]["attributes"]
+        
+        try:
+            base.derive({"champions.json": {}}, "x")
+            assert False, "roster patches must be rejected"
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(tmp_path)
+
+
+if __name__ == "__main__":
+    test_derived_version_matches_full_load()
+    test_versions_share_unchanged_structures()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for complete-draft evaluation
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+engine = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+
+TEAM = ["malphite", "leeSin", "ahri", "jinx", "thresh"]
+ENEMY = ["darius", "zed", "yasuo", "ezreal", "blitzcrank"]
+
+
+def test_both_sides_get_a_breakdown():
+    """Each side gets a composite score built from its components"""
+    result = engine.evaluate_draft(TEAM, ENEMY, banned_champions=["vayne"])
+    
+    for side in ("team", "enemy_team"):
+        components = result[side]["components"]
+        assert set(components) == {"synergy", "counter", "vulnerability", "balance", "damage_split"}
+        assert 0.0 <= components["damage_split"] <= 1.0
+        assert set(result[side]["roles"]) == set(TEAM if side == "team" else ENEMY)
+    assert abs(result["score_diff"] - (result["team"]["score"] - result["enemy_team"]["score"])) < 1e-9
+
+
+def test_swapping_sides_swaps_scores():
+    """The evaluation does not depend on which side is called 'team'"""
+    a = engine.evaluate_draft(TEAM, ENEMY)
+    b = engine.evaluate_draft(ENEMY, TEAM)
+    
+    assert abs(a["team"]["score"] - b["enemy_team"]["score"]) < 1e-9
+    assert abs(a["score_diff"] + b["score_diff"]) < 1e-9
+
+
+def test_given_roles_are_used():
+    """Known roles override the solver and change lane weighting"""
+    roles = {"malphite": "support", "thresh": "top"}
+    result = engine.evaluate_draft(TEAM, ENEMY, team_roles=roles)
+    
+    assert result["team"]["roles"]["malphite"] == "support"
+    assert result["team"]["roles"]["thresh"] == "top"
+
+
+def test_stream_keeps_order_and_reports_errors():
+    """Bad drafts yield an error line without stopping the stream"""
+    drafts = [
+        {"id": "g1", "team": TEAM, "enemy_team": ENEMY},
+        {"id": "g2", "team": TEAM, "enemy_team": ["notAChampion"]},
+        {"id": "g3", "team": TEAM, "enemy_team": TEAM},
+        {"id": "g4", "team": ENEMY, "enemy_team": TEAM},
+    ]
+    results = list(engine.evaluate_drafts(drafts, explain=True))
+    
+    assert [r["id"] for r in results] == ["g1", "g2", "g3", "g4"]
+    assert "notAChampion" in results[1]["error"]
+    assert "more than once" in results[2]["error"]
+    assert "synergy_explanations" in results[0]["team"]
+
+
+if __name__ == "__main__":
+    test_both_sides_get_a_breakdown()
+    test_swapping_sides_swaps_scores()
+    test_given_roles_are_used()
+    test_stream_keeps_order_and_reports_errors()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script for lane-aware matchup scoring
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+engine = DraftEngine(data_dir="data")
+
+
+def test_tables_match_rule_scanning():
+    """With a single enemy the precomputed tables equal the rule-scanning scores"""
+    for champ in engine.champions[::5]:
+        for enemy in engine.champions[::9]:
+            counter, _ = engine.calculate_counter_score(champ, [enemy["id"]])
+            vulnerability, _ = engine.calculate_being_countered_score(champ, [enemy["id"]])
+            lanes = [(engine.champion_index[enemy["id"]], 1.0)]
+            
+            lane_counter, lane_vulnerability = engine.calculate_lane_matchup_scores(champ["id"], lanes)
+            assert abs(lane_counter - counter) < 1e-9
+            assert abs(lane_vulnerability - vulnerability) < 1e-9
+
+
+def test_direct_lane_opponent_weighs_more():
+    """Fiora's counter to Aatrox matters more when Aatrox is in her lane"""
+    enemy_team = ["aatrox", "jinx", "thresh"]
+    
+    def fiora_counter(enemy_roles):
+        recs = engine.recommend_champions(
+            role="top", enemy_team=enemy_team, top_n=200, enemy_roles=enemy_roles
+        )
+        return next(r["counter_score"] for r in recs if r["champion"]["id"] == "fiora")
+    
+    in_lane = fiora_counter({"aatrox": "top"})
+    off_lane = fiora_counter({"aatrox": "jungle"})
+    uniform = fiora_counter(None)
+    
+    print(f"\nFiora counter score: top lane {in_lane:.2f}, jungle {off_lane:.2f}, uniform {uniform:.2f}")
+    assert in_lane > off_lane
+    assert in_lane > uniform
+
+
+if __name__ == "__main__":
+    test_tables_match_rule_scanning()
+    test_direct_lane_opponent_weighs_more()
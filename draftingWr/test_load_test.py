@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the load test harness
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from data_store import JSONDataStore
+from load_test import ASGITarget, RequestMix, build_report, generate_draft_states, run_load
+
+
+CHAMPIONS = JSONDataStore(str(Path(__file__).parent / "data")).load("champions.json")["champions"]
+
+
+async def fake_app(scope, receive, send):
+    """Minimal ASGI app: /recommend/bans fails, everything else echoes OK"""
+    if scope["type"] != "http":
+        raise RuntimeError("no lifespan")
+    message = await receive()
+    status = 500 if scope["path"] == "/recommend/bans" else 200
+    body = json.dumps({"path": scope["path"], "size": len(message["body"])}).encode()
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+def test_generated_states_cover_every_stage():
+    """Generated drafts are legal and spread over all pick stages"""
+    states = generate_draft_states(CHAMPIONS, 50, seed=1)
+    
+    assert {len(s["team"]) for s in states} == {0, 1, 2, 3, 4}
+    for state in states:
+        picked = state["team"] + state["enemy_team"] + state["banned_champions"]
+        assert len(picked) == len(set(picked))
+        assert len(state["enemy_team"]) - len(state["team"]) in (0, 1)
+    assert states == generate_draft_states(CHAMPIONS, 50, seed=1)
+
+
+def test_in_process_run_reports_per_endpoint():
+    """A short run against an ASGI app reports counts, errors and percentiles"""
+    mix = RequestMix(generate_draft_states(CHAMPIONS, 20), CHAMPIONS)
+    target = ASGITarget(fake_app)
+    
+    async def main():
+        await target.start()
+        samples, elapsed = await run_load(target, mix, rate=200, duration=0.5)
+        await target.stop()
+        return samples, elapsed
+    
+    samples, elapsed = asyncio.run(main())
+    report = build_report(samples, elapsed, target.describe(), 200, 0.5)
+    
+    assert report["total"]["requests"] == 100
+    assert "/recommend" in report["endpoints"]
+    assert report["endpoints"]["/recommend/bans"]["error_rate"] == 1.0
+    assert report["endpoints"]["/recommend"]["errors"] == 0
+    assert report["recommend_by_stage"]
+    latency = report["total"]["latency_ms"]
+    assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    json.dumps(report)
+
+
+if __name__ == "__main__":
+    test_generated_states_cover_every_stage()
+    test_in_process_run_reports_per_endpoint()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for one-ply counter-response lookahead
+"""
+
+import random
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import ROLES, DraftEngine
+
+
+engine = DraftEngine(data_dir="data")
+
+
+def test_lookahead_penalizes_punishable_picks():
+    """Every candidate with an available counter-pick gets a non-positive penalty"""
+    team = ["malphite", "thresh"]
+    enemy_team = ["jinx"]
+    
+    recommendations = engine.recommend_champions(
+        role="mid", team=team, enemy_team=enemy_team, top_n=5, lookahead=True
+    )
+    
+    print("\nMid recommendations with lookahead:")
+    for i, rec in enumerate(recommendations, 1):
+        print(f"  {i}. {rec['champion']['name']} - Score: {rec['total_score']:.2f} "
+              f"(answer: {rec['enemy_best_response']}, {rec['lookahead_penalty']:.2f})")
+        assert rec["lookahead_penalty"] <= 0
+        assert rec["enemy_best_response"] not in team + enemy_team
+
+
+def test_best_response_skips_unavailable():
+    """The best response moves down the list when the top answer is taken"""
+    first, threat = engine.find_best_response("yasuo", frozenset())
+    second, second_threat = engine.find_best_response("yasuo", frozenset({first}))
+    
+    assert first is not None
+    assert second != first
+    assert second_threat <= threat
+
+
+def test_penalty_renormalizes_vulnerability():
+    """The penalty is the change of the averaged vulnerability once the answer is in"""
+    enemy_team = ["fiora", "zed"]
+    weights = engine.get_stage_weights(0)
+    recommendations = engine.recommend_champions(
+        role="top", enemy_team=enemy_team, top_n=10, lookahead=True
+    )
+    
+    assert any(rec["vulnerability_score"] > 0 for rec in recommendations)
+    for rec in recommendations:
+        if rec["enemy_best_response"] is None:
+            assert rec["lookahead_penalty"] == 0.0
+            continue
+        _, threat = engine.find_best_response(
+            rec["champion"]["id"], frozenset(enemy_team + [rec["champion"]["id"]]),
+            tuple(engine.assign_roles(enemy_team)["open_roles"])
+        )
+        index = engine.champion_index[rec["champion"]["id"]]
+        before = sum(engine.threat_vectors[e][index] for e in enemy_team) / len(enemy_team)
+        after = (before * len(enemy_team) + threat) / (len(enemy_team) + 1)
+        expected = min(0.0, (after - before) * weights["vulnerability"])
+        assert abs(rec["lookahead_penalty"] - expected) < 1e-9
+
+
+def test_lookahead_never_raises_a_score():
+    """Across random drafts, lane-weighted or not, lookahead only lowers scores"""
+    rng = random.Random(11)
+    champions = [c["id"] for c in engine.champions]
+    for _ in range(100):
+        picks = rng.sample(champions, 8)
+        enemy_team = picks[:rng.randint(0, 4)]
+        state = dict(
+            role=rng.choice(ROLES), team=picks[4:4 + rng.randint(0, 3)], enemy_team=enemy_team,
+            enemy_roles=rng.choice([None, engine.assign_roles(enemy_team)["assignments"]])
+        )
+        plain = {rec["champion"]["id"]: rec["total_score"]
+                 for rec in engine.recommend_champions(**state, top_n=None)}
+        for rec in engine.recommend_champions(**state, top_n=5, lookahead=True):
+            assert rec["lookahead_penalty"] <= 0
+            assert rec["total_score"] <= plain[rec["champion"]["id"]] + 1e-12
+
+
+def test_full_enemy_team_has_no_response():
+    """No penalty once the enemy has picked all five champions"""
+    enemy_team = ["garen", "amumu", "ahri", "jinx", "thresh"]
+    recommendations = engine.recommend_champions(
+        role="mid", enemy_team=enemy_team, top_n=3, lookahead=True
+    )
+    
+    for rec in recommendations:
+        assert "lookahead_penalty" not in rec
+
+
+if __name__ == "__main__":
+    test_lookahead_penalizes_punishable_picks()
+    test_best_response_skips_unavailable()
+    test_penalty_renormalizes_vulnerability()
+    test_lookahead_never_raises_a_score()
+    test_full_enemy_team_has_no_response()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the opening book of precomputed early draft states
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from data_pipeline import compute_code_version
+from draft_engine import DraftEngine
+from opening_book import OpeningBook, build_book, opening_states
+
+
+def test_book_hits_match_live_scoring():
+    """Book answers are identical to recommend_champions, bans included"""
+    tmp_path = Path(tempfile.mkdtemp())
+    try:
+        data_dir = tmp_path / "data"
+        shutil.copytree(Path(__file__).parent / "data", data_dir,
+                        ignore=shutil.ignore_patterns("captures", "versions"))
+        book = build_book(str(data_dir), workers=1, pick_pool=4)
+        engine = DraftEngine(data_dir=str(data_dir))
+        assert book.data_version == engine.data_version
+        
+        rng = random.Random(7)
+        states = list(opening_states(engine, pick_pool=4))
+        for role, team, enemy_team in rng.sample(states, 150):
+            ranking = engine.recommend_champions(role=role, team=team, enemy_team=enemy_team, top_n=20)
+            # Ban some of the top recommendations so the stored depth is used
+            bans = rng.sample([rec["champion"]["id"] for rec in ranking], min(len(ranking), rng.randint(0, 4)))
+            top_n = rng.randint(1, book.top_n)
+            state = dict(role=role, team=team, enemy_team=enemy_team,
+                         banned_champions=bans, top_n=top_n)
+            assert book.lookup(engine, **state) == engine.recommend_champions(**state)
+        assert book.hits == 150
+        
+        assert book.save(str(data_dir)) and not book.save(str(data_dir))
+        loaded = OpeningBook.load(str(data_dir))
+        state = dict(role="mid", team=[], enemy_team=[], banned_champions=["ahri"], top_n=5)
+        assert loaded.lookup(engine, **state) == engine.recommend_champions(**state)
+        
+        # Served answers equal live scoring; empty enemy roles are still lane-weighted live
+        for enemy_roles in (None, {}):
+            request = dict(role="top", team=[], enemy_team=["ahri"], top_n=5, enemy_roles=enemy_roles)
+            served = loaded.lookup(engine, **request) or engine.recommend_champions(**request)
+            assert served == engine.recommend_champions(**request)
+        assert loaded.lookup(engine, role="top", enemy_team=["ahri"], enemy_roles={}) is None
+        
+        # Misses fall back to live scoring
+        assert loaded.lookup(engine, **state, lookahead=True) is None
+        assert loaded.lookup(engine, role="mid", top_n=book.top_n + 1) is None
+        assert loaded.lookup(engine, role="mid", top_n=None) is None
+        assert loaded.lookup(engine, role="mid", team=["ahri", "jinx", "thresh"]) is None
+        loaded.data_version = "other"
+        assert loaded.lookup(engine, role="mid") is None
+        assert loaded.stats()["misses"] == 7
+    finally:
+        shutil.rmtree(tmp_path)
+
+
+def test_book_from_other_code_is_refused():
+    """A book stamped with another engine code version does not load"""
+    data_dir = Path(tempfile.mkdtemp())
+    try:
+        book = OpeningBook("data", compute_code_version(), 10, 20, [], [], {"mid||": []})
+        book.save(str(data_dir))
+        assert OpeningBook.load(str(data_dir)).states == {"mid||": []}
+        
+        book.code_version = "other"
+        book.save(str(data_dir))
+        assert OpeningBook.load(str(data_dir)) is None
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    test_book_hits_match_live_scoring()
+    test_book_from_other_code_is_refused()
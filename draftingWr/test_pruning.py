@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for staged scoring with upper-bound pruning
+"""
+
+import random
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine, ROLES
+
+
+engine = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+
+
+def ids(recommendations):
+    return [(r["champion"]["id"], r["total_score"]) for r in recommendations]
+
+
+def test_pruned_top_n_matches_full_ranking():
+    """Top-n with pruning equals the head of the full, unpruned ranking"""
+    rng = random.Random(7)
+    champions = [c["id"] for c in engine.champions]
+    
+    for _ in range(100):
+        picks = rng.sample(champions, 15)
+        state = dict(
+            role=rng.choice(ROLES),
+            team=picks[:rng.randint(0, 4)],
+            enemy_team=picks[5:5 + rng.randint(0, 5)],
+            banned_champions=picks[10:]
+        )
+        full = engine.recommend_champions(top_n=len(champions), **state)
+        top_n = rng.choice([1, 3, 5])
+        assert ids(engine.recommend_champions(top_n=top_n, **state)) == ids(full[:top_n])
+
+
+def test_pruning_is_counted_per_stage():
+    """Candidates are pruned before the expensive stages and counted"""
+    before = dict(engine.pruning_stats)
+    engine.recommend_champions("mid", ["malphite", "leeSin"], ["zed", "yasuo", "jinx"], [], top_n=3)
+    after = engine.pruning_stats
+    
+    seen = after["candidates"] - before["candidates"]
+    pruned = (after["pruned_before_synergy"] - before["pruned_before_synergy"] +
+              after["pruned_before_matchups"] - before["pruned_before_matchups"])
+    scored = after["fully_scored"] - before["fully_scored"]
+    assert seen == pruned + scored
+    assert pruned > 0
+    assert scored >= 3
+
+
+
+def test_unlimited_top_n_ranks_every_candidate():
+    """top_n=None returns every viable champion, with or without lookahead"""
+    state = dict(role="mid", team=["malphite"], enemy_team=["zed", "jinx"], banned_champions=["ahri"])
+    everything = len(engine.champions)
+    viable = [c for c in engine.get_viable_champions("mid") if c["id"] not in {"malphite", "zed", "jinx", "ahri"}]
+    
+    unlimited = engine.recommend_champions(top_n=None, **state)
+    assert len(unlimited) == len(viable)
+    assert ids(unlimited) == ids(engine.recommend_champions(top_n=everything, **state))
+    
+    unlimited = engine.recommend_champions(top_n=None, lookahead=True, **state)
+    assert ids(unlimited) == ids(engine.recommend_champions(top_n=everything, lookahead=True, **state))
+
+
+if __name__ == "__main__":
+    test_pruned_top_n_matches_full_ranking()
+    test_pruning_is_counted_per_stage()
+    test_unlimited_top_n_ranks_every_candidate()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for historical draft replay analytics
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+from replay import read_drafts, replay, replay_draft
+
+
+DATA_DIR = str(Path(__file__).parent / "data")
+
+DRAFT = {
+    "id": "g1",
+    "actions": [
+        {"side": "blue", "action": "ban", "champion": "zed"},
+        {"side": "red", "action": "ban", "champion": "vayne"},
+        {"side": "blue", "action": "pick", "champion": "jinx", "role": "adc"},
+        {"side": "red", "action": "pick", "champion": "ezreal", "role": "adc"},
+        {"side": "red", "action": "pick", "champion": "blitzcrank", "role": "support"},
+        {"side": "blue", "action": "pick", "champion": "thresh", "role": "support"},
+        {"side": "blue", "action": "pick", "champion": "ahri"},
+    ]
+}
+
+
+def test_replay_ranks_each_pick_against_the_pre_pick_state():
+    """Each pick is ranked in the engine's list for the state before it"""
+    engine = DraftEngine(data_dir=DATA_DIR)
+    records = replay_draft(engine, DRAFT, top_k=5)
+    
+    assert [r["champion"] for r in records] == ["jinx", "ezreal", "blitzcrank", "thresh", "ahri"]
+    assert [r["pick"] for r in records] == [1, 1, 2, 2, 3]
+    
+    thresh = records[3]
+    ranking = engine.recommend_champions("support", ["jinx"], ["ezreal", "blitzcrank"], ["zed", "vayne"], top_n=200)
+    expected = [r["champion"]["id"] for r in ranking].index("thresh") + 1
+    assert thresh["rank"] == expected
+    assert thresh["hit"] == (expected <= 5)
+    assert thresh["score_gap"] >= 0
+    assert records[4]["skipped"] and records[4]["rank"] is None
+
+
+def test_jsonl_and_csv_replay_agree():
+    """Both input formats stream the same drafts; pool and in-process runs agree"""
+    tmp_path = Path(tempfile.mkdtemp())
+    try:
+        jsonl = tmp_path / "drafts.jsonl"
+        jsonl.write_text("\n".join(json.dumps({**DRAFT, "id": f"g{i}"}) for i in range(6)))
+    
+        csv_path = tmp_path / "drafts.csv"
+        rows = ["draft_id,side,action,champion,role"]
+        for i in range(6):
+            rows += [f"g{i},{a['side']},{a['action']},{a['champion']},{a.get('role', '')}" for a in DRAFT["actions"]]
+        csv_path.write_text("\n".join(rows) + "\n")
+    
+        assert list(read_drafts(str(csv_path)))[0]["actions"][-1]["role"] is None
+    
+        records = []
+        single = replay(read_drafts(str(jsonl)), DATA_DIR, workers=1, chunk_size=4, record_sink=records.append).to_dict()
+        pooled = replay(read_drafts(str(csv_path)), DATA_DIR, workers=2, chunk_size=2).to_dict()
+    
+        assert single == pooled
+        assert single["drafts"] == 6
+        assert single["overall"]["picks"] == 30
+        assert single["overall"]["skipped"] == 6
+        assert set(single["by_stage"]) == {"pick_1", "pick_2", "pick_3"}
+        assert single["by_champion"]["thresh"]["picks"] == 6
+        assert [r["draft"] for r in records][::5] == [f"g{i}" for i in range(6)]
+    finally:
+        shutil.rmtree(tmp_path)
+
+
+if __name__ == "__main__":
+    test_replay_ranks_each_pick_against_the_pre_pick_state()
+    test_jsonl_and_csv_replay_agree()
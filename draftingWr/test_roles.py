@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the role assignment solver
+"""
+
+import sys
+from itertools import permutations
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine, ROLES
+
+
+engine = DraftEngine(data_dir="data")
+
+
+def brute_force_viability(team):
+    """Best total viability by trying every role permutation"""
+    best = 0.0
+    for roles in permutations(range(len(ROLES)), len(team)):
+        total = sum(engine.role_viability_table[c][r] for c, r in zip(team, roles))
+        best = max(best, total)
+    return best
+
+
+def test_assignment_is_optimal():
+    """The solver matches brute force on flex-heavy teams"""
+    teams = [
+        ["malphite", "pantheon", "gragas", "jinx"],
+        ["sett", "yone", "morgana"],
+        ["pantheon", "gragas", "malphite", "sett", "morgana"],
+        ["thresh"],
+    ]
+    
+    for team in teams:
+        result = engine.assign_roles(team)
+        print(f"\n{team} -> {result['assignments']} (open: {result['open_roles']})")
+        
+        assert abs(result["total_viability"] - brute_force_viability(team)) < 1e-9
+        assert len(set(result["assignments"].values())) == len(team)
+        assert len(result["open_roles"]) == len(ROLES) - len(team)
+
+
+def test_open_role_recommendations():
+    """One recommendation per open role, never for a filled role"""
+    team = ["malphite", "thresh"]
+    result = engine.recommend_open_roles(team=team, enemy_team=["jinx"])
+    
+    assert result["assignments"] == {"malphite": "top", "thresh": "support"}
+    assert set(result["recommendations"]) == {"jungle", "mid", "adc"}
+    for role, recs in result["recommendations"].items():
+        print(f"  {role}: {recs[0]['champion']['name']}")
+        assert len(recs) == 1
+
+
+if __name__ == "__main__":
+    test_assignment_is_optimal()
+    test_open_role_recommendations()
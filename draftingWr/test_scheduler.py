@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for admission control and priority scheduling
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from scheduler import PriorityScheduler, SchedulerRejected
+
+
+QUEUES = {
+    "interactive": {"priority": 0, "max_depth": 4, "budget": 5.0},
+    "bulk": {"priority": 1, "max_depth": 2, "budget": 5.0}
+}
+
+
+def test_interactive_runs_before_bulk():
+    """Queued interactive work jumps ahead of bulk work queued earlier"""
+    scheduler = PriorityScheduler(QUEUES, workers=1)
+    order = []
+    release = threading.Event()
+
+    def blocker():
+        release.wait(1.0)
+        order.append("blocker")
+
+    def job(name):
+        order.append(name)
+
+    async def main():
+        first = asyncio.ensure_future(scheduler.submit("bulk", blocker))
+        await asyncio.sleep(0.01)
+        bulk = asyncio.ensure_future(scheduler.submit("bulk", job, "bulk"))
+        interactive = asyncio.ensure_future(scheduler.submit("interactive", job, "interactive"))
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["queues"]["bulk"]["depth"] == 1
+        release.set()
+        await asyncio.gather(first, bulk, interactive)
+
+    asyncio.run(main())
+    assert order == ["blocker", "interactive", "bulk"]
+    assert scheduler.stats()["queues"]["interactive"]["completed"] == 1
+
+
+def test_full_queue_rejects_fast():
+    """Submitting to a full queue is refused without waiting"""
+    scheduler = PriorityScheduler(QUEUES, workers=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(scheduler.submit("bulk", release.wait, 1.0))
+        await asyncio.sleep(0.01)
+        queued = [asyncio.ensure_future(scheduler.submit("bulk", time.sleep, 0)) for _ in range(2)]
+        await asyncio.sleep(0)
+        try:
+            await scheduler.submit("bulk", time.sleep, 0)
+            assert False, "expected rejection"
+        except SchedulerRejected as e:
+            assert e.reason == "queue is full"
+        release.set()
+        await asyncio.gather(running, *queued)
+
+    asyncio.run(main())
+    assert scheduler.stats()["queues"]["bulk"]["rejected_full"] == 1
+
+
+def test_budget_that_cannot_be_met_is_rejected():
+    """Once the queue knows its service time, too small a budget is refused up front"""
+    scheduler = PriorityScheduler(QUEUES, workers=1)
+
+    async def main():
+        await scheduler.submit("interactive", time.sleep, 0.05)
+        try:
+            await scheduler.submit("interactive", time.sleep, 0.05, budget=0.01)
+            assert False, "expected rejection"
+        except SchedulerRejected as e:
+            assert e.reason == "budget cannot be met"
+        return await scheduler.submit("interactive", lambda: "ok", budget=1.0)
+
+    assert asyncio.run(main()) == "ok"
+    stats = scheduler.stats()["queues"]["interactive"]
+    assert stats["rejected_deadline"] == 1
+    assert stats["service_ms"] > 0
+
+
+def test_errors_reach_the_caller():
+    """Exceptions raised by a job propagate and free the worker"""
+    scheduler = PriorityScheduler(QUEUES, workers=1)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def main():
+        try:
+            await scheduler.submit("interactive", fail)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        return await scheduler.submit("interactive", lambda: 42)
+
+    assert asyncio.run(main()) == 42
+    assert scheduler.stats()["running"] == 0
+
+
+if __name__ == "__main__":
+    test_interactive_runs_before_bulk()
+    test_full_queue_rejects_fast()
+    test_budget_that_cannot_be_met_is_rejected()
+    test_errors_reach_the_caller()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the champion search index
+"""
+
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+engine = DraftEngine(data_dir="data")
+
+
+def first_match(query, **kwargs):
+    results = engine.search_champions(query, limit=5, **kwargs)
+    print(f"  {query!r}: {[c['name'] for c in results]}")
+    return results[0]["id"] if results else None
+
+
+def test_awkward_names():
+    """Punctuation, single words and DDragon aliases all resolve"""
+    assert first_match("kaisa") == "kaisa"
+    assert first_match("kai'sa") == "kaisa"
+    assert first_match("willump") == first_match("nunu")
+    assert first_match("mundo") == first_match("dr. mundo")
+    assert first_match("monkeyking") == first_match("wukong")
+
+
+def test_typos():
+    """One typo is tolerated from three letters on"""
+    assert first_match("yasou") == "yasuo"
+    assert first_match("tresh") == "thresh"
+    assert first_match("zz") is None
+
+
+def test_exclude_unavailable():
+    """Picked or banned champions are left out"""
+    results = engine.search_champions("ya", team=["yasuo"])
+    assert "yasuo" not in [c["id"] for c in results]
+
+
+def test_limit():
+    """At most limit results; a zero or negative limit returns none"""
+    assert len(engine.search_index.search("a", limit=3)) == 3
+    assert engine.search_index.search("a", limit=0) == []
+    assert engine.search_index.search("a", limit=-1) == []
+
+
+def test_search_is_fast():
+    """Uncached keystrokes stay under a millisecond on average"""
+    queries = ["a", "ah", "ahr", "ahri", "lee s", "lee si", "twistd", "cait", "caitl"]
+    engine.search_index._cache.clear()
+    
+    start = time.perf_counter()
+    for query in queries:
+        engine.search_champions(query)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    
+    print(f"\nAverage uncached search time: {elapsed_ms:.3f} ms")
+    assert elapsed_ms < 1.0
+
+
+if __name__ == "__main__":
+    test_awkward_names()
+    test_typos()
+    test_exclude_unavailable()
+    test_limit()
+    test_search_is_fast()
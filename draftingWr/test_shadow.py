@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for shadow execution
+"""
+
+import json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+from shadow import ShadowStats, compare_rankings
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def test_compare_identical_rankings():
+    """An engine shadowed against itself reports no difference"""
+    engine = DraftEngine(data_dir=str(DATA_DIR))
+    recommendations = engine.recommend_champions("mid", ["thresh"], ["zed"], top_n=10)
+
+    comparison = compare_rankings(recommendations, engine.recommend_champions("mid", ["thresh"], ["zed"], top_n=10))
+
+    assert comparison["same_ranking"] and comparison["top1_match"]
+    assert comparison["first_divergence"] is None
+    assert comparison["overlap"] == 1.0
+    assert comparison["score_deltas"] == [] and comparison["max_score_delta"] == 0.0
+
+
+def test_compare_reports_divergence_and_score_deltas():
+    """Swapped ranks and changed scores are located"""
+    engine = DraftEngine(data_dir=str(DATA_DIR))
+    primary = engine.recommend_champions("top", top_n=5)
+    shadow = [dict(rec) for rec in primary]
+    shadow[1], shadow[2] = shadow[2], shadow[1]
+    shadow[0]["total_score"] += 0.5
+
+    comparison = compare_rankings(primary, shadow[:4])
+
+    assert not comparison["same_ranking"] and comparison["top1_match"]
+    assert comparison["first_divergence"] == 2
+    assert comparison["overlap"] == 0.8
+    assert [d["champion"] for d in comparison["score_deltas"]] == [primary[0]["champion"]["id"]]
+    assert abs(comparison["max_score_delta"] - 0.5) < 1e-9
+
+    # Differences within the tolerance are not reported
+    assert compare_rankings(primary, shadow, tolerance=1.0)["score_deltas"] == []
+
+
+def test_shadow_stats_against_derived_version():
+    """A patched dataset version shadowed against the base is aggregated"""
+    base = DraftEngine(data_dir=str(DATA_DIR))
+    tier_list = json.loads((DATA_DIR / "tier_list.json").read_text(encoding="utf-8"))
+    tier_list["champion_tiers"]["garen"] = {"tier": "S+"}
+    patched = base.derive({"tier_list.json": tier_list}, "patched")
+
+    stats = ShadowStats("patched", sample_rate=1.0)
+    states = [{"role": "top", "team": [], "enemy_team": []},
+              {"role": "adc", "team": ["thresh"], "enemy_team": ["zed"]}]
+    for state in states:
+        assert stats.should_sample()
+        stats.record(state, base.recommend_champions(**state), 2.0, patched.recommend_champions(**state), 1.0)
+    stats.record_skipped()
+    stats.record_error(states[0], ValueError("boom"))
+
+    summary = stats.summary()
+    assert summary["sampled"] == 2 and summary["compared"] == 2
+    assert summary["skipped"] == 1 and summary["errors"] == 1
+    # Garen's tier only moves the top lane ranking
+    assert summary["identical"] == 1
+    assert summary["ranking_differences"] == 1
+    assert summary["latency_ratio_p50"] == 0.5
+    assert summary["recent_differences"][0]["request"] == states[0]
+    assert summary["recent_differences"][-1]["error"] == "ValueError: boom"
+
+
+if __name__ == "__main__":
+    test_compare_identical_rankings()
+    test_compare_reports_divergence_and_score_deltas()
+    test_shadow_stats_against_derived_version()
+    print("✅ Shadow tests passed")
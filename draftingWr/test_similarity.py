@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for kit-vector substitute search
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+engine = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+
+
+def test_substitutes_are_available_and_viable():
+    """Substitutes skip unavailable champions and respect the role"""
+    draft = dict(team=["braum"], enemy_team=["jinx"], banned_champions=["thresh", "blitzcrank"])
+    similar = engine.find_similar_champions("thresh", role="support", k=5, **draft)
+    
+    ids = [s["champion"]["id"] for s in similar]
+    assert len(ids) == 5
+    assert not set(ids) & {"thresh", "braum", "jinx", "blitzcrank"}
+    assert all(s["role_viability"] >= 0.5 for s in similar)
+    assert [s["similarity"] for s in similar] == sorted((s["similarity"] for s in similar), reverse=True)
+
+
+def test_shared_tags_explain_the_match():
+    """Shared kit tags are reported and never include the champion's own tag"""
+    similar = engine.find_similar_champions("thresh", role="support", k=3)
+    
+    for s in similar:
+        assert s["shared_tags"]
+        assert set(s["shared_tags"]) <= set(engine.champion_map["thresh"]["kit_tags"])
+        assert "thresh" not in s["shared_tags"]
+        assert s["explanations"][0].startswith("≈ Shares")
+
+
+def test_similarity_is_symmetric_cosine():
+    """Similarity is a symmetric cosine in (0, 1], unknown champions have no substitutes"""
+    zed_akali = next(sim for sim, other in engine._similarity_row("zed") if other == "akali")
+    akali_zed = next(sim for sim, other in engine._similarity_row("akali") if other == "zed")
+    
+    assert abs(zed_akali - akali_zed) < 1e-9
+    assert 0 < zed_akali <= 1.0
+    assert engine.find_similar_champions("notAChampion") == []
+
+
+if __name__ == "__main__":
+    test_substitutes_are_available_and_viable()
+    test_shared_tags_explain_the_match()
+    test_similarity_is_symmetric_cosine()
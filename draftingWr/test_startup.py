@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Test script for engine startup timings and cache warmup
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+def test_startup_phases_are_timed():
+    """The engine reports how long loading and indexing took"""
+    engine = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+    
+    assert set(engine.startup_timings) == {"load", "index"}
+    assert all(ms >= 0 for ms in engine.startup_timings.values())
+
+
+def test_warm_up_primes_caches():
+    """Warmup counts only cache entries, and later requests read them"""
+    engine = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+    
+    warmed = engine.warm_up()
+    
+    assert warmed == engine.cache_entries() > len(engine.champions)
+    assert frozenset() in engine._analysis_cache
+    assert "a" in engine.search_index._cache
+    # First picks, opening lookahead and searches are served from the caches
+    engine.analyze_team_composition(["ahri"])
+    engine.recommend_champions("mid", [], [], [], lookahead=True)
+    engine.search_champions("a")
+    assert engine.cache_entries() == warmed
+    # Warm results match a cold engine's
+    cold = DraftEngine(data_dir=str(Path(__file__).parent / "data"))
+    assert [r["champion"]["id"] for r in engine.recommend_champions("mid", [], [], [])] == \
+        [r["champion"]["id"] for r in cold.recommend_champions("mid", [], [], [])]
+
+if __name__ == "__main__":
+    test_startup_phases_are_timed()
+    test_warm_up_primes_caches()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for pairwise and n-ary synergy rules
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from draft_engine import DraftEngine
+
+
+WOMBO = "Wombo Combo (Engagement + Projection + Zone)"
+
+# Three-tag fixture rule, added on top of the shipped synergies
+WOMBO_RULE = {
+    "name": WOMBO,
+    "tags": ["engage", "knockup", "AoE"],
+    "score": 0.9,
+    "explanation": "Un engagement suivi de projections en l'air et de dégâts de zone anéantit une équipe groupée en teamfight."
+}
+
+base = DraftEngine(data_dir="data")
+engine = base.derive({"synergies.json": {"synergies": base.synergies + [WOMBO_RULE]}}, "wombo-fixture")
+
+
+def combo_explanations(champion_id, team):
+    _, explanations = engine.calculate_synergy_score(engine.champion_map[champion_id], team)
+    return [exp for exp in explanations if WOMBO in exp]
+
+
+def test_three_piece_combo_across_teammates():
+    """Yasuo's knock-up completes Amumu's engage + AoE"""
+    explanations = combo_explanations("yasuo", ["amumu"])
+    print(f"\n{explanations}")
+    assert len(explanations) == 1
+    assert "Amumu" in explanations[0]
+
+
+def test_combo_needs_every_tag():
+    """Without AoE on the team the combo does not fire"""
+    assert combo_explanations("yasuo", ["thresh"]) == []
+
+
+def test_combo_needs_a_teammate():
+    """A champion covering every tag alone is not a team combo"""
+    assert combo_explanations("malphite", []) == []
+    assert combo_explanations("malphite", ["garen"]) == []
+
+
+def test_pairwise_diminishing_returns():
+    """Repeated pairwise synergies still get diminishing multipliers"""
+    _, explanations = engine.calculate_synergy_score(
+        engine.champion_map["yasuo"], ["malphite", "alistar"]
+    )
+    repeated = [exp for exp in explanations if "(x75%)" in exp]
+    print(f"\n{explanations}")
+    assert repeated
+
+
+def test_combo_explanations_do_not_depend_on_hash_seed():
+    """Partners are listed in the rule's tag order in every process"""
+    script = (
+        "import sys; sys.path.append('backend'); import test_synergy_rules as t; "
+        "print(t.combo_explanations('yasuo', ['alistar', 'amumu']))"
+    )
+    outputs = set()
+    for seed in ("1", "2", "3"):
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        result = subprocess.run([sys.executable, "-c", script], cwd=str(Path(__file__).parent),
+                                env=env, capture_output=True, text=True, check=True)
+        outputs.add(result.stdout)
+    assert len(outputs) == 1
+
+
+if __name__ == "__main__":
+    test_three_piece_combo_across_teammates()
+    test_combo_needs_every_tag()
+    test_combo_needs_a_teammate()
+    test_pairwise_diminishing_returns()
+    test_combo_explanations_do_not_depend_on_hash_seed()